@@ -25,7 +25,11 @@ def clean_everything():
     print("\n2️⃣  LIMPIANDO BASE DE DATOS PRINCIPAL...")
     db_files = [
         "data/test_results.db",
-        "data/test_results.db-journal"  # Archivo temporal de SQLite
+        "data/test_results.db-journal",  # Archivo temporal de SQLite
+        "data/test_results.db-wal",  # Archivos del modo WAL
+        "data/test_results.db-shm",
+        "data/locator_cache.db",  # Estrategias de localización aprendidas
+        "data/state_seeds.json"  # Semillas de POS aprendidas (StateSeeder)
     ]
     
     for db_file in db_files:
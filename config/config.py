@@ -22,4 +22,35 @@ class Config:
     HTML_REPORT_DIR = "reports"
 
     # Base de datos
-    DATABASE_PATH = "data/test_results.db"
\ No newline at end of file
+    DATABASE_PATH = "data/test_results.db"
+    LOCATOR_CACHE_PATH = "data/locator_cache.db"
+    STATE_SEEDS_PATH = "data/state_seeds.json"
+
+    # Usuario de LifeMiles para los tests con login y vida máxima (s) de la sesión en caché
+    LOGIN_USERNAME = os.getenv("LOGIN_USERNAME", "21734198706")
+    LOGIN_PASSWORD = os.getenv("LOGIN_PASSWORD", "Lifemiles1")
+    SESSION_MAX_AGE = int(os.getenv("SESSION_MAX_AGE", "1800"))
+
+    # Qué hacer cuando un test supera su presupuesto @pytest.mark.max_roundtrips (fail | warn | off)
+    ROUNDTRIP_BUDGET_ACTION = os.getenv("ROUNDTRIP_BUDGET_ACTION", "fail")
+
+    # Bloqueo de peticiones de terceros (off | analytics | standard | strict)
+    BLOCK_PROFILE = os.getenv("BLOCK_PROFILE", "analytics")
+
+    # Perfil plantilla de Chrome (--profile-template): páginas que se cargan para calentar la caché y carpeta
+    # de los clones (None = /dev/shm si existe, si no el temporal del sistema)
+    PROFILE_WARM_PATHS = ["es/", "en/", "fr/", "pt/"]
+    PROFILE_TEMPLATE_ROOT = os.getenv("PROFILE_TEMPLATE_ROOT")
+
+    # Archivo de respuestas grabadas (--har-mode record/replay)
+    HAR_DIR = "data/har"
+
+    # Grabación de video (screencast | polling | manual)
+    VIDEO_MODE = os.getenv("VIDEO_MODE", "screencast")
+    VIDEO_FPS = int(os.getenv("VIDEO_FPS", "10"))
+    VIDEO_MAX_WIDTH = int(os.getenv("VIDEO_MAX_WIDTH", "1280"))
+    VIDEO_MAX_HEIGHT = int(os.getenv("VIDEO_MAX_HEIGHT", "720"))
+    VIDEO_JPEG_QUALITY = int(os.getenv("VIDEO_JPEG_QUALITY", "70"))
+    VIDEO_RETENTION = os.getenv("VIDEO_RETENTION", "on_failure")  # always | on_failure
+    VIDEO_BUFFER_SECONDS = int(os.getenv("VIDEO_BUFFER_SECONDS", "30"))
+    VIDEO_BUFFER_MAX_MB = int(os.getenv("VIDEO_BUFFER_MAX_MB", "200"))
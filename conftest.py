@@ -1,4 +1,5 @@
 import os
+import re
 import pytest
 import sqlite3
 import logging
@@ -8,6 +9,17 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from config.config import Config
+from utils.database import DatabaseManager
+from utils.driver_pool import DriverPool
+from utils.request_blocking import RequestBlocker
+from utils.result_sink import ResultSink, BatchWriter
+from utils.web_metrics import WebMetrics
+from utils.step_timing import StepTimer
+from utils.trace_export import TraceRecorder
+from utils.roundtrip_counter import RoundTripCounter
+from utils.qa_runtime import QaRuntime
+from utils.duration_history import DurationHistory
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -17,9 +29,46 @@ def pytest_addoption(parser):
     parser.addoption("--headless", action="store_true", help="Run in headless mode")
     parser.addoption("--browser", action="store", default="chrome", help="Browser to use: chrome or firefox")
     parser.addoption("--base-url", action="store", default="https://nuxqa4.avtest.ink/", help="Base URL for testing")
+    parser.addoption("--no-driver-pool", action="store_true", help="Launch a new browser for every test instead of reusing pooled ones")
+    parser.addoption("--pool-max-uses", action="store", type=int, default=25, help="Recycle a pooled browser after this many tests")
+    parser.addoption("--video-retention", action="store", default=None, choices=["always", "on_failure"],
+                     help="Keep every test video (always) or only the last seconds of failing tests (on_failure)")
+    parser.addoption("--results-mode", action="store", default="controller", choices=list(ResultSink.MODES),
+                     help="How xdist workers persist results: direct, via the controller process, or per-worker shards")
+    parser.addoption("--implicit-wait", action="store", type=float, default=Config.IMPLICIT_WAIT,
+                     help="Driver implicit wait in seconds; use 0 so absence checks return immediately (page objects wait explicitly)")
+    parser.addoption("--har-mode", action="store", default="off", choices=["off", "record", "replay"],
+                     help="Record every response to the HAR archive, or replay the archive offline")
+    parser.addoption("--block-profile", action="store", default=Config.BLOCK_PROFILE, choices=list(RequestBlocker.PROFILES),
+                     help="Third-party requests blocked in every test (markers block_requests/redirects/footer override it)")
+    parser.addoption("--block-images", action="store_true", help="Also block images, whatever the blocking profile")
+    parser.addoption("--no-session-cache", action="store_true",
+                     help="Log in through the UI in every test instead of restoring the worker's cached session")
+    parser.addoption("--profile-template", action="store_true",
+                     help="Start every Chrome from a clone of a profile primed once per session (HTTP cache + consent cookies)")
+    parser.addoption("--no-animations", action="store_true",
+                     help="Disable CSS transitions/animations and smooth scrolling in the browser; page objects skip animation waits")
+    parser.addoption("--no-web-metrics", action="store_true",
+                     help="Do not record browser performance metrics (TTFB, LCP, CLS...) after each navigation")
+    parser.addoption("--no-step-timing", action="store_true",
+                     help="Do not instrument commands, waits, sleeps and page-object methods to report where the time went")
+    parser.addoption("--no-roundtrip-count", action="store_true",
+                     help="Do not count WebDriver round trips (max_roundtrips budgets are not enforced)")
+    parser.addoption("--roundtrip-detail", action="store_true",
+                     help="Also measure JSON bytes and attribute round trips to page-object methods (slower)")
+    parser.addoption("--roundtrip-budget-action", action="store", default=Config.ROUNDTRIP_BUDGET_ACTION,
+                     choices=["fail", "warn", "off"],
+                     help="What to do when a test body exceeds its max_roundtrips marker: fail the test, warn, or ignore")
+    parser.addoption("--trace-dir", action="store", default=None,
+                     help="Write a Chrome trace-event timeline (Perfetto / chrome://tracing) of every test to this directory")
+    parser.addoption("--no-duration-scheduling", action="store_true",
+                     help="Use xdist's default load distribution instead of longest-first scheduling by historical duration")
+    parser.addoption("--har-dir", action="store", default=Config.HAR_DIR, help="Directory of the recorded HAR archive")
+    parser.addoption("--benchmark", action="store_true",
+                     help="Run the page-object benchmark against the local synthetic site (deselected otherwise)")
 
 def pytest_configure(config):
-    """Configuración de pytest para los marcadores"""
+    """Configuración de pytest: marcadores, Allure y canal de resultados"""
     config.addinivalue_line(
         "markers", "footer: Tests relacionados con el footer"
     )
@@ -47,39 +96,262 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "login: Tests de login"
     )
+    config.addinivalue_line(
+        "markers", "benchmark: Benchmark de page objects contra el sitio sintético local"
+    )
+    config.addinivalue_line(
+        "markers", "block_requests(profile): Perfil de bloqueo de peticiones del test (off, analytics, standard, strict)"
+    )
+    config.addinivalue_line(
+        "markers", "max_roundtrips(limit, action=None): Máximo de viajes al WebDriver del cuerpo del test (action: fail, warn)"
+    )
+    
+    # Configurar opciones para reportes Allure si están disponibles
+    if hasattr(config, 'option') and config.option.allure_report_dir:
+        import allure
+        allure.dynamic.title("Pruebas Automatizadas FLYR")
+        allure.dynamic.description("Suite de pruebas automatizadas para el sitio FLYR")
+    
+    # Canal de escritura de resultados (los workers de xdist no escriben directamente en las BD compartidas)
+    ResultSink.configure(config.getoption("--results-mode"), os.environ.get("PYTEST_XDIST_WORKER"))
+    
+    # Métricas de rendimiento por navegación (tabla navigation_metrics)
+    WebMetrics.enabled = not config.getoption("--no-web-metrics")
+    
+    # Desglose del tiempo de cada test (comandos, esperas, sleeps, screenshots, pasos y page objects)
+    if not config.getoption("--no-step-timing") or config.getoption("--trace-dir"):
+        StepTimer.install()
+    
+    # Viajes al WebDriver por test (tabla roundtrip_counts y marker max_roundtrips); bytes y métodos con --roundtrip-detail
+    if not config.getoption("--no-roundtrip-count"):
+        RoundTripCounter.install(detailed=config.getoption("--roundtrip-detail"))
+    
+    # Run del benchmark: el controlador lo fija en el entorno antes de lanzar los workers de xdist
+    if config.getoption("--benchmark"):
+        os.environ.setdefault("BENCHMARK_RUN_ID", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    
+    # Duración real de cada test (tabla test_durations): la registra solo el controlador, que es quien reparte
+    if not hasattr(config, "workerinput"):
+        DurationHistory.active = DurationHistory(config.getoption("--browser"))
+    
+    # Nueva grabación HAR: el controlador vacía el archivo antes de lanzar los workers, que solo escriben su segmento
+    if config.getoption("--har-mode") == "record" and not hasattr(config, "workerinput"):
+        from utils.har_archive import HarArchive
+        HarArchive.clear(config.getoption("--har-dir"))
+    
+    # Línea de tiempo de cada test en formato Trace Event (la misma instrumentación alimenta la traza)
+    if config.getoption("--trace-dir"):
+        StepTimer.tracer = TraceRecorder(config.getoption("--trace-dir"))
+        TraceRecorder.instrument_video(StepTimer.tracer)
+
+def _create_driver(browser_name, headless, implicit_wait=Config.IMPLICIT_WAIT, profile_template=None):
+    """Crear un driver nuevo según el navegador solicitado"""
+    if browser_name.lower() == 'chrome':
+        if profile_template is None:
+            return _setup_chrome_desktop(headless, implicit_wait)
+        # ARRANQUE EN CALIENTE: clon del perfil plantilla (se borra al cerrar el driver)
+        user_data_dir = profile_template.clone()
+        driver = _setup_chrome_desktop(headless, implicit_wait, user_data_dir)
+        return profile_template.track(driver, user_data_dir)
+    elif browser_name.lower() == 'firefox':
+        return _setup_firefox_desktop(headless, implicit_wait)
+    else:
+        raise ValueError(f"Navegador no soportado: {browser_name}")
+
+@pytest.fixture(scope="session")
+def profile_template(request):
+    """Perfil de Chrome preparado una vez por sesión (y worker) para clonarlo en cada driver; None sin --profile-template"""
+    browser_name = request.config.getoption("--browser")
+    if not request.config.getoption("--profile-template"):
+        yield None
+        return
+    if browser_name.lower() != 'chrome':
+        logger.warning(f"⚠️  --profile-template solo aplica a Chrome; {browser_name} arranca con perfil vacío")
+        yield None
+        return
+    
+    from utils.profile_template import ProfileTemplate
+    
+    headless = request.config.getoption("--headless")
+    base_url = request.config.getoption("--base-url").rstrip("/")
+    template = ProfileTemplate(Config.PROFILE_TEMPLATE_ROOT)
+    template.prepare(
+        lambda user_data_dir: _setup_chrome_desktop(headless, Config.IMPLICIT_WAIT, user_data_dir),
+        [f"{base_url}/{path}" for path in Config.PROFILE_WARM_PATHS]
+    )
+    
+    yield template
+    
+    template.close()
+
+@pytest.fixture(scope="session")
+def driver_pool(request, profile_template):
+    """Pool de navegadores calientes por worker de xdist"""
+    browser_name = request.config.getoption("--browser")
+    headless = request.config.getoption("--headless")
+    implicit_wait = request.config.getoption("--implicit-wait")
+    
+    pool = DriverPool(
+        factory=lambda: _create_driver(browser_name, headless, implicit_wait, profile_template),
+        max_uses=request.config.getoption("--pool-max-uses")
+    )
+    
+    yield pool
+    
+    pool.close_all()
+
+@pytest.fixture(scope="session")
+def har_archive(request):
+    """Archivo HAR de la sesión; None si --har-mode es off"""
+    mode = request.config.getoption("--har-mode")
+    if mode == "off":
+        yield None
+        return
+    
+    from utils.har_archive import HarArchive
+    
+    archive = HarArchive(request.config.getoption("--har-dir"))
+    if mode == "replay":
+        if not archive.open_for_replay():
+            pytest.exit(f"❌ No hay grabaciones en {archive.archive_dir}: ejecuta antes con --har-mode record", returncode=4)
+    
+    yield archive
+    
+    archive.close()
 
 @pytest.fixture
-def browser(request):
+def browser(request, driver_pool, har_archive, profile_template):
     """Fixture para inicializar navegador en modo DESKTOP"""
     browser_name = request.config.getoption("--browser")
     headless = request.config.getoption("--headless")
+    use_pool = not request.config.getoption("--no-driver-pool")
     
     print(f"\n🚀 Iniciando {browser_name.upper()} (headless: {headless}) - MODO DESKTOP")
     
     driver = None
     
     try:
-        if browser_name.lower() == 'chrome':
-            driver = _setup_chrome_desktop(headless)
-        elif browser_name.lower() == 'firefox':
-            driver = _setup_firefox_desktop(headless)
+        if use_pool:
+            driver = driver_pool.acquire()
         else:
-            raise ValueError(f"Navegador no soportado: {browser_name}")
+            driver = _create_driver(browser_name, headless, request.config.getoption("--implicit-wait"), profile_template)
+        
+        # BIBLIOTECA __qa DEL NAVEGADOR: registrada en la pestaña del test, la reciben todos sus documentos
+        QaRuntime.install(driver)
+        
+        # SIN ANIMACIONES NI SCROLL SUAVE (--no-animations): los page objects dejan de esperar animaciones
+        if request.config.getoption("--no-animations"):
+            QaRuntime.disable_animations(driver)
+        
+        # COOKIES DE CONSENTIMIENTO DE LA PLANTILLA (el pool las borra entre tests)
+        if profile_template is not None:
+            profile_template.apply_cookies(driver)
         
         print(f"✅ {browser_name.upper()} inicializado correctamente en modo DESKTOP")
         
-        # ENTREGAR EL DRIVER AL TEST
-        yield driver
+        # GRABAR O REPRODUCIR LA RED DEL TEST (--har-mode)
+        har_session = None
+        if har_archive is not None:
+            from utils.har_archive import HarSession
+            har_session = HarSession.attach(driver, request.config.getoption("--har-mode"), har_archive)
         
-        # CERRAR EL NAVEGADOR DESPUÉS DEL TEST
-        print("🔴 Cerrando navegador")
-        driver.quit()
+        # BLOQUEAR PETICIONES DE TERCEROS SEGÚN EL PERFIL DEL TEST
+        blocker = _attach_request_blocker(request, driver)
+        
+        # EVENTOS DE RED DEL TEST EN LA TRAZA (--trace-dir)
+        if StepTimer.tracer is not None:
+            StepTimer.tracer.attach_network(driver)
         
     except Exception as e:
         print(f"❌ Error inicializando {browser_name}: {e}")
+        # Un navegador a medio preparar no vuelve al pool: se cierra
+        if driver is not None:
+            if use_pool:
+                driver_pool.release(driver, discard=True)
+            else:
+                _quit_driver(driver)
         raise
+    
+    # ENTREGAR EL DRIVER AL TEST
+    yield driver
+    
+    try:
+        if har_session is not None:
+            har_session.detach()
+        
+        if blocker is not None:
+            stats = blocker.detach()
+            DatabaseManager().save_blocking_stats(request.node.name, browser_name, stats, blocker.changed_sizes)
+        
+        if StepTimer.tracer is not None:
+            StepTimer.tracer.detach_network()
+    finally:
+        # DEVOLVER EL NAVEGADOR AL POOL (O CERRARLO) DESPUÉS DEL TEST, aunque falle la recogida de datos
+        if use_pool:
+            print("♻️  Devolviendo navegador al pool")
+            driver_pool.release(driver)
+        else:
+            print("🔴 Cerrando navegador")
+            driver.quit()
 
-def _setup_chrome_desktop(headless=False):
+def _quit_driver(driver):
+    """Cerrar un driver sin ocultar el error original del fixture"""
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"⚠️  No se pudo cerrar el navegador: {e}")
+
+def _attach_request_blocker(request, driver):
+    """Activar el perfil de bloqueo del test (marcadores o --block-profile)"""
+    if not RequestBlocker.sizes_loaded:
+        # Tamaños aprendidos en ejecuciones anteriores para estimar los bytes ahorrados
+        RequestBlocker.known_sizes.update(DatabaseManager().get_resource_sizes())
+        RequestBlocker.sizes_loaded = True
+    
+    profile = RequestBlocker.profile_for(request.node, default=request.config.getoption("--block-profile"))
+    return RequestBlocker.attach(driver, profile, block_images=request.config.getoption("--block-images"))
+
+@pytest.fixture
+def session_cache(request, browser):
+    """Sesión autenticada: login por la UI una vez por worker y restauración de cookies/storage en el resto de tests"""
+    from utils.session_cache import SessionCache
+    
+    cache = SessionCache(
+        browser, Config.LOGIN_USERNAME, Config.LOGIN_PASSWORD,
+        enabled=not request.config.getoption("--no-session-cache"),
+        max_age=Config.SESSION_MAX_AGE
+    )
+    
+    yield cache
+    
+    # Quitar el script de restauración antes de que el navegador vuelva al pool
+    cache.release()
+
+@pytest.fixture
+def video_recorder(request, browser):
+    """Grabación continua del test; con retención on_failure el video solo se escribe si el test falla"""
+    from utils.video_recorder import VideoRecorder
+    
+    test_name = re.sub(r"[^\w\-]+", "_", request.node.name).strip("_")
+    recorder = VideoRecorder(
+        test_name=test_name,
+        browser_name=browser.name,
+        retention=request.config.getoption("--video-retention")
+    )
+    recorder.start_recording(browser)
+    
+    # pytest_runtest_makereport lo encuentra aquí para guardar el buffer si el test falla
+    request.node.video_recorder = recorder
+    
+    yield recorder
+    
+    if recorder.recording:
+        video_path = recorder.stop_recording()
+        if video_path:
+            attach_video(video_path, test_name)
+    recorder.discard_buffer()
+
+def _setup_chrome_desktop(headless=False, implicit_wait=Config.IMPLICIT_WAIT, user_data_dir=None):
     """Configurar Chrome en modo DESKTOP"""
     # RUTA AL CHROMEDRIVER MANUAL
     chrome_driver_path = os.path.join(os.getcwd(), "drivers", "chromedriver.exe")
@@ -108,6 +380,12 @@ def _setup_chrome_desktop(headless=False):
     if headless:
         options.add_argument("--headless=new")
     
+    # PERFIL PROPIO (clon del perfil plantilla con la caché ya descargada)
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+    
     # OPCIONES DE SEGURIDAD Y RENDIMIENTO
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
@@ -130,6 +408,9 @@ def _setup_chrome_desktop(headless=False):
     }
     options.add_experimental_option("prefs", prefs)
     
+    # LOG DE PERFORMANCE: expone los eventos CDP Network.* (NetworkCapture / NetworkIdleWaiter)
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    
     # INICIALIZAR CHROME CON CHROMEDRIVER MANUAL
     service = ChromeService(executable_path=chrome_driver_path)
     driver = webdriver.Chrome(service=service, options=options)
@@ -137,8 +418,8 @@ def _setup_chrome_desktop(headless=False):
     # EJECUTAR SCRIPT PARA OCULTAR WEBDRIVER
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
     
-    # CONFIGURAR TIEMPOS DE ESPERA
-    driver.implicitly_wait(10)
+    # CONFIGURAR TIEMPOS DE ESPERA (0 = las búsquedas vacías vuelven al instante)
+    driver.implicitly_wait(implicit_wait)
     
     # MAXIMIZAR VENTANA SI NO ESTÁ EN HEADLESS
     if not headless:
@@ -146,7 +427,7 @@ def _setup_chrome_desktop(headless=False):
     
     return driver
 
-def _setup_firefox_desktop(headless=False):
+def _setup_firefox_desktop(headless=False, implicit_wait=Config.IMPLICIT_WAIT):
     """Configurar Firefox en modo DESKTOP"""
     # RUTA AL GECKODRIVER MANUAL
     gecko_driver_path = os.path.join(os.getcwd(), "drivers", "geckodriver.exe")
@@ -187,8 +468,8 @@ def _setup_firefox_desktop(headless=False):
     # CONFIGURAR TAMAÑO DE VENTANA
     driver.set_window_size(1920, 1080)
     
-    # CONFIGURAR TIEMPOS DE ESPERA
-    driver.implicitly_wait(10)
+    # CONFIGURAR TIEMPOS DE ESPERA (0 = las búsquedas vacías vuelven al instante)
+    driver.implicitly_wait(implicit_wait)
     
     # MAXIMIZAR VENTANA SI NO ESTÁ EN HEADLESS
     if not headless:
@@ -239,15 +520,13 @@ class TestDatabase:
     def save_test_result(self, test_case, status, details="", additional_info="", browser="chrome", headless=False):
         """Guardar resultado de prueba en la base de datos"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute('''
+            ResultSink.write(self.db_path, '''
                 INSERT INTO test_results 
                 (test_case, status, details, additional_info, browser, headless)
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (test_case, status, details, additional_info, browser, headless))
             
-            self.connection.commit()
-            logger.info(f"✅ Resultado guardado en BD: {test_case} - {status}")
+            logger.info(f"✅ Resultado registrado en BD: {test_case} - {status}")
             
         except Exception as e:
             logger.error(f"❌ Error guardando resultado en BD: {e}")
@@ -318,24 +597,40 @@ def log_test_execution(request, setup_database):
         additional_info=f"Método: {request.node.originalname if hasattr(request.node, 'originalname') else 'N/A'}"
     )
 
+def pytest_collection_modifyitems(config, items):
+    """Dejar fuera el benchmark del sitio sintético salvo con --benchmark"""
+    if config.getoption("--benchmark"):
+        return
+    deselected = [item for item in items if item.get_closest_marker("benchmark")]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if not item.get_closest_marker("benchmark")]
+
 def pytest_html_report_title(report):
     """Configurar título del reporte HTML"""
     report.title = "Pruebas Automatizadas - FLYR"
 
-def pytest_configure(config):
-    """Configuración adicional de pytest"""
-    # Configurar opciones para reportes Allure si están disponibles
-    if hasattr(config, 'option') and config.option.allure_report_dir:
-        import allure
-        allure.dynamic.title("Pruebas Automatizadas FLYR")
-        allure.dynamic.description("Suite de pruebas automatizadas para el sitio FLYR")
-
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Hook para obtener el resultado de los tests para Allure"""
     outcome = yield
     rep = outcome.get_result()
     
+    # Exponer el resultado de cada fase en el item (rep_setup / rep_call / rep_teardown)
+    setattr(item, f"rep_{rep.when}", rep)
+    
+    # Worker de xdist: las escrituras del test viajan al controlador dentro del reporte
+    if rep.when == "teardown":
+        ResultSink.attach_to_report(rep)
+    
+    # Video del fallo: con retención on_failure es el único momento en que se codifica
+    if rep.failed and rep.when in ("setup", "call"):
+        recorder = getattr(item, "video_recorder", None)
+        if recorder is not None and recorder.retention == "on_failure":
+            video_path = recorder.save_buffer()
+            if video_path:
+                attach_video(video_path, item.name)
+    
     # Guardar screenshot en caso de fallo
     if rep.when == "call" and rep.failed:
         try:
@@ -346,6 +641,74 @@ def pytest_runtest_makereport(item, call):
         except Exception as e:
             logger.warning(f"No se pudo tomar screenshot: {e}")
 
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_setup(item):
+    """Empezar el desglose de tiempo del test (incluye la creación de fixtures)"""
+    if StepTimer.installed:
+        StepTimer.start_test(item.nodeid)
+    if StepTimer.tracer is not None:
+        StepTimer.tracer.start(item.nodeid)
+    if RoundTripCounter.installed:
+        RoundTripCounter.start_test(item.nodeid)
+    yield
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Presupuesto de viajes al WebDriver del cuerpo del test (@pytest.mark.max_roundtrips)"""
+    marker = item.get_closest_marker("max_roundtrips")
+    before = RoundTripCounter.roundtrips()
+    outcome = yield
+    if marker is None or not RoundTripCounter.installed:
+        return
+    
+    limit = marker.args[0] if marker.args else marker.kwargs["limit"]
+    action = marker.kwargs.get("action") or item.config.getoption("--roundtrip-budget-action")
+    used = RoundTripCounter.roundtrips() - before
+    if used <= limit or action == "off":
+        return
+    
+    message = f"{item.nodeid}: {used} viajes al WebDriver, presupuesto {limit} (max_roundtrips)"
+    if action == "fail" and outcome.excinfo is None:
+        outcome.force_exception(AssertionError(f"❌ {message}"))
+    else:
+        logger.warning(f"📡 {message}")
+        item.warn(pytest.PytestWarning(message))
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    """Guardar el desglose antes del reporte de teardown (así viaja al controlador de xdist)"""
+    yield
+    if StepTimer.tracer is not None:
+        StepTimer.tracer.finish()
+    if StepTimer.installed:
+        rows = StepTimer.finish_test()
+        if not item.config.getoption("--no-step-timing"):
+            DatabaseManager().save_step_timings(StepTimer.run_id, rows)
+    if RoundTripCounter.installed:
+        marker = item.get_closest_marker("max_roundtrips")
+        budget = (marker.args[0] if marker.args else marker.kwargs.get("limit")) if marker else None
+        DatabaseManager().save_roundtrip_counts(RoundTripCounter.run_id, RoundTripCounter.finish_test(budget))
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_logreport(report):
+    """Controlador de xdist: persistir las escrituras que envían los workers y la duración de cada test"""
+    ResultSink.collect_from_report(report)
+    if DurationHistory.active is not None:
+        DurationHistory.active.record(report)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Controlador de xdist: repartir primero los tests más largos según su duración histórica (LPT)"""
+    if config.getoption("--no-duration-scheduling") or config.getoption("dist") != "load":
+        return None
+    from utils.lpt_scheduling import LPTScheduling
+    return LPTScheduling(config, log, DurationHistory.active)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Controlador de xdist: escrituras que quedaron pendientes cuando el worker terminó"""
+    ResultSink.replay(getattr(node, "workeroutput", {}).get(ResultSink.USER_PROPERTY, []))
+
 def take_screenshot_on_failure(driver, test_name):
     """Tomar screenshot cuando un test falla"""
     try:
@@ -372,6 +735,86 @@ def take_screenshot_on_failure(driver, test_name):
     except Exception as e:
         logger.error(f"Error tomando screenshot: {e}")
 
+def attach_video(video_path, test_name):
+    """Adjuntar un video a Allure si está disponible"""
+    try:
+        import allure
+        allure.attach.file(
+            video_path,
+            name=f"Video_{test_name}",
+            attachment_type=allure.attachment_type.MP4
+        )
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.warning(f"No se pudo adjuntar video: {e}")
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Informes de fin de ejecución: dónde se fue el tiempo y cuántos viajes al WebDriver hizo cada test"""
+    if hasattr(config, "workerinput"):
+        return
+    if StepTimer.installed and not config.getoption("--no-step-timing"):
+        _step_timing_summary(terminalreporter)
+    if RoundTripCounter.installed:
+        _roundtrip_summary(terminalreporter)
+    if config.getoption("--benchmark"):
+        _benchmark_summary(terminalreporter)
+
+def _benchmark_summary(terminalreporter):
+    """Tiempos del benchmark de esta ejecución (el controlador ya tiene las filas de todos los workers)"""
+    run_id = os.environ.get("BENCHMARK_RUN_ID")
+    rows = DatabaseManager().get_benchmark_summary(run_id)
+    if not rows:
+        return
+    
+    terminalreporter.write_sep("=", f"⏱️  BENCHMARK (run {run_id})")
+    for method, runs, avg, fastest, slowest, passed in rows:
+        terminalreporter.write_line(f"   {method:<50} {avg:6.2f}s  (min {fastest:.2f}s, max {slowest:.2f}s, {passed}/{runs} OK)")
+
+def _roundtrip_summary(terminalreporter):
+    """Tests y métodos de page objects con más viajes al WebDriver"""
+    db = DatabaseManager()
+    tests = db.get_roundtrip_report(RoundTripCounter.run_id, kind="test", limit=5)
+    if not tests:
+        return
+    
+    terminalreporter.write_sep("=", f"📡 VIAJES AL WEBDRIVER (run {RoundTripCounter.run_id})")
+    terminalreporter.write_line("🔁 Tests con más viajes:")
+    for name, _, roundtrips, sent, received in tests:
+        sizes = f"  ({sent // 1024} KB enviados, {received // 1024} KB recibidos)" if RoundTripCounter.detailed else ""
+        terminalreporter.write_line(f"   {roundtrips:6d}  {name}{sizes}")
+    
+    methods = db.get_roundtrip_report(RoundTripCounter.run_id, kind="method", limit=15)
+    if methods:
+        terminalreporter.write_line("\n📋 Métodos de page objects con más viajes (incluye los de sus llamadas internas):")
+        for name, tests_count, roundtrips, sent, received in methods:
+            terminalreporter.write_line(f"   {roundtrips:6d}  {name:<55} en {tests_count} tests ({received // 1024} KB recibidos)")
+
+def _step_timing_summary(terminalreporter):
+    """Dónde se fue el tiempo: categorías, tests, pasos y métodos de page objects más costosos"""
+    db = DatabaseManager()
+    tests = db.get_step_timing_report(StepTimer.run_id, kind="test", limit=-1)
+    if not tests:
+        return
+    
+    def breakdown(command, screenshot, wait, sleep):
+        return f"comandos {command:.1f}s, screenshots {screenshot:.1f}s, esperas {wait:.1f}s, sleeps {sleep:.1f}s"
+    
+    terminalreporter.write_sep("=", f"⏱️  ¿DÓNDE SE FUE EL TIEMPO? (run {StepTimer.run_id})")
+    totals = [sum(row[i] for row in tests) for i in (2, 3, 4, 5, 6, 7)]
+    terminalreporter.write_line(f"{len(tests)} tests, {totals[0]:.1f}s: {breakdown(*totals[1:5])}, resto {totals[5]:.1f}s")
+    
+    terminalreporter.write_line("\n🐢 Tests más lentos:")
+    for name, _, total, command, screenshot, wait, sleep, other in tests[:5]:
+        terminalreporter.write_line(f"   {total:7.1f}s  {name}  ({breakdown(command, screenshot, wait, sleep)})")
+    
+    for kind, title in (("method", "Métodos de page objects"), ("step", "Pasos de Allure")):
+        rows = db.get_step_timing_report(StepTimer.run_id, kind=kind, limit=15)
+        if rows:
+            terminalreporter.write_line(f"\n📋 {title} más costosos (total acumulado):")
+            for name, calls, total, command, screenshot, wait, sleep, _ in rows:
+                terminalreporter.write_line(f"   {total:7.1f}s  {name:<55} x{calls:<4} ({breakdown(command, screenshot, wait, sleep)})")
+
 # Configuración para ejecución en paralelo con xdist
 def pytest_sessionstart(session):
     """Ejecutar al inicio de la sesión de pruebas"""
@@ -386,6 +829,19 @@ def pytest_sessionfinish(session, exitstatus):
     """Ejecutar al finalizar la sesión de pruebas"""
     logger.info("🏁 Sesión de pruebas finalizada")
     
+    # Worker: lo que no viajó en ningún reporte se entrega al terminar
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput[ResultSink.USER_PROPERTY] = ResultSink.drain()
+    else:
+        ResultSink.merge_shards()
+    
+    # Confirmar las escrituras en lote pendientes
+    BatchWriter.close_all()
+    
+    from utils.session_cache import SessionCache
+    if SessionCache.logins or SessionCache.restores:
+        logger.info(f"🔐 Sesiones: {SessionCache.logins} logins por la UI, {SessionCache.restores} restauradas desde la caché")
+    
     # Mostrar resumen de resultados si la BD está disponible
     try:
         database = TestDatabase()
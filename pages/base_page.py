@@ -1,8 +1,67 @@
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException, StaleElementReferenceException
 import os
+import time
 from datetime import datetime
+from utils.network_idle import NetworkIdleWaiter
+from utils.locator_cache import LocatorCache
+from utils.web_metrics import WebMetrics
+from utils.qa_runtime import QaRuntime
+
+# Tramo máximo de cada sondeo asíncrono (debe quedar por debajo del script timeout de Selenium, 30s)
+FIND_FIRST_CHUNK_SECONDS = 20
+
+class ElementSnapshot:
+    """Propiedades leídas de un elemento en BasePage.snapshot; conserva la referencia para actuar sobre él"""
+    
+    __slots__ = ("text", "href", "class_name", "tag", "value", "displayed", "enabled", "attributes",
+                 "locator", "index", "_element", "_page")
+    
+    # Propiedad del script -> atributo del registro (el resto va a attributes)
+    FIELDS = {"text": "text", "href": "href", "class": "class_name", "tag": "tag", "value": "value",
+              "displayed": "displayed", "enabled": "enabled"}
+    
+    def __init__(self, page, locator, index, element, values):
+        for field in self.FIELDS.values():
+            setattr(self, field, None)
+        self.attributes = {}
+        for prop, value in values.items():
+            if prop in self.FIELDS:
+                setattr(self, self.FIELDS[prop], value)
+            else:
+                self.attributes[prop] = value
+        self.locator = locator
+        self.index = index
+        self._element = element
+        self._page = page
+    
+    def get(self, prop, default=None):
+        """Valor de cualquier propiedad pedida, por su nombre en el script"""
+        if prop in self.FIELDS:
+            return getattr(self, self.FIELDS[prop])
+        return self.attributes.get(prop, default)
+    
+    @property
+    def element(self):
+        """WebElement devuelto por el script (sin comprobar si sigue en el DOM)"""
+        return self._element
+    
+    def resolve(self):
+        """WebElement vivo; si Angular re-renderizó el nodo, se vuelve a buscar por localizador y posición"""
+        try:
+            self._element.tag_name
+            return self._element
+        except StaleElementReferenceException:
+            current = self._page.find_all_now(self.locator)
+            if self.index >= len(current):
+                raise
+            self._element = current[self.index]
+            return self._element
+    
+    def __repr__(self):
+        return f"<ElementSnapshot {self.tag or 'element'} {self.text!r} href={self.href!r} displayed={self.displayed}>"
 
 class BasePage:
     """Clase base para todas las páginas del proyecto"""
@@ -10,6 +69,7 @@ class BasePage:
     def __init__(self, driver):
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
+        self.wait_timings = []
     
     def find_element(self, locator):
         """Encontrar un elemento con espera explícita"""
@@ -135,6 +195,20 @@ class BasePage:
             print(f"❌ Error obteniendo información de página: {e}")
             return {'url': self.driver.current_url, 'title': self.driver.title}
     
+    def record_navigation_metrics(self, source):
+        """Guardar las métricas del navegador de la página recién cargada (nunca hace fallar el test)"""
+        if not WebMetrics.enabled:
+            return None
+        try:
+            self.wait_for_condition(
+                lambda driver: QaRuntime.call(driver, "readyState") == "complete",
+                timeout=10, name="document_complete"
+            )
+            return WebMetrics.record(self.driver, source)
+        except Exception as e:
+            print(f"⚠️  No se pudieron guardar las métricas de navegación: {e}")
+            return None
+    
     def wait_for_element(self, locator, timeout=10):
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
@@ -146,4 +220,218 @@ class BasePage:
             return element
         except Exception as e:
             print(f"❌ Elemento no encontrado: {locator} - {e}")
-            return None
\ No newline at end of file
+            return None
+
+    # ===== ESPERAS BASADAS EN CONDICIONES (reemplazan a time.sleep) =====
+
+    def _record_wait(self, condition, started, satisfied):
+        """Registrar cuánto tardó realmente una espera"""
+        elapsed = time.time() - started
+        self.wait_timings.append({'condition': condition, 'seconds': elapsed, 'satisfied': satisfied})
+        if not satisfied:
+            print(f"⚠️  Espera '{condition}' agotó el tiempo tras {elapsed:.2f}s")
+        return satisfied
+
+    def _run_wait_script(self, condition, function, *args, timeout=10):
+        """Ejecutar una espera asíncrona de la biblioteca __qa que resuelve en el navegador"""
+        started = time.time()
+        try:
+            satisfied = bool(QaRuntime.call_async(self.driver, function, *args, int(timeout * 1000)))
+        except WebDriverException as e:
+            print(f"⚠️  Error en espera '{condition}': {e.msg if hasattr(e, 'msg') else e}")
+            satisfied = False
+        return self._record_wait(condition, started, satisfied)
+
+    def wait_for_condition(self, condition, timeout=10, name="condition"):
+        """Esperar a que una condición Python sea verdadera (sondeo cada 100ms)"""
+        started = time.time()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(condition)
+            satisfied = True
+        except TimeoutException:
+            satisfied = False
+        return self._record_wait(name, started, satisfied)
+
+    def wait_for_dom_stable(self, quiet_ms=300, timeout=10):
+        """Esperar a que el DOM no cambie durante quiet_ms (MutationObserver)"""
+        return self._run_wait_script("dom_stable", "waitDomQuiet", quiet_ms, timeout=timeout)
+
+    def wait_for_angular_stable(self, timeout=10):
+        """Esperar a que la zona de Angular esté estable (sin tareas ni HTTP pendientes)"""
+        return self._run_wait_script("angular_stable", "waitAngular", timeout=timeout)
+
+    def wait_for_network_idle(self, quiet_ms=500, timeout=15):
+        """Esperar a que no haya peticiones en vuelo durante quiet_ms (CDP si está disponible)"""
+        waiter = NetworkIdleWaiter.for_driver(self.driver)
+        if waiter is None:
+            return self._run_wait_script("network_idle", "waitNetworkQuiet", quiet_ms, timeout=timeout)
+        
+        started = time.time()
+        try:
+            satisfied = waiter.wait(timeout=timeout, idle_ms=quiet_ms)
+        except WebDriverException as e:
+            print(f"⚠️  Error en espera 'network_idle': {e}")
+            satisfied = False
+        return self._record_wait("network_idle", started, satisfied)
+
+    def wait_for_animations(self, element=None, timeout=5):
+        """Esperar a que terminen las animaciones/transiciones (de un elemento o de toda la página)"""
+        # Modo sin animaciones (--no-animations) en esta pestaña: no hay nada que esperar
+        if QaRuntime.animations_disabled(self.driver):
+            return self._record_wait("animations", time.time(), True)
+        return self._run_wait_script("animations", "waitAnimations", element, timeout=timeout)
+
+    def wait_for_ui_settled(self, timeout=10):
+        """Esperar a que la UI quede quieta: Angular estable, sin animaciones y DOM sin cambios"""
+        deadline = time.time() + timeout
+        settled = self.wait_for_angular_stable(timeout=timeout)
+        settled = self.wait_for_animations(timeout=max(deadline - time.time(), 0.5)) and settled
+        settled = self.wait_for_dom_stable(timeout=max(deadline - time.time(), 0.5)) and settled
+        return settled
+
+    # ===== BÚSQUEDA CON VARIOS LOCALIZADORES (un solo sondeo en el navegador) =====
+
+    @staticmethod
+    def _locator_spec(locator):
+        """Traducir un localizador (By, valor) al formato que entienden las búsquedas de __qa"""
+        by, value = locator
+        if by == By.XPATH:
+            return {'kind': 'xpath', 'value': value}
+        if by == By.CSS_SELECTOR:
+            return {'kind': 'css', 'value': value}
+        if by == By.ID:
+            return {'kind': 'css', 'value': f'[id="{value}"]'}
+        if by == By.NAME:
+            return {'kind': 'css', 'value': f'[name="{value}"]'}
+        if by == By.TAG_NAME:
+            return {'kind': 'css', 'value': value}
+        if by == By.CLASS_NAME:
+            return {'kind': 'class', 'value': value}
+        if by == By.LINK_TEXT:
+            return {'kind': 'link', 'value': value}
+        if by == By.PARTIAL_LINK_TEXT:
+            return {'kind': 'partial_link', 'value': value}
+        raise ValueError(f"Estrategia de localización no soportada: {by}")
+
+    def find_first(self, *locators, timeout=10, visible=True):
+        """Devolver (elemento, localizador) del primer localizador que encuentre un elemento usable"""
+        specs = [self._locator_spec(locator) for locator in locators]
+        started = time.time()
+        deadline = started + timeout
+        
+        while True:
+            chunk = min(max(deadline - time.time(), 0), FIND_FIRST_CHUNK_SECONDS)
+            try:
+                result = QaRuntime.call_async(self.driver, "find", specs, visible, int(chunk * 1000))
+            except WebDriverException as e:
+                # Una navegación en curso descarta el script; se reintenta en la página nueva
+                print(f"⚠️  Sondeo find_first interrumpido: {e.msg if hasattr(e, 'msg') else e}")
+                result = None
+                time.sleep(0.1)
+            
+            if result:
+                element, index = result
+                self._record_wait('find_first', started, True)
+                return element, locators[index]
+            if time.time() >= deadline:
+                break
+        
+        self._record_wait('find_first', started, False)
+        print(f"❌ Ningún localizador encontró elemento en {timeout}s: {list(locators)}")
+        raise TimeoutException(f"Ningún localizador encontró elemento en {timeout}s")
+
+    # ===== LOCALIZADORES CON MEMORIA (caché persistente de la estrategia ganadora) =====
+
+    def locator_variants(self, name):
+        """Localizador principal y sus variantes declaradas en la clase (NOMBRE, NOMBRE_ALT, NOMBRE_TEXT...)"""
+        variants = [getattr(self, name)]
+        for attr in dir(type(self)):
+            value = getattr(type(self), attr)
+            if attr.startswith(name + "_") and isinstance(value, tuple) and len(value) == 2:
+                variants.append(value)
+        return variants
+
+    def find_first_named(self, name, *locators, timeout=10, visible=True):
+        """find_first probando primero la estrategia que funcionó la última vez en este entorno/idioma"""
+        locators = locators or self.locator_variants(name)
+        page = type(self).__name__
+        environment, language = LocatorCache.context_from_url(self.driver.current_url)
+        cache = LocatorCache.shared()
+        alive, dead = cache.rank(page, name, environment, language, locators)
+        
+        # Las estrategias muertas solo se reintentan (con poco margen) si fallan todas las vivas
+        for group, group_timeout in ((alive, timeout), (dead, min(timeout, 3) if alive else timeout)):
+            if not group:
+                continue
+            try:
+                element, locator = self.find_first(*group, timeout=group_timeout, visible=visible)
+            except TimeoutException:
+                cache.record(page, name, environment, language, failed=group)
+                continue
+            cache.record(page, name, environment, language, winner=locator, failed=group[:group.index(locator)])
+            return element, locator
+        
+        raise TimeoutException(f"Ninguna estrategia encontró '{name}' ({environment}/{language})")
+
+    # ===== PRESENCIA / AUSENCIA INMEDIATA (independiente de la espera implícita del driver) =====
+
+    def find_all_now(self, locator):
+        """Elementos que coinciden ahora mismo (lista vacía al instante si no hay ninguno)"""
+        try:
+            return QaRuntime.call(self.driver, "findAll", self._locator_spec(locator), False) or []
+        except WebDriverException as e:
+            print(f"⚠️  Error buscando {locator}: {e.msg if hasattr(e, 'msg') else e}")
+            return []
+
+    def count_now(self, locator):
+        """Número de elementos que coinciden ahora mismo (sin transferir referencias)"""
+        try:
+            return int(QaRuntime.call(self.driver, "findAll", self._locator_spec(locator), True) or 0)
+        except WebDriverException as e:
+            print(f"⚠️  Error contando {locator}: {e.msg if hasattr(e, 'msg') else e}")
+            return 0
+
+    def snapshot(self, locator, props=("text", "href", "class", "displayed", "enabled")):
+        """Propiedades de todos los elementos que coinciden ahora mismo, en un viaje (en vez de ~5 por elemento)"""
+        try:
+            rows = QaRuntime.call(self.driver, "snapshot", self._locator_spec(locator), list(props)) or []
+        except WebDriverException as e:
+            print(f"⚠️  Error leyendo {locator}: {e.msg if hasattr(e, 'msg') else e}")
+            return []
+        return [ElementSnapshot(self, locator, index, element, values) for index, (element, values) in enumerate(rows)]
+
+    def read_properties(self, element, props=("text", "href")):
+        """Propiedades de un elemento ya encontrado en un viaje ({} si ya no se puede leer)"""
+        try:
+            return QaRuntime.call(self.driver, "read", element, list(props)) or {}
+        except WebDriverException as e:
+            print(f"⚠️  Error leyendo el elemento: {e.msg if hasattr(e, 'msg') else e}")
+            return {}
+
+    # ===== ACCIONES EN EL NAVEGADOR (biblioteca __qa, sin animación) =====
+
+    def scroll_to(self, y, x=0):
+        """Scroll instantáneo a una posición (y='bottom' para el final del documento)"""
+        return QaRuntime.call(self.driver, "scrollTo", x, y)
+
+    def scroll_into_view(self, element, block="center"):
+        """Centrar un elemento en la vista sin scroll suave; devuelve si quedó visible"""
+        return QaRuntime.call(self.driver, "scrollIntoView", element, block)
+
+    def js_click(self, element):
+        """Click por JavaScript (centra el elemento antes); False si está deshabilitado o ya no está en el DOM"""
+        outcome = QaRuntime.call(self.driver, "click", element)
+        if outcome != "clicked":
+            print(f"⚠️  Click por JavaScript no realizado: {outcome}")
+        return outcome == "clicked"
+
+    def assert_absent(self, locator, within=0):
+        """Afirmar que no hay elementos: vuelve al instante si no hay ninguno, si no espera hasta within segundos"""
+        started = time.time()
+        if self.count_now(locator) == 0:
+            return self._record_wait("absent", started, True)
+        
+        if within > 0 and self.wait_for_condition(lambda driver: self.count_now(locator) == 0, timeout=within, name="absent"):
+            return True
+        
+        raise AssertionError(f"El elemento sigue presente tras {within}s: {locator}")
@@ -1,9 +1,11 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from pages.base_page import BasePage
+from utils.network_idle import NetworkIdleWaiter
+from utils.qa_runtime import QaRuntime
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -171,16 +173,13 @@ class HomePage(BasePage):
         """Método de compatibilidad - usa click_element del BasePage"""
         return self.click_element(locator)
 
-    def is_element_present(self, locator, timeout=5):
-        """Método de compatibilidad - usa is_element_visible del BasePage"""
-        return self.is_element_visible(locator)
-
     # ===== MÉTODO FALTANTE: NAVEGACIÓN =====
     def navigate_to(self, url):
         """Navegar a una URL específica"""
         logger.info(f"Navegando a: {url}")
         self.driver.get(url)
         self.wait_for_page_load()
+        self.record_navigation_metrics("navigate_to")
         return True
 
     # ===== MÉTODOS DE DIAGNÓSTICO =====
@@ -191,10 +190,11 @@ class HomePage(BasePage):
         
         try:
             # Buscar botón de login
-            login_buttons = self.driver.find_elements(By.CSS_SELECTOR, "button.auth_trigger_button, button[class*='auth'], button[class*='login']")
+            login_buttons = self.snapshot((By.CSS_SELECTOR, "button.auth_trigger_button, button[class*='auth'], button[class*='login']"),
+                                          props=("text", "class"))
             logger.info(f"🔍 Botones de login encontrados: {len(login_buttons)}")
             for i, btn in enumerate(login_buttons):
-                logger.info(f"  Botón {i+1}: Texto='{btn.text}', Clases='{btn.get_attribute('class')}'")
+                logger.info(f"  Botón {i+1}: Texto='{btn.text}', Clases='{btn.class_name}'")
             
             # Buscar campos de usuario
             user_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input#u-username, input[type='email'], input[type='text'], input[name*='user'], input[placeholder*='user'], input[placeholder*='email']")
@@ -236,35 +236,21 @@ class HomePage(BasePage):
             
             all_links = []
             for selector in selectors:
-                try:
-                    links = self.driver.find_elements(By.XPATH, selector)
-                    for link in links:
-                        try:
-                            href = link.get_attribute('href') or 'No href'
-                            text = link.text.strip() or 'No text'
-                            visible = link.is_displayed()
-                            enabled = link.is_enabled()
-                            
-                            link_info = {
-                                'selector': selector,
-                                'href': href,
-                                'text': text,
-                                'visible': visible,
-                                'enabled': enabled,
-                                'element': link
-                            }
-                            
-                            # Evitar duplicados
-                            if href not in [l['href'] for l in all_links]:
-                                all_links.append(link_info)
-                                
-                        except Exception as e:
-                            logger.debug(f"Error procesando enlace: {e}")
-                            continue
-                            
-                except Exception as e:
-                    logger.debug(f"Error con selector {selector}: {e}")
-                    continue
+                # Un viaje por selector con href, texto, visibilidad y estado de todos sus enlaces
+                for link in self.snapshot((By.XPATH, selector), props=("href", "text", "displayed", "enabled")):
+                    href = link.href or 'No href'
+                    link_info = {
+                        'selector': selector,
+                        'href': href,
+                        'text': link.text or 'No text',
+                        'visible': link.displayed,
+                        'enabled': link.enabled,
+                        'element': link.element
+                    }
+                    
+                    # Evitar duplicados
+                    if href not in [l['href'] for l in all_links]:
+                        all_links.append(link_info)
             
             # Log de todos los enlaces encontrados
             logger.info(f"🔍 Enlaces encontrados: {len(all_links)}")
@@ -305,13 +291,11 @@ class HomePage(BasePage):
             ]
             
             login_btn = None
-            for selector in login_selectors:
-                try:
-                    login_btn = self.wait.until(EC.element_to_be_clickable(selector))
-                    logger.info(f"✅ Botón de login encontrado con selector: {selector}")
-                    break
-                except:
-                    continue
+            try:
+                login_btn, selector = self.find_first(*login_selectors, timeout=10)
+                logger.info(f"✅ Botón de login encontrado con selector: {selector}")
+            except TimeoutException:
+                pass
             
             if not login_btn:
                 logger.error("❌ No se pudo encontrar el botón de login")
@@ -319,7 +303,7 @@ class HomePage(BasePage):
             
             # Hacer click en el botón de login
             self.click_element(login_btn)
-            time.sleep(3)  # Esperar a que se abra el modal
+            self.wait_for_ui_settled()  # Esperar a que se abra el modal
             
             # Tomar screenshot después de abrir el modal
             self.take_screenshot("modal_login_abierto.png")
@@ -342,13 +326,11 @@ class HomePage(BasePage):
             ]
             
             username_field = None
-            for selector in username_selectors:
-                try:
-                    username_field = self.wait.until(EC.element_to_be_clickable(selector))
-                    logger.info(f"✅ Campo de usuario encontrado con selector: {selector}")
-                    break
-                except:
-                    continue
+            try:
+                username_field, selector = self.find_first(*username_selectors, timeout=10)
+                logger.info(f"✅ Campo de usuario encontrado con selector: {selector}")
+            except TimeoutException:
+                pass
             
             if not username_field:
                 logger.error("❌ No se pudo encontrar el campo de usuario")
@@ -359,7 +341,7 @@ class HomePage(BasePage):
             username_field.clear()
             username_field.send_keys(username)
             logger.info(f"✅ Usuario ingresado: {username}")
-            time.sleep(1)
+            self.wait_for_angular_stable(timeout=3)
             
             # Paso 3: Llenar campo de contraseña
             logger.info("3. Llenando campo de contraseña...")
@@ -377,13 +359,11 @@ class HomePage(BasePage):
             ]
             
             password_field = None
-            for selector in password_selectors:
-                try:
-                    password_field = self.wait.until(EC.element_to_be_clickable(selector))
-                    logger.info(f"✅ Campo de contraseña encontrado con selector: {selector}")
-                    break
-                except:
-                    continue
+            try:
+                password_field, selector = self.find_first(*password_selectors, timeout=10)
+                logger.info(f"✅ Campo de contraseña encontrado con selector: {selector}")
+            except TimeoutException:
+                pass
             
             if not password_field:
                 logger.error("❌ No se pudo encontrar el campo de contraseña")
@@ -394,7 +374,7 @@ class HomePage(BasePage):
             password_field.clear()
             password_field.send_keys(password)
             logger.info("✅ Contraseña ingresada")
-            time.sleep(1)
+            self.wait_for_angular_stable(timeout=3)
             
             # Tomar screenshot con los campos llenos
             self.take_screenshot("campos_login_llenos.png")
@@ -413,13 +393,11 @@ class HomePage(BasePage):
             ]
             
             submit_btn = None
-            for selector in submit_selectors:
-                try:
-                    submit_btn = self.wait.until(EC.element_to_be_clickable(selector))
-                    logger.info(f"✅ Botón de submit encontrado con selector: {selector}")
-                    break
-                except:
-                    continue
+            try:
+                submit_btn, selector = self.find_first(*submit_selectors, timeout=10)
+                logger.info(f"✅ Botón de submit encontrado con selector: {selector}")
+            except TimeoutException:
+                pass
             
             if not submit_btn:
                 logger.error("❌ No se pudo encontrar el botón de submit")
@@ -432,7 +410,8 @@ class HomePage(BasePage):
             
             # Paso 5: Esperar a que el login procese
             logger.info("5. Esperando respuesta del login...")
-            time.sleep(5)  # Esperar más tiempo para el procesamiento
+            self.wait_for_network_idle(timeout=10)  # Esperar el procesamiento del login
+            self.wait_for_ui_settled()
             
             # Verificar si el login fue exitoso
             if self.verify_login_success():
@@ -452,6 +431,9 @@ class HomePage(BasePage):
     def verify_login_success(self):
         """Verificar si el login fue exitoso"""
         try:
+            # Los indicadores se comprueban al instante: primero esperar a que la página termine de renderizar
+            self.wait_for_ui_settled()
+            
             # Buscar elementos que indiquen login exitoso
             success_indicators = [
                 (By.XPATH, "//*[contains(text(), 'Mi cuenta') or contains(text(), 'My account')]"),
@@ -465,7 +447,7 @@ class HomePage(BasePage):
             ]
             
             for indicator in success_indicators:
-                if self.is_element_present(indicator, timeout=3):
+                if self.is_element_present(indicator):
                     element_text = self.find_element(indicator).text
                     logger.info(f"✅ Indicador de login exitoso encontrado: '{element_text}'")
                     return True
@@ -491,7 +473,7 @@ class HomePage(BasePage):
             ]
             
             for error_indicator in error_indicators:
-                if self.is_element_present(error_indicator, timeout=2):
+                if self.is_element_present(error_indicator):
                     error_text = self.find_element(error_indicator).text
                     logger.error(f"❌ Error en login: {error_text}")
                     return False
@@ -517,26 +499,17 @@ class HomePage(BasePage):
             offers_btn = self.wait.until(EC.element_to_be_clickable(self.OFFERS_DROPDOWN_BUTTON))
             logger.info("✅ Encontrado botón del menú Ofertas")
             self.click(offers_btn)
-            time.sleep(1)  # Pequeña pausa para animación del dropdown
+            self.wait_for_animations()  # Esperar la animación del dropdown
 
             # PASO 2: Una vez abierto el menú, buscar y hacer click en "Ofertas de vuelos"
-            # Intentar por clase y href exactos primero
-            try:
-                flights_link = self.wait.until(EC.element_to_be_clickable(self.OFFERS_FLIGHTS_LINK))
-                logger.info("✅ Encontrado enlace Ofertas de vuelos por selector principal")
-            except:
-                # Si falla, intentar por el texto del span
-                try:
-                    flights_link = self.wait.until(EC.element_to_be_clickable(self.OFFERS_FLIGHTS_LINK_TEXT))
-                    logger.info("✅ Encontrado enlace Ofertas de vuelos por texto")
-                except:
-                    # Último intento: buscar por href parcial y clase
-                    flights_link = self.wait.until(
-                        EC.element_to_be_clickable(
-                            (By.CSS_SELECTOR, "a[href*='ofertas-de-vuelos'].main-header_primary-nav_submenu_item--n3")
-                        )
-                    )
-                    logger.info("✅ Encontrado enlace por búsqueda alternativa")
+            # Variantes del enlace (principal, texto del span, alternativa) + búsqueda por href parcial y clase;
+            # la caché de localizadores prueba primero la que funcionó la última vez
+            flights_link, strategy = self.find_first_named(
+                "OFFERS_FLIGHTS_LINK",
+                *self.locator_variants("OFFERS_FLIGHTS_LINK"),
+                (By.CSS_SELECTOR, "a[href*='ofertas-de-vuelos'].main-header_primary-nav_submenu_item--n3")
+            )
+            logger.info(f"✅ Encontrado enlace Ofertas de vuelos con: {strategy}")
 
             # Capturar info antes del click
             href = flights_link.get_attribute('href')
@@ -551,9 +524,9 @@ class HomePage(BasePage):
                     break
                 except:
                     if attempt == max_attempts - 1:
-                        self.driver.execute_script("arguments[0].click();", flights_link)
+                        self.js_click(flights_link)
                     else:
-                        time.sleep(0.5)
+                        self.wait_for_animations(timeout=2)
                         continue
 
             # Esperar cambio de URL
@@ -565,6 +538,7 @@ class HomePage(BasePage):
             current_url = self.get_page_url()
             if '/ofertas-de-vuelos/' in current_url:
                 logger.info(f"✅ Navegación exitosa: {current_url}")
+                self.record_navigation_metrics("header_offers")
                 return True
             else:
                 logger.warning(f"⚠️ URL final no es la esperada: {current_url}")
@@ -580,6 +554,7 @@ class HomePage(BasePage):
         
         # Reducir timeout general
         fast_wait = WebDriverWait(self.driver, 5)
+        initial_url = self.get_page_url()
         
         try:
             # ESTRATEGIA DIRECTA: Buscar enlace por href/texto sin dropdowns
@@ -599,7 +574,7 @@ class HomePage(BasePage):
                     
                     # Espera mínima para cambio de página
                     WebDriverWait(self.driver, 8).until(
-                        lambda driver: driver.current_url != self.get_page_url()
+                        lambda driver: driver.current_url != initial_url
                     )
                     logger.info("✅ Navegación exitosa a Ofertas")
                     return True
@@ -637,13 +612,14 @@ class HomePage(BasePage):
                     logger.info(f"✅ Enlace check-in encontrado: {link.get_attribute('href')}")
                     
                     # Click con JavaScript para evitar problemas de overlays
-                    self.driver.execute_script("arguments[0].click();", link)
+                    self.js_click(link)
                     
                     # Esperar cambio de URL con timeout reducido
                     WebDriverWait(self.driver, 8).until(
                         lambda driver: driver.current_url != initial_url
                     )
                     logger.info("✅ Navegación exitosa a Check-in")
+                    self.record_navigation_metrics("header_checkin")
                     return True
                     
                 except Exception as e:
@@ -661,6 +637,7 @@ class HomePage(BasePage):
         logger.info("🚀 Navegando a Tarifas (optimizado)")
         
         fast_wait = WebDriverWait(self.driver, 5)
+        initial_url = self.get_page_url()
         
         try:
             # ESTRATEGIA DIRECTA: Buscar enlaces específicos
@@ -680,9 +657,10 @@ class HomePage(BasePage):
                     
                     # Espera mínima para cambio de página
                     WebDriverWait(self.driver, 8).until(
-                        lambda driver: driver.current_url != self.get_page_url()
+                        lambda driver: driver.current_url != initial_url
                     )
                     logger.info("✅ Navegación exitosa a Tarifas")
+                    self.record_navigation_metrics("header_tariffs")
                     return True
                     
                 except Exception as e:
@@ -713,7 +691,7 @@ class HomePage(BasePage):
                 logger.info("✅ Dropdown de ofertas abierto")
                 
                 # Hacer click en el enlace de ofertas de vuelos
-                flights_link = self.wait.until(EC.element_to_be_clickable(self.OFFERS_FLIGHTS_LINK))
+                flights_link, _ = self.find_first_named("OFFERS_FLIGHTS_LINK")
                 logger.info(f"✅ Enlace de ofertas de vuelos encontrado - URL: {flights_link.get_attribute('href')}")
                 self.click(flights_link)
                 
@@ -728,7 +706,7 @@ class HomePage(BasePage):
             
             # Esperar a que cargue la nueva página
             self.wait.until(EC.presence_of_element_located(self.PAGE_LOAD_INDICATOR))
-            time.sleep(2)  # Pausa adicional para asegurar carga
+            self.wait_for_ui_settled()  # Asegurar que la nueva página terminó de renderizar
             
             logger.info("✅ Navegación exitosa a Ofertas de vuelos")
             return True
@@ -854,7 +832,7 @@ class HomePage(BasePage):
                     try:
                         self.click(language_btn)
                     except:
-                        self.driver.execute_script("arguments[0].click();", language_btn)
+                        self.js_click(language_btn)
                     
                     # Verificar que el dropdown se abrió
                     self.wait.until(EC.visibility_of_element_located(self.LANGUAGE_DROPDOWN))
@@ -882,8 +860,8 @@ class HomePage(BasePage):
                     logger.warning(f"Intento {attempt + 1}: No se pudo abrir el dropdown de idioma")
                     continue
                 
-                # Esperar un momento para que el dropdown se estabilice
-                time.sleep(1)
+                # Esperar a que el dropdown se estabilice
+                self.wait_for_animations()
                 
                 # Seleccionar el idioma específico
                 language_map = {
@@ -924,7 +902,7 @@ class HomePage(BasePage):
                     self.click(language_option)
                 except:
                     try:
-                        self.driver.execute_script("arguments[0].click();", language_option)
+                        self.js_click(language_option)
                     except:
                         # Último recurso: simular click con Actions
                         from selenium.webdriver.common.action_chains import ActionChains
@@ -933,7 +911,7 @@ class HomePage(BasePage):
                 # Esperar a que la página se recargue con timeout extendido
                 self.wait.until(EC.staleness_of(language_option))
                 self.wait.until(EC.presence_of_element_located(self.PAGE_LOAD_INDICATOR))
-                time.sleep(2)  # Espera adicional para asegurar la carga
+                self.wait_for_ui_settled()  # Asegurar que la página recargada terminó de renderizar
                 
                 logger.info(f"✅ Idioma cambiado exitosamente a: {language}")
                 return True
@@ -941,7 +919,6 @@ class HomePage(BasePage):
             except Exception as e:
                 logger.warning(f"Intento {attempt + 1} falló: {str(e)}")
                 if attempt < max_attempts - 1:
-                    time.sleep(2)  # Esperar antes del siguiente intento
                     self.refresh_page()  # Refrescar página entre intentos
                     continue
                 else:
@@ -999,54 +976,42 @@ class HomePage(BasePage):
         try:
             self.wait.until(EC.visibility_of_element_located(self.POS_DROPDOWN))
         except:
-            # Si no encuentra el dropdown específico, esperar un momento para que se abra
-            time.sleep(2)
+            # Si no encuentra el dropdown específico, esperar a que termine de abrirse
+            self.wait_for_animations()
             
         logger.info("Dropdown de POS abierto correctamente")
         return True
 
     def click_apply_button(self):
-        """Hacer clic en el botón Aplicar/Apply usando la clase exacta"""
+        """Hacer clic en el botón Aplicar/Apply: la clase exacta primero y las alternativas en el mismo sondeo"""
         logger.info("Buscando botón Aplicar/Apply con clase exacta...")
         
+        strategies = [
+            # Clase exacta
+            self.POS_APPLY_BUTTON,
+            # Por texto en diferentes idiomas
+            (By.XPATH, "//button[contains(text(), 'Aplicar')]"),
+            (By.XPATH, "//button[contains(text(), 'Apply')]"),
+            (By.XPATH, "//button[contains(text(), 'Appliquer')]"),
+            # Por clase parcial
+            (By.CSS_SELECTOR, "button[class*='footer_action_button']"),
+            (By.CSS_SELECTOR, "button[class*='action_button']"),
+            # Por tipo submit
+            (By.CSS_SELECTOR, "button[type='submit']"),
+            # Buscar en el footer del modal
+            (By.CSS_SELECTOR, ".points-of-sale_footer button"),
+            (By.CSS_SELECTOR, ".modal-footer button")
+        ]
+        
+        # Todas las estrategias se evalúan a la vez: un solo timeout en el peor caso
         try:
-            # Buscar el botón por la clase exacta
-            apply_button = self.wait.until(EC.element_to_be_clickable(self.POS_APPLY_BUTTON))
-            button_text = apply_button.text.strip()
-            self.click(apply_button)
-            logger.info(f"✅ Botón '{button_text}' clickeado exitosamente")
+            button, strategy = self.find_first(*strategies, timeout=10)
+            button_text = button.text.strip()
+            self.click(button)
+            logger.info(f"✅ Botón '{button_text}' clickeado (estrategia: {strategy})")
             return True
         except Exception as e:
-            logger.warning(f"No se pudo encontrar el botón con clase exacta: {e}")
-            
-            # Intentar con diferentes estrategias como fallback
-            fallback_strategies = [
-                # Por texto en diferentes idiomas
-                (By.XPATH, "//button[contains(text(), 'Aplicar')]"),
-                (By.XPATH, "//button[contains(text(), 'Apply')]"),
-                (By.XPATH, "//button[contains(text(), 'Appliquer')]"),
-                # Por clase parcial
-                (By.CSS_SELECTOR, "button[class*='footer_action_button']"),
-                (By.CSS_SELECTOR, "button[class*='action_button']"),
-                # Por tipo submit
-                (By.CSS_SELECTOR, "button[type='submit']"),
-                # Buscar en el footer del modal
-                (By.CSS_SELECTOR, ".points-of-sale_footer button"),
-                (By.CSS_SELECTOR, ".modal-footer button")
-            ]
-            
-            for strategy in fallback_strategies:
-                try:
-                    button = self.wait.until(EC.element_to_be_clickable(strategy))
-                    if button.is_displayed() and button.is_enabled():
-                        button_text = button.text.strip()
-                        self.click(button)
-                        logger.info(f"✅ Botón fallback '{button_text}' clickeado")
-                        return True
-                except Exception as fallback_error:
-                    continue
-            
-            logger.error("❌ No se pudo encontrar ningún botón de aplicación")
+            logger.error(f"❌ No se pudo encontrar ningún botón de aplicación: {e}")
             return False
 
     def select_pos(self, country_name):
@@ -1072,7 +1037,7 @@ class HomePage(BasePage):
         self.click(country_option)
         
         # ✅ NUEVO PASO: Hacer clic en el botón Aplicar/Apply
-        time.sleep(1)  # Pequeña pausa antes de buscar el botón
+        self.wait_for_animations()  # Esperar a que la selección se refleje antes de buscar el botón
         apply_result = self.click_apply_button()
         
         if not apply_result:
@@ -1081,8 +1046,8 @@ class HomePage(BasePage):
         # Esperar a que la página se actualice
         self.wait.until(EC.presence_of_element_located(self.PAGE_LOAD_INDICATOR))
         
-        # Pequeña pausa para asegurar que el cambio se aplique
-        time.sleep(2)
+        # Esperar a que el cambio se aplique
+        self.wait_for_ui_settled()
         
         logger.info(f"POS/País cambiado a: {country_name}")
         return True
@@ -1141,14 +1106,14 @@ class HomePage(BasePage):
         logger.info(f"Seleccionando origen: {origin_code}")
         try:
             self.click(self.ORIGIN_BUTTON)
-            time.sleep(1)
+            self.wait_for_animations()
             
             # Buscar y seleccionar el origen
             self.fill(self.ORIGIN_SEARCH_INPUT, origin_code)
-            time.sleep(2)
+            self.wait_for_ui_settled()
             
             # Seleccionar la primera opción que aparezca
-            if self.is_element_present(self.ORIGIN_OPTIONS):
+            if self.wait_for_condition(lambda d: self.count_now(self.ORIGIN_OPTIONS) > 0, timeout=5, name="origin_options"):
                 options = self.find_elements(self.ORIGIN_OPTIONS)
                 if options:
                     self.click(options[0])
@@ -1165,10 +1130,10 @@ class HomePage(BasePage):
         logger.info(f"Seleccionando destino: {destination_code}")
         try:
             self.fill(self.DESTINATION_INPUT, destination_code)
-            time.sleep(2)
+            self.wait_for_ui_settled()
             
             # Seleccionar la primera opción que aparezca
-            if self.is_element_present(self.DESTINATION_OPTIONS):
+            if self.wait_for_condition(lambda d: self.count_now(self.DESTINATION_OPTIONS) > 0, timeout=5, name="destination_options"):
                 options = self.find_elements(self.DESTINATION_OPTIONS)
                 if options:
                     self.click(options[0])
@@ -1187,22 +1152,22 @@ class HomePage(BasePage):
         try:
             # PASO 0: Hacer scroll
             logger.info("0. Haciendo scroll...")
-            self.driver.execute_script("window.scrollTo(0, 300);")
-            time.sleep(2)
+            self.scroll_to(300)
+            self.wait_for_animations()
             
             # PASO 1: Seleccionar origen - BOGOTÁ
             logger.info("1. Seleccionando Bogotá como origen...")
             
             origin_btn = self.wait.until(EC.element_to_be_clickable((By.ID, "originBtn")))
             origin_btn.click()
-            time.sleep(2)
+            self.wait_for_animations()
             
             origin_input = self.wait.until(EC.element_to_be_clickable((By.ID, "departureStationInputId")))
             origin_input.clear()
             origin_input.send_keys("BOG")
-            time.sleep(3)
+            self.wait_for_ui_settled()
             
-            if self.is_element_present(self.ORIGIN_OPTIONS):
+            if self.wait_for_condition(lambda d: self.count_now(self.ORIGIN_OPTIONS) > 0, timeout=5, name="origin_options"):
                 origin_options = self.find_elements(self.ORIGIN_OPTIONS)
                 for option in origin_options:
                     if "BOG" in option.text or "Bogotá" in option.text:
@@ -1210,20 +1175,20 @@ class HomePage(BasePage):
                         logger.info("✅ Bogotá seleccionado como origen")
                         break
             
-            time.sleep(2)
+            self.wait_for_ui_settled()
             
             # PASO 2: Seleccionar destino - MEDELLÍN
             logger.info("2. Seleccionando Medellín como destino...")
             
             dest_input = self.wait.until(EC.element_to_be_clickable((By.ID, "arrivalStationInputId")))
             dest_input.click()
-            time.sleep(1)
+            self.wait_for_animations()
             
             dest_input.clear()
             dest_input.send_keys("MDE")
-            time.sleep(3)
+            self.wait_for_ui_settled()
             
-            if self.is_element_present(self.DESTINATION_OPTIONS):
+            if self.wait_for_condition(lambda d: self.count_now(self.DESTINATION_OPTIONS) > 0, timeout=5, name="destination_options"):
                 dest_options = self.find_elements(self.DESTINATION_OPTIONS)
                 for option in dest_options:
                     if "MDE" in option.text or "Medellín" in option.text:
@@ -1233,13 +1198,13 @@ class HomePage(BasePage):
             
             # PASO 3: CERRAR MODAL DE FECHAS CON ESC (como hiciste manualmente)
             logger.info("3. Cerrando modal de fechas con ESC...")
-            time.sleep(3)
+            self.wait_for_ui_settled()
             
             from selenium.webdriver.common.keys import Keys
             body = self.find_element((By.TAG_NAME, "body"))
             body.send_keys(Keys.ESCAPE)
             logger.info("✅ Tecla ESC presionada")
-            time.sleep(2)
+            self.wait_for_animations()
             
             logger.info("✅✅✅ ORIGEN/DESTINO CONFIGURADOS - FECHAS CERRADAS CON ESC")
             return True
@@ -1256,7 +1221,7 @@ class HomePage(BasePage):
             # PASO 1: Abrir modal
             logger.info("1. Abriendo modal de pasajeros...")
             self.click(self.PASSENGERS_BUTTON)
-            time.sleep(3)
+            self.wait_for_animations()
             
             # VERIFICAR que el modal se abrió
             try:
@@ -1303,7 +1268,7 @@ class HomePage(BasePage):
                     adult_plus.click()
                     adult_count += 1
                     logger.info(f"   ✅ Click {i+1} - Adultos: {adult_count}")
-                    time.sleep(0.5)
+                    self.wait_for_angular_stable(timeout=2)
                 except Exception as e:
                     logger.error(f"❌ Error en click {i+1} adultos: {e}")
                     return False
@@ -1317,7 +1282,7 @@ class HomePage(BasePage):
                     youth_plus.click()
                     youth_count += 1
                     logger.info(f"   ✅ Click {i+1} - Jóvenes: {youth_count}")
-                    time.sleep(0.5)
+                    self.wait_for_angular_stable(timeout=2)
                 except Exception as e:
                     logger.error(f"❌ Error en click {i+1} jóvenes: {e}")
                     return False
@@ -1331,7 +1296,7 @@ class HomePage(BasePage):
                     child_plus.click()
                     child_count += 1
                     logger.info(f"   ✅ Click {i+1} - Niños: {child_count}")
-                    time.sleep(0.5)
+                    self.wait_for_angular_stable(timeout=2)
                 except Exception as e:
                     logger.error(f"❌ Error en click {i+1} niños: {e}")
                     return False
@@ -1345,7 +1310,7 @@ class HomePage(BasePage):
                     infant_plus.click()
                     infant_count += 1
                     logger.info(f"   ✅ Click {i+1} - Infantes: {infant_count}")
-                    time.sleep(0.5)
+                    self.wait_for_angular_stable(timeout=2)
                 except Exception as e:
                     logger.error(f"❌ Error en click {i+1} infantes: {e}")
                     return False
@@ -1360,7 +1325,7 @@ class HomePage(BasePage):
                 logger.error(f"❌ Error confirmando selección: {e}")
                 return False
             
-            time.sleep(2)
+            self.wait_for_animations()
             logger.info(f"✅✅✅ PASAJEROS CONFIGURADOS: {adult_count} adultos, {youth_count} jóvenes, {child_count} niños, {infant_count} infantes")
             return True
             
@@ -1394,7 +1359,7 @@ class HomePage(BasePage):
             if not step_func():
                 logger.error(f"❌ Falló en paso: {step_name}")
                 return False
-            time.sleep(1)
+            self.wait_for_ui_settled()
         
         logger.info("✅ Búsqueda de vuelos completada exitosamente")
         return True
@@ -1418,13 +1383,13 @@ class HomePage(BasePage):
                     # Intentar abrir el modal
                     passengers_btn = self.wait.until(EC.element_to_be_clickable(self.PASSENGERS_BUTTON))
                     passengers_btn.click()
-                    time.sleep(2)
+                    self.wait_for_animations()
             except:
                 logger.info("🔄 Modal no encontrado, intentando abrir...")
                 # Intentar abrir el modal
                 passengers_btn = self.wait.until(EC.element_to_be_clickable(self.PASSENGERS_BUTTON))
                 passengers_btn.click()
-                time.sleep(2)
+                self.wait_for_animations()
             
             # PASO 2: Buscar y hacer clic en botón + de adultos
             logger.info("2. Buscando botón + de adultos...")
@@ -1433,7 +1398,7 @@ class HomePage(BasePage):
             adult_plus = self.wait.until(EC.element_to_be_clickable(self.ADULT_PLUS_BUTTON))
             adult_plus.click()
             logger.info("✅ Clic en botón + de adultos realizado")
-            time.sleep(2)
+            self.wait_for_angular_stable(timeout=3)
             
             # PASO 3: Verificar resultado
             logger.info("3. Verificando resultado...")
@@ -1470,7 +1435,7 @@ class HomePage(BasePage):
             )
             
             # Scroll rápido
-            self.driver.execute_script("window.scrollTo(0, 400);")
+            self.scroll_to(400)
             
             # Buscar botones de vuelo
             flight_buttons = self.find_elements(self.FIRST_FLIGHT_BUTTON)
@@ -1479,7 +1444,7 @@ class HomePage(BasePage):
                 first_button = flight_buttons[0]
                 
                 # Scroll al elemento específico
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", first_button)
+                self.scroll_into_view(first_button)
                 
                 # Esperar que sea clickeable (máximo 5 segundos)
                 WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable(first_button))
@@ -1487,8 +1452,8 @@ class HomePage(BasePage):
                 self.click(first_button)
                 logger.info("✅ Vuelo seleccionado (optimizado)")
                 
-                # ESPERA REDUCIDA para carga de tarifas
-                time.sleep(2)
+                # Esperar a que se desplieguen las tarifas
+                self.wait_for_ui_settled()
                 return True
                 
             return False
@@ -1521,18 +1486,19 @@ class HomePage(BasePage):
             # 🔥 ESPERA ESTRATÉGICA: Si es para vuelo de IDA, esperar MÁS para vuelos de regreso
             if not is_return_flight:
                 logger.info("🔄 ESPERA ESTRATÉGICA: Procesando vuelos de regreso...")
-                # Espera más larga específicamente para que carguen los vuelos de regreso
-                time.sleep(8)  # 8 segundos adicionales para procesamiento del servidor
+                # Esperar a que el servidor procese y la red quede inactiva
+                self.wait_for_network_idle(timeout=15)
+                self.wait_for_ui_settled()
                 
                 # Además, verificar que la página esté completamente lista
                 WebDriverWait(self.driver, 12).until(
-                    lambda driver: driver.execute_script("return document.readyState") == "complete"
+                    lambda driver: QaRuntime.call(driver, "readyState") == "complete"
                 )
                 
                 logger.info("✅✅✅ VUELOS DE REGRESO DEBERÍAN ESTAR CARGADOS")
             else:
                 # Para vuelo de regreso, espera normal
-                time.sleep(3)
+                self.wait_for_ui_settled()
             
             return True
             
@@ -1560,24 +1526,13 @@ class HomePage(BasePage):
             ]
             
             # Esperar a que AL MENOS UN indicador esté presente (con timeout extendido)
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: any(
-                    len(driver.find_elements(*indicator)) > 0 
-                    for indicator in return_indicators
-                )
-            )
+            _, indicator = self.find_first(*return_indicators, timeout=timeout, visible=False)
             
-            logger.info("✅ Indicadores de vuelos de regreso encontrados")
+            logger.info(f"✅ Indicadores de vuelos de regreso encontrados: {indicator}")
             
             # ESPERA ADICIONAL ESPECÍFICA para botones clickeables
             logger.info("🔄 Verificando que los botones sean clickeables...")
-            WebDriverWait(self.driver, 8).until(
-                lambda driver: any(
-                    btn.is_displayed() and btn.is_enabled()
-                    for btn in driver.find_elements(By.CSS_SELECTOR, "button.journey_price_button")
-                    if btn.is_displayed()
-                )
-            )
+            self.find_first((By.CSS_SELECTOR, "button.journey_price_button"), timeout=8)
             
             logger.info("✅✅✅ VUELOS DE REGRESO CARGADOS Y LISTOS")
             return True
@@ -1595,13 +1550,18 @@ class HomePage(BasePage):
         try:
             # Esperar a que el documento esté listo
             WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
+                lambda driver: QaRuntime.call(driver, "readyState") == "complete"
             )
             
-            # Esperar a que no haya elementos de carga visibles
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: len(driver.find_elements(By.CSS_SELECTOR, "[class*='loading'], [class*='spinner']")) == 0
-            )
+            # Con CDP: la página está lista cuando no quedan peticiones en vuelo
+            if NetworkIdleWaiter.for_driver(self.driver) is not None:
+                if not self.wait_for_network_idle(timeout=timeout):
+                    raise TimeoutException("La red no quedó inactiva")
+                logger.info("✅ Página cargada completamente (red inactiva)")
+                return True
+            
+            # Sin CDP: esperar a que no haya elementos de carga visibles
+            self.assert_absent((By.CSS_SELECTOR, "[class*='loading'], [class*='spinner']"), within=timeout)
             
             logger.info("✅ Página cargada completamente")
             return True
@@ -1624,23 +1584,24 @@ class HomePage(BasePage):
             logger.info("🔄 Haciendo scroll estratégico para vuelos de regreso...")
             
             # Scroll más específico para la sección de vuelos de regreso
-            self.driver.execute_script("window.scrollTo(0, 800);")
-            time.sleep(2)
+            self.scroll_to(800)
+            self.wait_for_dom_stable()
             
             # Scroll adicional si es necesario
-            self.driver.execute_script("window.scrollTo(0, 1000);")
-            time.sleep(1)
+            self.scroll_to(1000)
+            self.wait_for_dom_stable()
             
             # PASO 3: Buscar EXACTAMENTE los botones de vuelo de regreso
             logger.info("🔍 Buscando botones específicos de vuelo de regreso...")
             
-            # SELECTOR EXACTO basado en el HTML que me mostraste
-            return_buttons = self.find_elements((By.CSS_SELECTOR, "button.journey_price_button.ng-tns-c12-62"))
+            # SELECTOR EXACTO basado en el HTML que me mostraste (texto, visibilidad y estado en un solo viaje)
+            button_props = ("text", "displayed", "enabled")
+            return_buttons = self.snapshot((By.CSS_SELECTOR, "button.journey_price_button.ng-tns-c12-62"), props=button_props)
             
             # Si no encuentra con la clase específica, buscar cualquier botón de vuelo
             if not return_buttons:
                 logger.info("🔄 Buscando botones de vuelo alternativos...")
-                return_buttons = self.find_elements((By.CSS_SELECTOR, "button.journey_price_button"))
+                return_buttons = self.snapshot((By.CSS_SELECTOR, "button.journey_price_button"), props=button_props)
             
             logger.info(f"🔍 Botones de vuelo de regreso encontrados: {len(return_buttons)}")
             
@@ -1651,14 +1612,10 @@ class HomePage(BasePage):
             # PASO 4: Filtrar y seleccionar el PRIMER botón visible y habilitado
             visible_buttons = []
             for i, btn in enumerate(return_buttons):
-                try:
-                    if btn.is_displayed() and btn.is_enabled():
-                        btn_text = btn.text.replace('\n', ' ').strip()
-                        logger.info(f"  ✅ Botón {i} disponible: '{btn_text}'")
-                        visible_buttons.append(btn)
-                except Exception as e:
-                    logger.debug(f"  ❌ Botón {i} no disponible: {e}")
-                    continue
+                if btn.displayed and btn.enabled:
+                    btn_text = btn.text.replace('\n', ' ').strip()
+                    logger.info(f"  ✅ Botón {i} disponible: '{btn_text}'")
+                    visible_buttons.append(btn)
             
             logger.info(f"🔍 Botones de regreso clickeables: {len(visible_buttons)}")
             
@@ -1667,14 +1624,14 @@ class HomePage(BasePage):
                 return False
             
             # PASO 5: Seleccionar el PRIMER botón clickeable
-            return_button = visible_buttons[0]
-            return_text = return_button.text.replace('\n', ' ').strip()
+            return_text = visible_buttons[0].text.replace('\n', ' ').strip()
+            return_button = visible_buttons[0].resolve()
             logger.info(f"🎯 Seleccionando primer vuelo de regreso: '{return_text}'")
             
             # SCROLL PRECISO al botón específico
             logger.info("🔄 Haciendo scroll preciso al botón...")
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", return_button)
-            time.sleep(1)
+            self.scroll_into_view(return_button)
+            self.wait_for_animations()
             
             # Verificar una última vez que sea clickeable
             logger.info("🔍 Verificando que el botón esté listo para clic...")
@@ -1686,8 +1643,8 @@ class HomePage(BasePage):
             
             logger.info("✅✅✅ VUELO DE REGRESO SELECCIONADO EXITOSAMENTE")
             
-            # Espera para confirmar la selección
-            time.sleep(3)
+            # Esperar a que se confirme la selección
+            self.wait_for_ui_settled()
             return True
             
         except Exception as e:
@@ -1705,12 +1662,15 @@ class HomePage(BasePage):
         logger.info("🔍 DEPURANDO ESTADO DE VUELOS DE REGRESO (DETALLADO)...")
         
         try:
+            # Todos los botones de precio con sus propiedades en un solo viaje
+            all_buttons = self.snapshot((By.CSS_SELECTOR, "button.journey_price_button"))
+            
             # Verificar diferentes tipos de botones
             button_types = {
-                "Botones journey_price_button (todos)": len(self.find_elements((By.CSS_SELECTOR, "button.journey_price_button"))),
-                "Botones con clase específica ng-tns-c12-62": len(self.find_elements((By.CSS_SELECTOR, "button.journey_price_button.ng-tns-c12-62"))),
-                "Botones visibles": len([btn for btn in self.find_elements((By.CSS_SELECTOR, "button.journey_price_button")) if btn.is_displayed()]),
-                "Botones habilitados": len([btn for btn in self.find_elements((By.CSS_SELECTOR, "button.journey_price_button")) if btn.is_enabled()]),
+                "Botones journey_price_button (todos)": len(all_buttons),
+                "Botones con clase específica ng-tns-c12-62": len([btn for btn in all_buttons if "ng-tns-c12-62" in btn.class_name.split()]),
+                "Botones visibles": len([btn for btn in all_buttons if btn.displayed]),
+                "Botones habilitados": len([btn for btn in all_buttons if btn.enabled]),
             }
             
             logger.info("📊 ESTADO DETALLADO DE BOTONES:")
@@ -1718,17 +1678,10 @@ class HomePage(BasePage):
                 logger.info(f"  {key}: {value}")
             
             # Mostrar información de los primeros 3 botones
-            all_buttons = self.find_elements((By.CSS_SELECTOR, "button.journey_price_button"))
             logger.info("🔍 INFORMACIÓN DE PRIMEROS 3 BOTONES:")
             for i, btn in enumerate(all_buttons[:3]):
-                try:
-                    text = btn.text.replace('\n', ' ').strip()
-                    displayed = btn.is_displayed()
-                    enabled = btn.is_enabled()
-                    classes = btn.get_attribute('class')
-                    logger.info(f"  Botón {i}: '{text}' | Visible: {displayed} | Habilitado: {enabled} | Clases: {classes}")
-                except:
-                    logger.info(f"  Botón {i}: No se pudo obtener información")
+                text = btn.text.replace('\n', ' ').strip()
+                logger.info(f"  Botón {i}: '{text}' | Visible: {btn.displayed} | Habilitado: {btn.enabled} | Clases: {btn.class_name}")
             
             # Tomar screenshot del estado actual
             self.take_screenshot("debug_return_flights_detailed.png")
@@ -1747,33 +1700,29 @@ class HomePage(BasePage):
             # Tomar screenshot de la página actual
             self.take_screenshot("debug_flight_page.png")
             
-            # Buscar todos los botones disponibles
-            all_buttons = self.find_elements((By.TAG_NAME, "button"))
+            # Buscar todos los botones disponibles (texto y clases en un solo viaje)
+            all_buttons = self.snapshot((By.TAG_NAME, "button"), props=("text", "class"))
             logger.info(f"🔍 Total de botones en la página: {len(all_buttons)}")
             
             # Filtrar botones relevantes
             relevant_buttons = []
             for i, button in enumerate(all_buttons):
-                try:
-                    text = button.text.strip()
-                    classes = button.get_attribute('class') or ''
-                    if text and ('choisir' in text.lower() or 'select' in text.lower() or 'tarif' in text.lower()):
-                        relevant_buttons.append((i, text, classes))
-                except:
-                    continue
+                text = button.text
+                if text and ('choisir' in text.lower() or 'select' in text.lower() or 'tarif' in text.lower()):
+                    relevant_buttons.append((i, text, button.class_name))
             
             logger.info("🔍 BOTONES RELEVANTES ENCONTRADOS:")
             for idx, text, classes in relevant_buttons:
                 logger.info(f"  {idx}: '{text}' - Clases: {classes}")
             
             # Buscar contenedores de vuelos
-            flight_containers = self.find_elements((By.CSS_SELECTOR, "[class*='journey'], [class*='flight']"))
-            logger.info(f"🔍 Contenedores de vuelo encontrados: {len(flight_containers)}")
+            flight_containers = self.count_now((By.CSS_SELECTOR, "[class*='journey'], [class*='flight']"))
+            logger.info(f"🔍 Contenedores de vuelo encontrados: {flight_containers}")
             
             return {
                 'total_buttons': len(all_buttons),
                 'relevant_buttons': relevant_buttons,
-                'flight_containers': len(flight_containers)
+                'flight_containers': flight_containers
             }
             
         except Exception as e:
@@ -1795,7 +1744,8 @@ class HomePage(BasePage):
                 return False
             
             # Esperar a que cargue la selección del vuelo de vuelta
-            time.sleep(5)
+            self.wait_for_network_idle()
+            self.wait_for_ui_settled()
             
             # PASO 3: Seleccionar vuelo de VUELTA
             logger.info("3. Seleccionando vuelo de VUELTA...")
@@ -1825,7 +1775,8 @@ class HomePage(BasePage):
                 logger.info("✅ Select Flight page loaded (URL verification)")
                 return True
             
-            # Verificar por elementos de la página de resultados
+            # Verificar por elementos de la página de resultados (comprobados al instante tras renderizar)
+            self.wait_for_ui_settled()
             select_flight_indicators = [
                 (By.XPATH, "//h1[contains(text(), 'Select Flight') or contains(text(), 'Seleccionar vuelo')]"),
                 (By.XPATH, "//div[contains(@class, 'flight-option')]"),
@@ -1835,7 +1786,7 @@ class HomePage(BasePage):
             ]
             
             for indicator in select_flight_indicators:
-                if self.is_element_present(indicator, timeout=5):
+                if self.is_element_present(indicator):
                     logger.info(f"✅ Select Flight page loaded (element: {indicator})")
                     return True
             
@@ -1886,20 +1837,10 @@ class HomePage(BasePage):
         self.wait_for_page_load()
         return True
 
-    def is_element_present(self, locator, timeout=5):
-        """Verificar si un elemento está presente en la página"""
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
-            )
-            return True
-        except:
-            return False
+    def is_element_present(self, locator):
+        """Verificar si un elemento está presente ahora mismo (sin esperar: la ausencia responde al instante)"""
+        return self.count_now(locator) > 0
 
     def find_elements(self, locator):
-        """Encontrar múltiples elementos"""
-        try:
-            return self.driver.find_elements(*locator)
-        except Exception as e:
-            logger.error(f"Error encontrando elementos {locator}: {e}")
-            return []
\ No newline at end of file
+        """Encontrar múltiples elementos (inmediato: una búsqueda vacía no paga la espera implícita)"""
+        return self.find_all_now(locator)
\ No newline at end of file
@@ -58,9 +58,8 @@ class LanguagePage(BasePage):
         # Abrir el menú
         self.open_language_menu()
         
-        # Pequeña pausa para que se abra el dropdown
-        import time
-        time.sleep(2)
+        # Esperar a que el dropdown termine de abrirse
+        self.wait_for_animations()
         
         # Buscar el idioma en nuestro mapeo
         if language_name.lower() not in self.LANGUAGE_MAP:
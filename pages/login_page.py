@@ -5,7 +5,6 @@ from selenium.webdriver.common.action_chains import ActionChains
 from .base_page import BasePage
 import allure
 import logging
-import time
 
 class LoginPage(BasePage):
     
@@ -70,7 +69,7 @@ class LoginPage(BasePage):
             print("✅ Redirección a página de login detectada")
             
             # Esperar a que la página cargue completamente
-            time.sleep(3)
+            self.wait_for_ui_settled()
             
             return True
                 
@@ -118,20 +117,17 @@ class LoginPage(BasePage):
                 # Intentar con ActionChains para un clic más preciso
                 actions = ActionChains(self.driver)
                 actions.move_to_element(username_field).click().perform()
-                time.sleep(0.5)
             except:
                 # Si falla ActionChains, intentar clic directo
                 username_field.click()
-                time.sleep(0.5)
             
             # LIMPIAR CAMPO (por si acaso hay texto)
             username_field.clear()
-            time.sleep(0.5)
             
             # INGRESAR USUARIO
             print("📝 Ingresando usuario...")
             username_field.send_keys(username)
-            time.sleep(1)
+            self.wait_for_angular_stable(timeout=3)
             
             # VERIFICAR QUE EL USUARIO SE INGRESÓ CORRECTAMENTE
             entered_value = username_field.get_attribute('value')
@@ -189,20 +185,17 @@ class LoginPage(BasePage):
                 # Intentar con ActionChains para un clic más preciso
                 actions = ActionChains(self.driver)
                 actions.move_to_element(password_field).click().perform()
-                time.sleep(0.5)
             except:
                 # Si falla ActionChains, intentar clic directo
                 password_field.click()
-                time.sleep(0.5)
             
             # LIMPIAR CAMPO (por si acaso hay texto)
             password_field.clear()
-            time.sleep(0.5)
             
             # INGRESAR CONTRASEÑA
             print("📝 Ingresando contraseña...")
             password_field.send_keys(password)
-            time.sleep(1)
+            self.wait_for_angular_stable(timeout=3)
             
             # VERIFICAR QUE LA CONTRASEÑA SE INGRESÓ CORRECTAMENTE
             entered_value = password_field.get_attribute('value')
@@ -257,8 +250,8 @@ class LoginPage(BasePage):
             self.logger.info("✅ Clic en botón de login del modal realizado")
             print("✅ Clic en botón de login del modal realizado")
             
-            # Esperar después del login
-            time.sleep(3)
+            # Esperar a que el login se procese
+            self.wait_for_network_idle(timeout=10)
             return True
                 
         except Exception as e:
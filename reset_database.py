@@ -24,6 +24,11 @@ def reset_database_completely():
             print("✅ Base de datos eliminada completamente")
         else:
             print("⚠️  Base de datos no existía")
+        
+        # Archivos auxiliares del modo WAL (un -wal huérfano corrompería la BD nueva)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
     except Exception as e:
         print(f"❌ Error eliminando base de datos: {e}")
         return False
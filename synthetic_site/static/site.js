@@ -0,0 +1,188 @@
+// Comportamiento del sitio sintético: reproduce los contratos de DOM que usa HomePage
+(function () {
+    var config = window.SYNTHETIC || {spinners: {}, labels: {}};
+    var labels = config.labels;
+
+    function $(selector, root) { return (root || document).querySelector(selector); }
+    function $all(selector, root) { return Array.prototype.slice.call((root || document).querySelectorAll(selector)); }
+    function el(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) { node.className = className; }
+        if (text) { node.textContent = text; }
+        return node;
+    }
+
+    // Llamada a la API con spinner: la latencia la pone el servidor, el spinner dura lo configurado por endpoint
+    function call(endpoint, params) {
+        var spinner = el('div', 'loading-spinner');
+        document.body.appendChild(spinner);
+        var query = params ? '?' + new URLSearchParams(params).toString() : '';
+        return fetch(endpoint + query).then(function (response) { return response.json(); }).then(function (data) {
+            return new Promise(function (resolve) {
+                setTimeout(function () { spinner.remove(); resolve(data); }, config.spinners[endpoint] || 0);
+            });
+        });
+    }
+
+    function closePanels(except) {
+        $all('.dropdown_content').forEach(function (panel) { if (panel !== except) { panel.remove(); } });
+    }
+
+    // ===== MENÚS DEL HEADER =====
+    $all('.main-header_nav-primary_item_link').forEach(function (button) {
+        button.addEventListener('click', function () {
+            var item = button.parentElement, open = !item.classList.contains('is-open');
+            $all('.main-header_nav-primary_item').forEach(function (other) { other.classList.remove('is-open'); });
+            item.classList.toggle('is-open', open);
+        });
+    });
+
+    // ===== IDIOMA (el panel se inserta al abrir, como un *ngIf) =====
+    var languages = [['es', 'Español'], ['en', 'English'], ['fr', 'Français'], ['pt', 'Português']];
+    $('.dropdown_trigger').addEventListener('click', function (event) {
+        var container = event.currentTarget.parentElement;
+        if ($('.dropdown_content', container)) { closePanels(); return; }
+        closePanels();
+        var panel = el('div', 'dropdown_content ng-star-inserted');
+        languages.forEach(function (language) {
+            var option = el('div', 'dropdown_item', language[1]);
+            option.addEventListener('click', function () { window.location.href = '/' + language[0] + '/'; });
+            panel.appendChild(option);
+        });
+        container.appendChild(panel);
+    });
+
+    // ===== PUNTO DE VENTA =====
+    var posButton = $('#pointOfSaleSelectorId');
+    posButton.textContent = window.localStorage.getItem('synthetic_pos') || 'Colombia';
+    posButton.addEventListener('click', function () {
+        var container = posButton.parentElement;
+        if ($('.dropdown_content', container)) { closePanels(); return; }
+        closePanels();
+        var panel = el('div', 'dropdown_content points-of-sale ng-star-inserted'), selected = null;
+        panel.setAttribute('role', 'listbox');
+        ['Otros países', 'España', 'Chile', 'Colombia', 'Perú'].forEach(function (country) {
+            var option = el('div', 'dropdown_item', country);
+            option.addEventListener('click', function () {
+                $all('.dropdown_item', panel).forEach(function (other) { other.classList.remove('is-selected'); });
+                option.classList.add('is-selected');
+                selected = country;
+            });
+            panel.appendChild(option);
+        });
+        var footer = el('div', 'points-of-sale_footer');
+        var apply = el('button', 'points-of-sale_footer_action_button', labels.apply);
+        apply.type = 'button';
+        apply.addEventListener('click', function () {
+            if (!selected) { return; }
+            call('/api/pos', {country: selected}).then(function (data) {
+                window.localStorage.setItem('synthetic_pos', data.country);
+                posButton.textContent = data.country;
+                panel.remove();
+            });
+        });
+        footer.appendChild(apply);
+        panel.appendChild(footer);
+        container.appendChild(panel);
+    });
+
+    // ===== BÚSQUEDA (solo en la home) =====
+    var booking = $('#bookingWidget');
+    if (!booking) { return; }
+
+    function stationSearch(input, list, onSelect) {
+        input.addEventListener('input', function () {
+            var query = input.value.trim();
+            if (!query) { list.innerHTML = ''; return; }
+            call('/api/stations', {q: query}).then(function (stations) {
+                if (input.value.trim() !== query) { return; }
+                list.innerHTML = '';
+                stations.forEach(function (station) {
+                    var option = el('div', 'station-option', station.code + ' - ' + station.name);
+                    option.setAttribute('role', 'option');
+                    option.addEventListener('click', function () {
+                        list.innerHTML = '';
+                        onSelect(station);
+                    });
+                    list.appendChild(option);
+                });
+            });
+        });
+    }
+
+    var originPanel = $('#originPanel'), originButton = $('#originBtn'), datePicker = $('#datePicker');
+    originButton.addEventListener('click', function () {
+        originPanel.hidden = false;
+        $('#departureStationInputId').focus();
+    });
+    stationSearch($('#departureStationInputId'), $('#originList'), function (station) {
+        originButton.textContent = station.code;
+        originPanel.hidden = true;
+    });
+    stationSearch($('#arrivalStationInputId'), $('#arrivalList'), function (station) {
+        $('#arrivalStationInputId').value = station.code;
+        datePicker.hidden = false;
+    });
+    document.addEventListener('keydown', function (event) {
+        if (event.key === 'Escape') { datePicker.hidden = true; closePanels(); }
+    });
+
+    // Pasajeros
+    var paxModal = $('#paxControlSearchId');
+    $('#paxButton').addEventListener('click', function () { paxModal.hidden = false; });
+    $all('.ui-num-ud', paxModal).forEach(function (row) {
+        var input = $('input', row);
+        $('.plus', row).addEventListener('click', function () { input.value = String(parseInt(input.value, 10) + 1); });
+        $('.minus', row).addEventListener('click', function () { input.value = String(Math.max(0, parseInt(input.value, 10) - 1)); });
+    });
+    $('.control_options_selector_action_button', paxModal).addEventListener('click', function () {
+        var total = $all('input', paxModal).reduce(function (sum, input) { return sum + parseInt(input.value, 10); }, 0);
+        $('#paxButton').textContent = total + ' ' + labels.passengers;
+        paxModal.hidden = true;
+    });
+
+    // Resultados: ida -> tarifas -> vuelta
+    var results = $('#flightResults');
+
+    function renderJourneys(journeys, leg) {
+        var section = el('div', 'journey-list journey-list--' + leg);
+        section.appendChild(el(leg === 'outbound' ? 'h1' : 'h2', 'journey-list_title', leg === 'outbound' ? labels.select_flight : labels.return_flight));
+        journeys.forEach(function (journey) {
+            var row = el('div', 'journey');
+            row.appendChild(el('span', 'journey_route', journey.origin + ' → ' + journey.destination + ' ' + journey.date + ' ' + journey.departure));
+            var button = el('button', 'journey_price_button');
+            button.type = 'button';
+            button.appendChild(el('span', null, labels.choose_fare + ' ' + journey.price));
+            button.addEventListener('click', function () { renderFares(row, leg); });
+            row.appendChild(button);
+            section.appendChild(row);
+        });
+        results.appendChild(section);
+    }
+
+    function renderFares(row, leg) {
+        $all('.fares').forEach(function (fares) { fares.remove(); });
+        var fares = el('div', 'fares');
+        [['fare1', 'Basic'], ['fare5', 'Classic'], ['fare9', 'Flex']].forEach(function (fare) {
+            var control = el('div', 'fare-control ' + fare[0]);
+            control.setAttribute('aria-label', fare[1]);
+            control.appendChild(el('span', 'fare_name', fare[1]));
+            var button = el('button', 'fare_button', labels.select + ' ' + fare[1]);
+            button.type = 'button';
+            button.addEventListener('click', function () {
+                fares.remove();
+                if (leg === 'outbound') {
+                    call('/api/flights', {leg: 'return'}).then(function (journeys) { renderJourneys(journeys, 'return'); });
+                }
+            });
+            control.appendChild(button);
+            fares.appendChild(control);
+        });
+        row.insertAdjacentElement('afterend', fares);
+    }
+
+    $('#searchButton').addEventListener('click', function () {
+        results.innerHTML = '';
+        call('/api/flights', {leg: 'outbound'}).then(function (journeys) { renderJourneys(journeys, 'outbound'); });
+    });
+})();
@@ -0,0 +1,91 @@
+import os
+import json
+import time
+import pytest
+import logging
+from datetime import datetime
+from pages.home_page import HomePage
+from utils.database import DatabaseManager
+from utils.synthetic_site import SyntheticSite
+
+logger = logging.getLogger(__name__)
+
+# Latencia del servidor, jitter y duración del spinner por endpoint (valores parecidos a los de nuxqa4)
+PROFILES = {
+    "/": {"latency_ms": 40, "jitter_ms": 15},
+    "/static/": {"latency_ms": 10, "jitter_ms": 5},
+    "/api/stations": {"latency_ms": 120, "jitter_ms": 40},
+    "/api/flights": {"latency_ms": 400, "jitter_ms": 120, "spinner_ms": 600},
+    "/api/pos": {"latency_ms": 200, "jitter_ms": 60, "spinner_ms": 300}
+}
+
+ROUNDS = 3
+# Mismo run en todos los workers de xdist (lo fija el controlador en pytest_configure)
+RUN_ID = os.environ.setdefault("BENCHMARK_RUN_ID", datetime.now().strftime("%Y%m%d_%H%M%S"))
+
+
+def _search_and_pick_first(home_page):
+    return home_page.search_flights() and home_page.select_first_flight()
+
+
+# (método medido, idioma de la página inicial, preparación sin medir, acción medida)
+BENCHMARKS = [
+    ("wait_for_page_load", "es", None, lambda p: p.wait_for_page_load()),
+    ("open_language_dropdown", "es", None, lambda p: p.open_language_dropdown()),
+    ("select_language", "es", None, lambda p: p.select_language("français") and p.verify_language_changed("français")),
+    ("select_pos", "es", None, lambda p: p.select_pos("Chile") and p.verify_pos_changed("Chile")),
+    ("navigate_to_offers_and_destinations_optimized_v2", "es", None, lambda p: p.navigate_to_offers_and_destinations_optimized_v2()),
+    ("navigate_to_my_booking_checkin_optimized", "es", None, lambda p: p.navigate_to_my_booking_checkin_optimized()),
+    ("navigate_to_info_and_help_tariffs_optimized", "es", None, lambda p: p.navigate_to_info_and_help_tariffs_optimized()),
+    ("select_any_origin_destination", "fr", None, lambda p: p.select_any_origin_destination()),
+    ("select_passengers", "fr", None, lambda p: p.select_passengers(adults=3, youth=3, children=3, infants=3)),
+    ("select_first_flight", "fr", None, _search_and_pick_first),
+    ("select_flex_fare", "fr", _search_and_pick_first, lambda p: p.select_flex_fare(is_return_flight=False)),
+    ("find_footer_link", "es", None, lambda p: p.find_first_named("FOOTER_LINK_2", *p.locator_variants("FOOTER_LINK_2"), visible=False))
+]
+
+
+@pytest.fixture(scope="module")
+def synthetic_site():
+    """Sitio sintético local (uno por módulo y worker)"""
+    site = SyntheticSite(profiles=PROFILES).start()
+    yield site
+    site.stop()
+
+    # El resumen por método lo imprime el controlador al final (pytest_terminal_summary)
+    print(f"\n⏱️  BENCHMARK {RUN_ID}: {site.requests_served} peticiones, {site.delay_total:.1f}s de latencia simulada")
+
+
+@pytest.mark.benchmark
+class TestPageObjectBenchmark:
+    """Benchmark de los métodos de HomePage contra el sitio sintético (sin depender del sitio remoto)"""
+
+    @pytest.mark.parametrize("method, lang, prepare, action", BENCHMARKS, ids=[b[0] for b in BENCHMARKS])
+    def test_page_object_timing(self, browser, synthetic_site, method, lang, prepare, action):
+        """Medir ROUNDS ejecuciones de un método de page object y guardar los tiempos"""
+        db = DatabaseManager()
+        home_page = HomePage(browser)
+        failures = 0
+
+        for round_number in range(1, ROUNDS + 1):
+            # Estado inicial limpio (no se mide)
+            browser.delete_all_cookies()
+            home_page.navigate_to(f"{synthetic_site.url}{lang}/")
+            browser.execute_script("window.localStorage.clear();")
+            home_page.wait_for_page_load()
+            if prepare is not None:
+                assert prepare(home_page), f"Falló la preparación de {method}"
+
+            started = time.perf_counter()
+            try:
+                success = bool(action(home_page))
+            except Exception as e:
+                logger.error(f"❌ {method} lanzó una excepción: {e}")
+                success = False
+            duration = time.perf_counter() - started
+
+            failures += 0 if success else 1
+            db.save_benchmark_timing(RUN_ID, method, browser.name, round_number, duration, success, json.dumps(PROFILES))
+            logger.info(f"⏱️  {method} ronda {round_number}: {duration:.2f}s ({'OK' if success else 'FALLO'})")
+
+        assert failures == 0, f"{method} falló en {failures}/{ROUNDS} rondas contra el sitio sintético"
@@ -1,10 +1,8 @@
 import pytest
 import allure
-import time
 import json
 from datetime import datetime
 from utils.network_capture import NetworkCapture
-from pages.login_page import LoginPage
 from pages.home_page import HomePage
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -16,48 +14,21 @@ class TestCase3:
     
     @allure.story("Login completo, cambio a francés y selección POS Francia/EUR")
     @allure.description("Login completo, cambio a francés y selección de punto de venta Francia con EUR")
-    def test_login_completo_y_cambio_idioma_y_pos(self, driver):
+    def test_login_completo_y_cambio_idioma_y_pos(self, driver, session_cache):
         """Caso 3: Login completo + cambio a francés + POS Francia"""
         
-        login_page = LoginPage(driver)
-        
         # === PARTE 1: LOGIN COMPLETO ===
-        with allure.step("1. Navegar a la página principal"):
-            driver.get("https://nuxqa3.avtest.ink/es/")
-            time.sleep(3)
-            print("✅ Página principal cargada")
-            
-        with allure.step("2. Tomar captura inicial"):
+        with allure.step("1-6. Iniciar sesión (login por la UI una vez por worker, sesión en caché después)"):
+            method = session_cache.ensure("https://nuxqa3.avtest.ink/es/")
+            print(f"✅ Login completado ({'sesión restaurada' if method == 'restored' else 'login por la UI'})")
             allure.attach(driver.get_screenshot_as_png(), name="pagina_principal", attachment_type=allure.attachment_type.PNG)
-            
-        with allure.step("3. Hacer clic en 'Iniciar sesión'"):
-            main_window = driver.current_window_handle
-            assert login_page.click_login_button(), "❌ Error en botón login"
-            print("✅ Redireccionado a página de login")
-            
-        with allure.step("4. Ingresar usuario"):
-            assert login_page.enter_username("21734198706"), "❌ Error ingresando usuario"
-            print("✅ Usuario ingresado")
-            
-        with allure.step("5. Ingresar contraseña"):
-            assert login_page.enter_password("Lifemiles1"), "❌ Error ingresando contraseña"
-            print("✅ Contraseña ingresada")
-            
-        with allure.step("6. Hacer clic en login del modal"):
-            assert login_page.click_modal_login_button(), "❌ Error en botón login modal"
-            print("✅ Login completado")
 
         # === PARTE 2: MANEJO DE REDIRECCIÓN ===
         with allure.step("7. Manejo de redirección post-login"):
-            time.sleep(2)
-            try:
-                driver.switch_to.window(main_window)
-                print("✅ Cambiado a ventana principal")
-            except:
-                print("⚠️  No se pudo cambiar de ventana")
-            
+            home_page = HomePage(driver)
             driver.get("https://nuxqa3.avtest.ink/es/lifemiles-info/landing-intermedia/")
-            time.sleep(3)
+            home_page.wait_for_page_load()
+            home_page.wait_for_ui_settled()
             print("✅ Página post-login cargada")
 
         # === PARTE 3: CAMBIO A FRANCÉS ===
@@ -70,7 +41,7 @@ class TestCase3:
                 FRENCH_OPTION = (By.XPATH, "//button[contains(@class, 'options-list_item_option')]//span[contains(text(), 'Français')]")
                 
                 # Esperar a que la página esté lista
-                time.sleep(3)
+                home_page.wait_for_ui_settled()
                 
                 # Captura antes del cambio de idioma
                 allure.attach(driver.get_screenshot_as_png(), name="antes_frances", attachment_type=allure.attachment_type.PNG)
@@ -85,7 +56,7 @@ class TestCase3:
                 print("🖱️ Abriendo selector de idioma...")
                 language_btn.click()
                 print("✅ Selector de idioma abierto")
-                time.sleep(2)
+                home_page.wait_for_animations()  # Esperar la animación del dropdown
                 
                 # Captura del dropdown de idioma
                 allure.attach(driver.get_screenshot_as_png(), name="dropdown_idioma_abierto", attachment_type=allure.attachment_type.PNG)
@@ -98,8 +69,9 @@ class TestCase3:
                 french_option.click()
                 print("✅ Francés seleccionado")
                 
-                # Esperar a que se aplique el cambio
-                time.sleep(5)
+                # Esperar a que se aplique el cambio (la URL pasa a /fr/ y la página se vuelve a renderizar)
+                home_page.wait_for_condition(EC.url_contains("/fr/"), timeout=15, name="url_fr")
+                home_page.wait_for_ui_settled()
                 
                 # Verificar cambio de idioma
                 new_url = driver.current_url
@@ -126,7 +98,7 @@ class TestCase3:
                 APPLY_BUTTON = (By.XPATH, "//button[contains(@class, 'points-of-sale_footer_action_button')]//span[contains(text(), 'Appliquer')]")
                 
                 # Esperar después del cambio de idioma
-                time.sleep(3)
+                home_page.wait_for_ui_settled()
                 
                 # Captura antes del cambio de POS
                 allure.attach(driver.get_screenshot_as_png(), name="antes_cambio_pos", attachment_type=allure.attachment_type.PNG)
@@ -139,7 +111,7 @@ class TestCase3:
                 )
                 pos_selector_btn.click()
                 print("✅ Selector de punto de venta abierto")
-                time.sleep(2)
+                home_page.wait_for_animations()  # Esperar la animación del dropdown
                 
                 # Captura del dropdown de POS
                 allure.attach(driver.get_screenshot_as_png(), name="dropdown_pos_abierto", attachment_type=allure.attachment_type.PNG)
@@ -152,7 +124,7 @@ class TestCase3:
                 )
                 france_option.click()
                 print("✅ Francia/EUR seleccionado")
-                time.sleep(2)
+                home_page.wait_for_animations()  # Esperar a que la selección se refleje antes de buscar el botón
                 
                 # 🔥 NUEVO PASO: Hacer clic en botón "Appliquer" (Aplicar)
                 print("🖱️ Haciendo clic en botón 'Appliquer'...")
@@ -162,8 +134,10 @@ class TestCase3:
                 apply_button.click()
                 print("✅ Botón 'Appliquer' clickeado")
                 
-                # Esperar a que se aplique el cambio
-                time.sleep(5)
+                # Esperar a que se aplique el cambio (el botón de POS muestra Francia)
+                home_page.wait_for_condition(EC.text_to_be_present_in_element(POS_SELECTOR, "France"),
+                                             timeout=15, name="pos_france")
+                home_page.wait_for_ui_settled()
                 
                 # Verificar que se cambió a Francia
                 try:
@@ -277,7 +251,9 @@ class TestCase3:
                 search_btn.click()
                 print("✅ Búsqueda de vuelos iniciada")
                 
-                time.sleep(8)
+                # Esperar a la página de resultados
+                home_page.wait_for_condition(lambda d: "select" in d.current_url.lower(), timeout=20, name="url_select")
+                home_page.wait_for_ui_settled()
                 
                 # Validar página de resultados
                 current_url = driver.current_url
@@ -348,7 +324,7 @@ class TestCase3:
                 print("🔧 Capturando datos de Network como JSON...")
                 
                 # Inicializar capturador
-                network_capture = NetworkCapture(driver)
+                network_capture = NetworkCapture.for_driver(driver)
                 
                 # Capturar TODOS los requests de network
                 all_network_data = network_capture.capture_network_requests_as_json()
@@ -1,6 +1,5 @@
 # tests/test_case_3.py
 import pytest
-import time
 import logging
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -14,318 +13,18 @@ class TestCase3:
     """Caso 3: Login completo y cambio de idioma a francés"""
     
     @pytest.mark.case3
-    def test_login_y_cambio_idioma(self, driver):
+    def test_login_y_cambio_idioma(self, driver, session_cache):
         """LOGIN COMPLETO Y CAMBIO DE IDIOMA A FRANCÉS"""
         
         logger.info("=== INICIANDO: LOGIN COMPLETO Y CAMBIO DE IDIOMA ===")
         
-        # 1. Navegar a la URL principal
-        logger.info("📝 PASO 1: Navegando a la URL principal...")
+        # 1-7. Login: por la UI la primera vez en el worker; después se restaura la sesión en caché
+        logger.info("🔐 PASOS 1-7: Iniciando sesión...")
         home_page = HomePage(driver)
-        home_page.navigate_to("https://nuxqa3.avtest.ink/")
-        
-        # Esperar carga completa de la página principal
-        time.sleep(5)
-        home_page.take_screenshot("01_pagina_principal.png")
-        logger.info("✅ Página principal cargada correctamente")
-        
-        # Guardar la ventana actual
-        main_window = driver.current_window_handle
-        logger.info(f"📱 Ventana principal: {main_window}")
-        
-        # 2. Buscar y hacer click en el botón de login
-        logger.info("🖱️ PASO 2: Buscando y haciendo click en botón de login...")
-        
-        try:
-            # Intentar el selector principal primero
-            login_btn = home_page.wait.until(
-                EC.element_to_be_clickable(home_page.LOGIN_BUTTON)
-            )
-            logger.info(f"✅ Botón de login encontrado: {login_btn.get_attribute('class')}")
-            
-            # Hacer click en el botón
-            home_page.click_element(login_btn)
-            logger.info("✅ Click en botón de login realizado")
-            
-        except Exception as e:
-            logger.error(f"❌ No se pudo encontrar/hacer click en el botón de login: {e}")
-            logger.info("🔍 Buscando botones alternativos...")
-            
-            # Buscar todos los botones en la página
-            all_buttons = driver.find_elements(By.TAG_NAME, "button")
-            logger.info(f"🔍 Total de botones encontrados: {len(all_buttons)}")
-            
-            for i, btn in enumerate(all_buttons):
-                try:
-                    btn_class = btn.get_attribute('class') or ''
-                    btn_text = btn.text or ''
-                    btn_id = btn.get_attribute('id') or ''
-                    
-                    # Si parece un botón de login, intentar click
-                    if ('auth' in btn_class.lower() or 
-                        'login' in btn_class.lower() or 
-                        'iniciar' in btn_text.lower() or
-                        'sesión' in btn_text.lower()):
-                        logger.info(f"🎯 Este parece un botón de login, intentando click...")
-                        home_page.click_element(btn)
-                        logger.info("✅ Click en botón alternativo realizado")
-                        break
-                        
-                except Exception as btn_error:
-                    logger.error(f"❌ Error con botón {i+1}: {btn_error}")
-                    continue
-            else:
-                logger.error("❌ No se encontró ningún botón de login viable")
-                home_page.take_screenshot("error_boton_login.png")
-                assert False, "No se pudo encontrar el botón de login"
-        
-        # 3. Manejar la nueva ventana/pestaña o redirección
-        logger.info("🔄 PASO 3: Manejando nueva ventana/redirección...")
-        
-        # Esperar a que ocurra algún cambio
-        time.sleep(5)
-        
-        # Verificar si hay nuevas ventanas
-        all_windows = driver.window_handles
-        logger.info(f"📱 Ventanas abiertas: {len(all_windows)}")
-        
-        if len(all_windows) > 1:
-            # Cambiar a la nueva ventana
-            new_window = [window for window in all_windows if window != main_window][0]
-            driver.switch_to.window(new_window)
-            logger.info(f"✅ Cambiado a nueva ventana: {new_window}")
-        else:
-            # Si no hay nueva ventana, verificar si cambió la URL
-            current_url = driver.current_url
-            logger.info(f"🌐 URL actual: {current_url}")
-            
-            if current_url != "https://nuxqa3.avtest.ink/":
-                logger.info("✅ Se detectó redirección a nueva URL")
-            else:
-                logger.info("ℹ️  Permanece en la misma URL, puede ser un modal")
-        
-        # Tomar screenshot del estado actual
-        home_page.take_screenshot("02_despues_del_login_click.png")
-        logger.info("📸 Screenshot tomado después del click en login")
-        
-        # 4. Buscar y llenar el campo de USUARIO
-        logger.info("👤 PASO 4: Buscando y llenando campo de USUARIO...")
-        
-        username_field = None
-        
-        try:
-            # Estrategias para encontrar campo de usuario
-            selectores_usuario = [
-                (By.ID, "u-username"),
-                (By.CSS_SELECTOR, "input[type='text']"),
-                (By.CSS_SELECTOR, "input[type='email']"),
-                (By.CSS_SELECTOR, "input[name='new-username']"),
-                (By.CSS_SELECTOR, "input[placeholder*='Lifemiles']"),
-                (By.CSS_SELECTOR, "input[placeholder*='usuario']"),
-                (By.CSS_SELECTOR, "input[placeholder*='correo']"),
-                (By.CSS_SELECTOR, "input.authentication-ui-MembersForm_inputBox")
-            ]
-            
-            for selector_type, selector_value in selectores_usuario:
-                try:
-                    logger.info(f"🔍 Probando selector usuario: {selector_type} -> {selector_value}")
-                    elemento = driver.find_element(selector_type, selector_value)
-                    if elemento.is_displayed() and elemento.is_enabled():
-                        username_field = elemento
-                        logger.info(f"✅ Campo de USUARIO encontrado con selector: {selector_value}")
-                        break
-                except Exception as e:
-                    logger.info(f"❌ Selector usuario no funcionó: {selector_value}")
-                    continue
-            
-            if username_field:
-                # Llenar campo de usuario
-                home_page.click_element(username_field)
-                username_field.clear()
-                usuario = "21734198706"
-                username_field.send_keys(usuario)
-                logger.info(f"✅ USUARIO ingresado: {usuario}")
-                
-                # Verificar ingreso
-                texto_ingresado = username_field.get_attribute('value')
-                if texto_ingresado == usuario:
-                    logger.info("✅ USUARIO verificado correctamente")
-                else:
-                    logger.warning(f"⚠️ Texto en campo usuario: '{texto_ingresado}'")
-                
-                home_page.take_screenshot("03_usuario_ingresado.png")
-                
-            else:
-                raise Exception("No se pudo encontrar el campo de USUARIO")
-                
-        except Exception as e:
-            logger.error(f"❌ Error con campo de USUARIO: {e}")
-            home_page.take_screenshot("error_campo_usuario.png")
-            assert False, f"No se pudo llenar el campo de USUARIO: {e}"
-        
-        # 5. Buscar y llenar el campo de CONTRASEÑA
-        logger.info("🔐 PASO 5: Buscando y llenando campo de CONTRASEÑA...")
-        
-        password_field = None
-        
-        try:
-            # Estrategias para encontrar campo de contraseña
-            selectores_password = [
-                (By.ID, "u-password"),
-                (By.CSS_SELECTOR, "input[type='password']"),
-                (By.CSS_SELECTOR, "input[name='new-password']"),
-                (By.CSS_SELECTOR, "input[placeholder*='Contraseña']"),
-                (By.CSS_SELECTOR, "input[placeholder*='password']"),
-                (By.CSS_SELECTOR, "input.authentication-ui-MembersForm_inputBox[type='password']")
-            ]
-            
-            for selector_type, selector_value in selectores_password:
-                try:
-                    logger.info(f"🔍 Probando selector contraseña: {selector_type} -> {selector_value}")
-                    elemento = driver.find_element(selector_type, selector_value)
-                    if elemento.is_displayed() and elemento.is_enabled():
-                        password_field = elemento
-                        logger.info(f"✅ Campo de CONTRASEÑA encontrado con selector: {selector_value}")
-                        break
-                except Exception as e:
-                    logger.info(f"❌ Selector contraseña no funcionó: {selector_value}")
-                    continue
-            
-            if password_field:
-                # Llenar campo de contraseña
-                home_page.click_element(password_field)
-                password_field.clear()
-                contraseña = "Lifemiles1"
-                password_field.send_keys(contraseña)
-                logger.info(f"✅ CONTRASEÑA ingresada: {contraseña}")
-                
-                # Verificar ingreso
-                texto_ingresado = password_field.get_attribute('value')
-                if texto_ingresado:
-                    logger.info("✅ CONTRASEÑA ingresada correctamente")
-                else:
-                    logger.warning("⚠️ El campo de contraseña parece estar vacío")
-                
-                home_page.take_screenshot("04_contrasena_ingresada.png")
-                
-            else:
-                raise Exception("No se pudo encontrar el campo de CONTRASEÑA")
-                
-        except Exception as e:
-            logger.error(f"❌ Error con campo de CONTRASEÑA: {e}")
-            home_page.take_screenshot("error_campo_contrasena.png")
-            assert False, f"No se pudo llenar el campo de CONTRASEÑA: {e}"
-        
-        # 6. Hacer clic en el botón "Iniciar sesión"
-        logger.info("🖱️ PASO 6: Buscando y haciendo click en botón 'Iniciar sesión'...")
-        
-        try:
-            # Estrategias para encontrar el botón de submit
-            selectores_submit = [
-                (By.ID, "Login-confirm"),
-                (By.CSS_SELECTOR, "button[data-cy='lmSubmit']"),
-                (By.CSS_SELECTOR, "button[type='submit']"),
-                (By.CSS_SELECTOR, "button.authentication-ui-MembersForm_buttonLoginWrapper"),
-                (By.XPATH, "//button[contains(text(), 'Iniciar sesión')]"),
-                (By.XPATH, "//button[contains(text(), 'Iniciar')]")
-            ]
-            
-            submit_button = None
-            
-            for selector_type, selector_value in selectores_submit:
-                try:
-                    logger.info(f"🔍 Probando selector botón: {selector_type} -> {selector_value}")
-                    elemento = driver.find_element(selector_type, selector_value)
-                    if elemento.is_displayed() and elemento.is_enabled():
-                        submit_button = elemento
-                        logger.info(f"✅ Botón 'Iniciar sesión' encontrado con selector: {selector_value}")
-                        logger.info(f"📝 Texto del botón: '{elemento.text}'")
-                        break
-                except Exception as e:
-                    logger.info(f"❌ Selector botón no funcionó: {selector_value}")
-                    continue
-            
-            if submit_button:
-                # Tomar screenshot antes del click
-                home_page.take_screenshot("05_antes_del_login.png")
-                
-                # Hacer click en el botón
-                home_page.click_element(submit_button)
-                logger.info("✅ Click en botón 'Iniciar sesión' realizado")
-                
-                # ESPERAR MÁS TIEMPO PARA QUE PROCESE EL LOGIN Y CARGUE LA PÁGINA
-                logger.info("⏳ Esperando procesamiento del login y carga de página...")
-                logger.info("🕒 Esperando 15 segundos para carga completa...")
-                time.sleep(15)
-                
-                # Tomar screenshot después del login
-                home_page.take_screenshot("06_despues_del_login.png")
-                logger.info("📸 Screenshot tomado después de 15 segundos")
-                
-            else:
-                raise Exception("No se pudo encontrar el botón 'Iniciar sesión'")
-                
-        except Exception as e:
-            logger.error(f"❌ Error con botón 'Iniciar sesión': {e}")
-            home_page.take_screenshot("error_boton_iniciar_sesion.png")
-            assert False, f"No se pudo hacer click en 'Iniciar sesión': {e}"
-        
-        # 7. Verificar que estamos en la página de inicio después del login
-        logger.info("🏠 PASO 7: Verificando redirección a página de inicio...")
-        
-        try:
-            # Verificar cambios en la URL o elementos de la página
-            current_url_after_login = driver.current_url
-            logger.info(f"🌐 URL después del login: {current_url_after_login}")
-            
-            # ESPERAR ADICIONAL PARA ELEMENTOS DINÁMICOS
-            logger.info("⏳ Esperando 5 segundos más para elementos dinámicos...")
-            time.sleep(5)
-            
-            # Buscar indicadores de que el login fue exitoso
-            indicadores_exitosos = [
-                (By.CSS_SELECTOR, "[data-cy='user-profile']"),
-                (By.CSS_SELECTOR, "[class*='welcome']"),
-                (By.CSS_SELECTOR, "[class*='user']"),
-                (By.CSS_SELECTOR, "[class*='profile']"),
-                (By.CSS_SELECTOR, "[class*='account']"),
-                (By.CSS_SELECTOR, "[class*='member']"),
-                (By.XPATH, "//*[contains(text(), 'Bienvenido')]"),
-                (By.XPATH, "//*[contains(text(), 'Welcome')]"),
-                (By.XPATH, "//*[contains(text(), 'Hola')]"),
-                (By.XPATH, "//*[contains(text(), 'Mi cuenta')]"),
-                (By.XPATH, "//*[contains(text(), 'My account')]")
-            ]
-            
-            login_exitoso = False
-            elementos_encontrados = []
-            
-            for selector_type, selector_value in indicadores_exitosos:
-                try:
-                    elementos = driver.find_elements(selector_type, selector_value)
-                    for elemento in elementos:
-                        if elemento.is_displayed():
-                            elementos_encontrados.append({
-                                'selector': selector_value,
-                                'texto': elemento.text[:50] + '...' if len(elemento.text) > 50 else elemento.text
-                            })
-                            login_exitoso = True
-                except:
-                    continue
-            
-            if login_exitoso:
-                logger.info("🎉 LOGIN EXITOSO - Elementos encontrados:")
-                for elem in elementos_encontrados[:5]:
-                    logger.info(f"   ✅ {elem['selector']}: '{elem['texto']}'")
-            else:
-                logger.info("ℹ️  No se encontraron indicadores específicos de usuario logueado")
-                
-            # Tomar screenshot final de la página completamente cargada
-            home_page.take_screenshot("07_pagina_final_cargada.png")
-            logger.info("📸 Screenshot final tomado")
-            
-        except Exception as e:
-            logger.error(f"❌ Error verificando redirección: {e}")
+        method = session_cache.ensure("https://nuxqa3.avtest.ink/")
+        logger.info(f"✅ Login completado ({'sesión restaurada' if method == 'restored' else 'login por la UI'})")
+        logger.info(f"🌐 URL después del login: {driver.current_url}")
+        home_page.take_screenshot("07_pagina_final_cargada.png")
         
         # 8. VERIFICAR ESTADO ACTUAL ANTES DE CAMBIAR IDIOMA
         logger.info("🔍 PASO 8: Verificando estado actual antes de cambiar idioma...")
@@ -344,14 +43,12 @@ class TestCase3:
             ]
             
             for selector in language_selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    logger.info(f"🔍 Selector '{selector}': {len(elements)} elementos encontrados")
-                    for i, elem in enumerate(elements):
-                        if elem.is_displayed():
-                            logger.info(f"   ✅ Elemento {i+1} visible: {elem.tag_name} - {elem.text}")
-                except Exception as e:
-                    logger.info(f"   ❌ Error con selector '{selector}': {e}")
+                # Etiqueta, texto y visibilidad de todos los elementos en un solo viaje
+                elements = home_page.snapshot((By.CSS_SELECTOR, selector), props=("tag", "text", "displayed"))
+                logger.info(f"🔍 Selector '{selector}': {len(elements)} elementos encontrados")
+                for i, elem in enumerate(elements):
+                    if elem.displayed:
+                        logger.info(f"   ✅ Elemento {i+1} visible: {elem.tag} - {elem.text}")
             
             # Tomar screenshot del estado actual
             home_page.take_screenshot("08_estado_antes_cambio_idioma.png")
@@ -371,8 +68,10 @@ class TestCase3:
             url_code = language_page.select_language('francais')
             logger.info(f"✅ LanguagePage.select_language retornó: {url_code}")
             
-            # Esperar y verificar
-            time.sleep(3)
+            # Esperar a que la URL refleje el idioma y verificar
+            if url_code:
+                home_page.wait_for_condition(EC.url_contains(f"/{url_code}/"), timeout=15, name=f"url_{url_code}")
+            home_page.wait_for_ui_settled()
             current_url = driver.current_url
             logger.info(f"🌐 URL después de LanguagePage: {current_url}")
             
@@ -406,7 +105,7 @@ class TestCase3:
                             # Hacer click para abrir dropdown
                             home_page.click_element(language_btn)
                             logger.info("✅ Click en selector de idioma")
-                            time.sleep(2)
+                            home_page.wait_for_animations()  # Esperar la animación del dropdown
                             
                             # Buscar opción Francés
                             french_options = [
@@ -422,7 +121,8 @@ class TestCase3:
                                         logger.info(f"✅ Opción Francés encontrada: {french_xpath}")
                                         home_page.click_element(french_btn)
                                         logger.info("✅ Click en Francés")
-                                        time.sleep(3)
+                                        home_page.wait_for_condition(EC.url_contains("/fr/"), timeout=15, name="url_fr")
+                                        home_page.wait_for_ui_settled()
                                         success = True
                                         break
                                 except:
@@ -458,7 +158,8 @@ class TestCase3:
                     
                     logger.info(f"🔄 Navegando a: {new_url}")
                     driver.get(new_url)
-                    time.sleep(3)
+                    home_page.wait_for_page_load()
+                    home_page.wait_for_ui_settled()
                     success = True
                     logger.info("✅ Cambio por URL completado")
                 
@@ -486,14 +187,10 @@ class TestCase3:
             
             french_found = False
             for indicator in french_indicators:
-                try:
-                    elements = driver.find_elements(By.XPATH, indicator)
-                    for elem in elements:
-                        if elem.is_displayed():
-                            logger.info(f"✅ Indicador francés encontrado: '{elem.text}'")
-                            french_found = True
-                except:
-                    continue
+                for elem in home_page.snapshot((By.XPATH, indicator), props=("text", "displayed")):
+                    if elem.displayed:
+                        logger.info(f"✅ Indicador francés encontrado: '{elem.text}'")
+                        french_found = True
             
             if french_found:
                 logger.info("🎉 CAMBIO DE IDIOMA EXITOSO")
@@ -509,8 +206,8 @@ class TestCase3:
             logger.error(f"❌ Error en verificación final: {e}")
         
         # 11. Finalizar prueba
-        logger.info("⏳ PASO 11: Espera final de 3 segundos...")
-        time.sleep(3)
+        logger.info("⏳ PASO 11: Esperando a que la UI quede estable...")
+        home_page.wait_for_ui_settled()
         
         logger.info("🎯 PRUEBA COMPLETADA")
         logger.info("✅ Usuario y contraseña ingresados correctamente")
@@ -1,20 +1,22 @@
 import pytest
-import os
 import allure
 import logging
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
 from pages.home_page import HomePage
 from utils.database import DatabaseManager
-from utils.video_recorder import VideoRecorder
+from utils.state_seeder import StateSeeder
 
 logger = logging.getLogger(__name__)
 
 
 @allure.feature("Caso 6: Navegación en Navbar")
+@pytest.mark.header
+@pytest.mark.redirects
 class TestCase6:
     """Tests para navegación en el navbar - Ofertas de vuelos, Check-in e Información y ayuda"""
 
@@ -25,7 +27,7 @@ class TestCase6:
     ]
 
     @pytest.fixture(scope="function", params=URLS)
-    def setup(self, browser, request):
+    def setup(self, browser, request, video_recorder):
         """Setup: Prepara el entorno para cada URL"""
         base_url = request.param
         url_name = "nuxqa4" if "nuxqa4" in base_url else "nuxqa5"
@@ -34,37 +36,13 @@ class TestCase6:
         
         home_page = HomePage(browser)
         
-        # Configurar video recording
-        test_name = f"caso6_{url_name}_{browser.name}"
-        video_recorder = VideoRecorder(test_name=test_name, browser_name=browser.name)
-        
-        # Configurar base de datos
+        # Configurar base de datos (la grabación de video la gestiona el fixture video_recorder)
         db = DatabaseManager()
 
-        try:
-            # Iniciar grabación de video
-            video_recorder.start_recording()
-        except Exception as e:
-            logger.warning(f"No se pudo iniciar VideoRecorder: {e}")
-
-        # Navegar a la URL base
-        home_page.navigate_to(base_url)
+        # Entrar directamente en español por la ruta /es/ (el selector de idioma no es lo que se prueba aquí)
+        method = StateSeeder(browser).seed(base_url, language='español')
         home_page.wait_for_page_load()
-
-        # Verificar y forzar idioma español si es necesario
-        current_url = home_page.get_page_url()
-        logger.info(f"URL actual: {current_url}")
-        
-        if not current_url.endswith('/es/'):
-            try:
-                logger.info("Forzando idioma a español...")
-                home_page.select_language('español')
-                time.sleep(3)
-                # Verificar que cambió a español
-                new_url = home_page.get_page_url()
-                logger.info(f"URL después de cambiar idioma: {new_url}")
-            except Exception as e:
-                logger.warning(f"No se pudo forzar idioma a Español: {e}")
+        logger.info(f"URL actual: {home_page.get_page_url()} (idioma sembrado por {method})")
 
         yield {
             'browser': browser,
@@ -75,20 +53,12 @@ class TestCase6:
             'url_name': url_name  # Asegurar que esta línea está presente
         }
 
-        # Teardown: detener grabación
-        try:
-            video_path = video_recorder.stop_recording()
-            logger.info(f"Video guardado: {video_path}")
-        except Exception as e:
-            logger.debug(f"No se pudo detener VideoRecorder: {e}")
-
     @allure.title("Caso 6.1: Navegación a Ofertas de Vuelos")
     @allure.severity(allure.severity_level.CRITICAL)
     def test_navigate_to_flight_offers(self, setup):
         """Navegar desde el navbar a Ofertas y destinos -> Ofertas de vuelos"""
         browser = setup['browser']
         home_page = setup['home_page']
-        video_recorder = setup['video_recorder']
         db = setup['db']
         base_url = setup['base_url']
         url_name = setup['url_name']  # Obtener url_name del setup
@@ -113,9 +83,6 @@ class TestCase6:
                 logger.info(f"✅ URL en español confirmada: {current_url}")
                 allure.attach(current_url, name="URL en Español", attachment_type=allure.attachment_type.TEXT)
 
-                # Capturar screenshot inicial
-                video_recorder.capture_frame(browser)
-
             # Paso 2: Localizar el menú "Ofertas y destinos" con múltiples selectores
             with allure.step("Localizar menú Ofertas y destinos"):
                 logger.info("Buscando menú 'Ofertas y destinos'...")
@@ -133,16 +100,13 @@ class TestCase6:
                 offers_menu = None
                 used_selector = ""
                 
-                for selector in selectors:
-                    try:
-                        offers_menu = WebDriverWait(browser, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        used_selector = selector
-                        logger.info(f"✅ Menú encontrado con selector: {selector}")
-                        break
-                    except:
-                        continue
+                # Todos los selectores se evalúan a la vez en el navegador: el peor caso es un único timeout
+                try:
+                    offers_menu, locator = home_page.find_first(*[(By.XPATH, selector) for selector in selectors], timeout=5)
+                    used_selector = locator[1]
+                    logger.info(f"✅ Menú encontrado con selector: {used_selector}")
+                except TimeoutException:
+                    pass
                 
                 if not offers_menu:
                     # Último intento: buscar cualquier elemento que contenga "Ofertas"
@@ -163,9 +127,6 @@ class TestCase6:
             with allure.step("Abrir menú Ofertas y destinos"):
                 logger.info("Interactuando con el menú...")
                 
-                # Capturar antes de la interacción
-                video_recorder.capture_frame(browser)
-                
                 # Intentar diferentes métodos de interacción
                 try:
                     # Método 1: Click directo
@@ -184,8 +145,7 @@ class TestCase6:
                         offers_menu.click()
                         logger.info("✅ Click ejecutado normalmente")
                 
-                time.sleep(2)  # Esperar a que se abra el menú
-                video_recorder.capture_frame(browser)
+                home_page.wait_for_animations()  # Esperar a que se abra el menú
 
             # Paso 4: Localizar "Ofertas de vuelos" en el submenú
             with allure.step("Localizar Ofertas de vuelos"):
@@ -203,16 +163,12 @@ class TestCase6:
                 flight_offers_link = None
                 used_flight_selector = ""
                 
-                for selector in flight_selectors:
-                    try:
-                        flight_offers_link = WebDriverWait(browser, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        used_flight_selector = selector
-                        logger.info(f"✅ 'Ofertas de vuelos' encontrado con selector: {selector}")
-                        break
-                    except:
-                        continue
+                try:
+                    flight_offers_link, locator = home_page.find_first(*[(By.XPATH, selector) for selector in flight_selectors], timeout=5)
+                    used_flight_selector = locator[1]
+                    logger.info(f"✅ 'Ofertas de vuelos' encontrado con selector: {used_flight_selector}")
+                except TimeoutException:
+                    pass
                 
                 if not flight_offers_link:
                     # Tomar screenshot del menú abierto
@@ -225,9 +181,6 @@ class TestCase6:
             with allure.step("Navegar a Ofertas de vuelos"):
                 start_time = time.time()
                 
-                # Capturar antes del click
-                video_recorder.capture_frame(browser)
-                
                 # Hacer click en el enlace
                 try:
                     browser.execute_script("arguments[0].click();", flight_offers_link)
@@ -247,6 +200,9 @@ class TestCase6:
                 
                 execution_time = time.time() - start_time
                 logger.info(f"✅ Navegación completada en {execution_time:.2f}s")
+                
+                # Métricas del navegador (TTFB, LCP, CLS...) de la página destino
+                metrics = home_page.record_navigation_metrics("header_offers")
 
             # Paso 6: Verificaciones finales
             with allure.step("Verificar navegación exitosa"):
@@ -283,8 +239,6 @@ class TestCase6:
                     attachment_type=allure.attachment_type.PNG
                 )
                 
-                # Capturar frame final
-                video_recorder.capture_frame(browser)
                 logger.info("✅ Evidencias visuales capturadas")
 
             # Paso 8: Guardar en base de datos
@@ -306,6 +260,7 @@ class TestCase6:
                     from_url=base_url,
                     to_url=final_url,
                     redirect_success=True,
+                    load_time_seconds=metrics["load_event_ms"] / 1000 if metrics and metrics["load_event_ms"] else None,
                     page_title=page_title,
                     additional_notes=f"Tiempo: {execution_time:.2f}s"
                 )
@@ -360,7 +315,6 @@ class TestCase6:
         """Navegar desde el navbar a Tu reserva / Check-in -> Personaliza tu viaje"""
         browser = setup['browser']
         home_page = setup['home_page']
-        video_recorder = setup['video_recorder']
         db = setup['db']
         base_url = setup['base_url']
         url_name = setup['url_name']  # Obtener url_name del setup
@@ -378,7 +332,6 @@ class TestCase6:
                 assert '/es/' in current_url, f"No se pudo navegar a la página principal en español: {current_url}"
                 logger.info(f"✅ En página principal española: {current_url}")
                 
-                video_recorder.capture_frame(browser)
                 allure.attach(current_url, name="URL Inicial Test 6.2", attachment_type=allure.attachment_type.TEXT)
 
             # Paso 2: Localizar el menú "Tu reserva / Check-in" (al lado derecho de Ofertas y destinos)
@@ -398,16 +351,12 @@ class TestCase6:
                 checkin_menu = None
                 used_checkin_selector = ""
                 
-                for selector in checkin_selectors:
-                    try:
-                        checkin_menu = WebDriverWait(browser, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        used_checkin_selector = selector
-                        logger.info(f"✅ Menú Check-in encontrado con selector: {selector}")
-                        break
-                    except:
-                        continue
+                try:
+                    checkin_menu, locator = home_page.find_first(*[(By.XPATH, selector) for selector in checkin_selectors], timeout=10)
+                    used_checkin_selector = locator[1]
+                    logger.info(f"✅ Menú Check-in encontrado con selector: {used_checkin_selector}")
+                except TimeoutException:
+                    pass
                 
                 if not checkin_menu:
                     raise Exception("No se pudo encontrar el menú 'Tu reserva / Check-in'")
@@ -418,8 +367,6 @@ class TestCase6:
             with allure.step("Abrir menú Tu reserva / Check-in"):
                 logger.info("Interactuando con el menú Check-in...")
                 
-                video_recorder.capture_frame(browser)
-                
                 # Hacer click para abrir el menú
                 try:
                     browser.execute_script("arguments[0].click();", checkin_menu)
@@ -435,8 +382,7 @@ class TestCase6:
                         checkin_menu.click()
                         logger.info("✅ Click normal ejecutado")
                 
-                time.sleep(2)  # Esperar a que se abra el menú
-                video_recorder.capture_frame(browser)
+                home_page.wait_for_animations()  # Esperar a que se abra el menú
                 
                 # Tomar screenshot después de abrir el menú
                 home_page.take_screenshot(f"caso6_2_menu_checkin_abierto_{url_name}.png")
@@ -458,16 +404,12 @@ class TestCase6:
                 customize_link = None
                 used_customize_selector = ""
                 
-                for selector in customize_selectors:
-                    try:
-                        customize_link = WebDriverWait(browser, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        used_customize_selector = selector
-                        logger.info(f"✅ 'Personaliza tu viaje' encontrado con selector: {selector}")
-                        break
-                    except:
-                        continue
+                try:
+                    customize_link, locator = home_page.find_first(*[(By.XPATH, selector) for selector in customize_selectors], timeout=10)
+                    used_customize_selector = locator[1]
+                    logger.info(f"✅ 'Personaliza tu viaje' encontrado con selector: {used_customize_selector}")
+                except TimeoutException:
+                    pass
                 
                 if not customize_link:
                     # Tomar screenshot para diagnóstico
@@ -481,8 +423,6 @@ class TestCase6:
                 start_time = time.time()
                 initial_url = browser.current_url
                 
-                video_recorder.capture_frame(browser)
-                
                 # Hacer click en el enlace
                 try:
                     browser.execute_script("arguments[0].click();", customize_link)
@@ -496,6 +436,9 @@ class TestCase6:
                 
                 execution_time = time.time() - start_time
                 logger.info(f"✅ Navegación a Personaliza tu viaje completada en {execution_time:.2f}s")
+                
+                # Métricas del navegador (TTFB, LCP, CLS...) de la página destino
+                metrics = home_page.record_navigation_metrics("header_checkin")
 
             # Paso 6: Verificaciones finales
             with allure.step("Verificar navegación exitosa"):
@@ -525,8 +468,6 @@ class TestCase6:
                     attachment_type=allure.attachment_type.PNG
                 )
                 
-                # Capturar frame final
-                video_recorder.capture_frame(browser)
                 logger.info("✅ Evidencias visuales capturadas para Test 6.2")
 
             # Paso 8: Guardar en base de datos
@@ -548,6 +489,7 @@ class TestCase6:
                     from_url=base_url,
                     to_url=final_url,
                     redirect_success=True,
+                    load_time_seconds=metrics["load_event_ms"] / 1000 if metrics and metrics["load_event_ms"] else None,
                     page_title=page_title,
                     additional_notes=f"Tiempo: {execution_time:.2f}s"
                 )
@@ -602,7 +544,6 @@ class TestCase6:
         """Navegar desde el navbar a Información y ayuda -> Tipos de tarifa"""
         browser = setup['browser']
         home_page = setup['home_page']
-        video_recorder = setup['video_recorder']
         db = setup['db']
         base_url = setup['base_url']
         url_name = setup['url_name']  # Obtener url_name del setup
@@ -620,7 +561,6 @@ class TestCase6:
                 assert '/es/' in current_url, f"No se pudo navegar a la página principal en español: {current_url}"
                 logger.info(f"✅ En página principal española: {current_url}")
                 
-                video_recorder.capture_frame(browser)
                 allure.attach(current_url, name="URL Inicial Test 6.3", attachment_type=allure.attachment_type.TEXT)
 
             # Paso 2: Localizar el menú "Información y ayuda" (al lado derecho de Tu reserva / Check-in)
@@ -640,16 +580,12 @@ class TestCase6:
                 info_menu = None
                 used_info_selector = ""
                 
-                for selector in info_selectors:
-                    try:
-                        info_menu = WebDriverWait(browser, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        used_info_selector = selector
-                        logger.info(f"✅ Menú Información y ayuda encontrado con selector: {selector}")
-                        break
-                    except:
-                        continue
+                try:
+                    info_menu, locator = home_page.find_first(*[(By.XPATH, selector) for selector in info_selectors], timeout=10)
+                    used_info_selector = locator[1]
+                    logger.info(f"✅ Menú Información y ayuda encontrado con selector: {used_info_selector}")
+                except TimeoutException:
+                    pass
                 
                 if not info_menu:
                     raise Exception("No se pudo encontrar el menú 'Información y ayuda'")
@@ -660,8 +596,6 @@ class TestCase6:
             with allure.step("Abrir menú Información y ayuda"):
                 logger.info("Interactuando con el menú Información y ayuda...")
                 
-                video_recorder.capture_frame(browser)
-                
                 # Hacer click para abrir el menú
                 try:
                     browser.execute_script("arguments[0].click();", info_menu)
@@ -677,8 +611,7 @@ class TestCase6:
                         info_menu.click()
                         logger.info("✅ Click normal ejecutado")
                 
-                time.sleep(2)  # Esperar a que se abra el menú
-                video_recorder.capture_frame(browser)
+                home_page.wait_for_animations()  # Esperar a que se abra el menú
                 
                 # Tomar screenshot después de abrir el menú
                 home_page.take_screenshot(f"caso6_3_menu_info_abierto_{url_name}.png")
@@ -700,16 +633,12 @@ class TestCase6:
                 tariff_link = None
                 used_tariff_selector = ""
                 
-                for selector in tariff_selectors:
-                    try:
-                        tariff_link = WebDriverWait(browser, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        used_tariff_selector = selector
-                        logger.info(f"✅ 'Tipos de tarifa' encontrado con selector: {selector}")
-                        break
-                    except:
-                        continue
+                try:
+                    tariff_link, locator = home_page.find_first(*[(By.XPATH, selector) for selector in tariff_selectors], timeout=10)
+                    used_tariff_selector = locator[1]
+                    logger.info(f"✅ 'Tipos de tarifa' encontrado con selector: {used_tariff_selector}")
+                except TimeoutException:
+                    pass
                 
                 if not tariff_link:
                     # Tomar screenshot para diagnóstico
@@ -723,8 +652,6 @@ class TestCase6:
                 start_time = time.time()
                 initial_url = browser.current_url
                 
-                video_recorder.capture_frame(browser)
-                
                 # Hacer click en el enlace
                 try:
                     browser.execute_script("arguments[0].click();", tariff_link)
@@ -738,6 +665,9 @@ class TestCase6:
                 
                 execution_time = time.time() - start_time
                 logger.info(f"✅ Navegación a Tipos de tarifa completada en {execution_time:.2f}s")
+                
+                # Métricas del navegador (TTFB, LCP, CLS...) de la página destino
+                metrics = home_page.record_navigation_metrics("header_tariffs")
 
             # Paso 6: Verificaciones finales
             with allure.step("Verificar navegación exitosa"):
@@ -766,21 +696,6 @@ class TestCase6:
                     name=f"Screenshot Tipos de Tarifa - {browser.name} - {url_name}",
                     attachment_type=allure.attachment_type.PNG
                 )
-                
-                # Capturar frame final y adjuntar video
-                video_recorder.capture_frame(browser)
-                
-                try:
-                    video_file = video_recorder.stop_recording()
-                    if video_file and os.path.exists(video_file):
-                        allure.attach.file(
-                            video_file,
-                            name=f"Video Completo - Tests 6.1, 6.2 y 6.3 - {url_name}",
-                            attachment_type=allure.attachment_type.MP4
-                        )
-                        logger.info("✅ Video completo adjuntado a Allure")
-                except Exception as e:
-                    logger.warning(f"No se pudo adjuntar video: {e}")
 
                 logger.info("✅ Evidencias visuales capturadas para Test 6.3")
 
@@ -803,6 +718,7 @@ class TestCase6:
                     from_url=base_url,
                     to_url=final_url,
                     redirect_success=True,
+                    load_time_seconds=metrics["load_event_ms"] / 1000 if metrics and metrics["load_event_ms"] else None,
                     page_title=page_title,
                     additional_notes=f"Tiempo: {execution_time:.2f}s"
                 )
@@ -850,12 +766,6 @@ class TestCase6:
             except Exception as db_error:
                 logger.debug(f"Fallo al guardar en DB: {db_error}")
 
-            # Intentar detener la grabación
-            try:
-                video_recorder.stop_recording()
-            except Exception:
-                pass
-
             raise
 
 
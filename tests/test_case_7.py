@@ -1,7 +1,6 @@
 # tests/test_case_7_simple.py
 import pytest
 import logging
-import time
 import os
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
@@ -9,6 +8,9 @@ from pages.home_page import HomePage
 
 logger = logging.getLogger(__name__)
 
+@pytest.mark.footer
+@pytest.mark.redirects
+@pytest.mark.max_roundtrips(150, action="warn")
 class TestFooterRedirectsSimple:
     """Caso 7: Redirecciones del footer - 8 PRUEBAS (4 enlaces × 2 entornos)"""
     
@@ -132,49 +134,52 @@ class TestFooterRedirectsSimple:
         # PASO 1: Navegar a la página principal
         logger.info(f"1. Navegando a {base_url}")
         home_page.navigate_to(base_url)
-        time.sleep(3)
+        home_page.wait_for_ui_settled()
         
         # PASO 2: Hacer scroll al footer
         logger.info("2. Haciendo scroll al footer")
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
+        home_page.scroll_to("bottom")
+        home_page.wait_for_dom_stable()
         
         # PASO 3: Buscar el enlace
         logger.info(f"3. Buscando enlace '{link_name}'")
         
-        # Usar SOLO el selector más específico primero
+        # Selector por href específico y por texto; la caché de localizadores recuerda cuál funciona
+        # en cada entorno para probarlo primero
         try:
-            # Selector específico basado en el HTML
-            target_link = driver.find_element(By.XPATH, selector_by_href)
-            logger.info("✅ Enlace encontrado por href específico")
-        except:
-            # Si falla, buscar por texto
-            try:
-                target_link = driver.find_element(By.XPATH, selector_by_text)
-                logger.info("✅ Enlace encontrado por texto")
-            except Exception as e:
-                logger.error(f"❌ No se pudo encontrar el enlace '{link_name}': {e}")
-                assert False, f"Enlace '{link_name}' no encontrado en {env_name}"
-        
-        # PASO 4: Obtener información del enlace
-        link_text = target_link.text.strip()
-        link_href = target_link.get_attribute('href')
+            target_link, strategy = home_page.find_first_named(
+                f"FOOTER_LINK_{link_id}",
+                (By.XPATH, selector_by_href),
+                (By.XPATH, selector_by_text),
+                visible=False
+            )
+            logger.info(f"✅ Enlace encontrado con: {strategy}")
+        except Exception as e:
+            logger.error(f"❌ No se pudo encontrar el enlace '{link_name}': {e}")
+            assert False, f"Enlace '{link_name}' no encontrado en {env_name}"
+        
+        # PASO 4: Obtener información del enlace encontrado (texto y href en un solo viaje)
+        link = home_page.read_properties(target_link, ("text", "href"))
+        link_text, link_href = link.get("text"), link.get("href")
         logger.info(f"📝 Encontrado: '{link_text}' -> {link_href}")
         
         # PASO 5: Hacer click en el enlace
         logger.info(f"4. Haciendo click en '{link_name}'")
         
         # Scroll para asegurar visibilidad
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", target_link)
-        time.sleep(1)
+        home_page.scroll_into_view(target_link)
+        home_page.wait_for_animations()
         
         # Hacer click con JavaScript
-        driver.execute_script("arguments[0].click();", target_link)
+        previous_url = driver.current_url
+        home_page.js_click(target_link)
         logger.info("✅ Click realizado")
         
         # PASO 6: Esperar la redirección
         logger.info("5. Esperando redirección...")
-        time.sleep(5)
+        home_page.wait_for_condition(lambda d: d.current_url != previous_url, timeout=10, name="redirect")
+        home_page.wait_for_ui_settled()
+        home_page.record_navigation_metrics(f"footer_{link_id}")
         
         # PASO 7: Tomar SOLO UN SCREENSHOT FINAL
         new_url = driver.current_url
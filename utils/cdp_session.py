@@ -0,0 +1,73 @@
+import logging
+import threading
+
+try:
+    import trio
+except ImportError:  # trio llega con selenium 4; sin él no hay conexión CDP directa
+    trio = None
+
+logger = logging.getLogger(__name__)
+
+
+class CdpSession:
+    """Conexión CDP directa (websocket de bidi_connection) atendida por un hilo de fondo con su propio loop trio"""
+
+    def __init__(self, driver, name="cdp"):
+        self.driver = driver
+        self.name = name
+        self.session = None
+        self.devtools = None
+        self.error = None
+        self._ready = threading.Event()
+        self._thread = None
+        self._token = None
+        self._cancel_scope = None
+
+    @staticmethod
+    def is_supported(driver):
+        """Solo Chromium expone el websocket de DevTools a Selenium"""
+        return trio is not None and hasattr(driver, "execute_cdp_cmd") and hasattr(driver, "bidi_connection")
+
+    def start(self, task, timeout=10):
+        """Abrir la conexión y ejecutar task(session, devtools) en segundo plano; True si quedó conectada"""
+        if not self.is_supported(self.driver):
+            return False
+
+        self._thread = threading.Thread(target=self._run, args=(task,), name=f"cdp-{self.name}", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        return self.session is not None and self.error is None
+
+    def _run(self, task):
+        try:
+            trio.run(self._main, task)
+        except Exception as e:
+            self.error = e
+            logger.warning(f"⚠️  Sesión CDP '{self.name}' terminó con error: {e}")
+        finally:
+            self._ready.set()
+
+    async def _main(self, task):
+        async with self.driver.bidi_connection() as connection:
+            with trio.CancelScope() as scope:
+                self._cancel_scope = scope
+                self._token = trio.lowlevel.current_trio_token()
+                self.session, self.devtools = connection.session, connection.devtools
+                self._ready.set()
+                await task(self.session, self.devtools)
+                # La conexión sigue abierta para execute() hasta que se llame a stop()
+                await trio.sleep_forever()
+
+    def execute(self, command):
+        """Ejecutar un comando CDP (devtools.<dominio>.<comando>(...)) desde otro hilo"""
+        return trio.from_thread.run(self.session.execute, command, trio_token=self._token)
+
+    def stop(self, timeout=5):
+        """Cancelar la tarea de fondo y cerrar el websocket"""
+        if self._token is not None and self._cancel_scope is not None:
+            try:
+                trio.from_thread.run_sync(self._cancel_scope.cancel, trio_token=self._token)
+            except (trio.RunFinishedError, RuntimeError):
+                pass  # El loop ya había terminado (p.ej. el navegador se cerró)
+        if self._thread is not None:
+            self._thread.join(timeout)
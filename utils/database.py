@@ -1,22 +1,114 @@
-import sqlite3
 import os
 from datetime import datetime
 import logging
+from utils.result_sink import ResultSink, connect
 
 logger = logging.getLogger(__name__)
 
+
+# Sentencias de escritura (se reutilizan compiladas gracias a cached_statements)
+INSERT_TEST_RESULT = '''
+    INSERT INTO test_results 
+    (test_case_number, test_case_name, browser, language, status, url, screenshot_path, additional_info)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+UPSERT_TEST_STATS = '''
+    INSERT INTO test_stats (test_case_number, browser, total_tests, passed_tests, failed_tests)
+    VALUES (?, ?, 1, ?, ?)
+    ON CONFLICT(test_case_number, browser) DO UPDATE SET
+        total_tests = total_tests + 1,
+        passed_tests = passed_tests + excluded.passed_tests,
+        failed_tests = failed_tests + excluded.failed_tests,
+        last_execution = CURRENT_TIMESTAMP
+'''
+
+INSERT_CASE6_REDIRECT = '''
+    INSERT INTO case6_redirects 
+    (test_name, browser, language, from_url, to_url, redirect_success, 
+     load_time_seconds, page_title, additional_notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_BENCHMARK_TIMING = '''
+    INSERT INTO benchmark_timings 
+    (run_id, method, browser, round, duration_seconds, success, profile)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+INSERT_BLOCKING_STATS = '''
+    INSERT INTO request_blocking_stats 
+    (test_name, browser, profile, total_requests, blocked_requests, bytes_saved, unknown_sizes)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_NAVIGATION_METRICS = '''
+    INSERT INTO navigation_metrics 
+    (test_name, browser, environment, language, pos, url, source, navigation_type, ttfb_ms, dom_content_loaded_ms,
+     load_event_ms, lcp_ms, cls, transfer_bytes, resource_count, js_heap_bytes, dom_nodes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_STEP_TIMING = '''
+    INSERT INTO step_timings 
+    (run_id, test_name, kind, name, calls, total_seconds, self_seconds, command_seconds, screenshot_seconds,
+     wait_seconds, sleep_seconds)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_ROUNDTRIP_COUNT = '''
+    INSERT INTO roundtrip_counts 
+    (run_id, test_name, kind, name, roundtrips, bytes_sent, bytes_received, budget)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Media móvil exponencial de la duración de cada test (el último run pesa un 30%)
+UPSERT_TEST_DURATION = '''
+    INSERT INTO test_durations (nodeid, browser, seconds, runs) VALUES (?, ?, ?, 1)
+    ON CONFLICT(nodeid, browser) DO UPDATE SET
+        seconds = seconds * 0.7 + excluded.seconds * 0.3,
+        runs = runs + 1,
+        last_execution = CURRENT_TIMESTAMP
+'''
+
+# Varias filas por sentencia: una sola escritura (y un solo mensaje al controlador de xdist) por lote de URLs
+UPSERT_RESOURCE_SIZES = '''
+    INSERT INTO resource_sizes (url, bytes) VALUES {rows}
+    ON CONFLICT(url) DO UPDATE SET bytes = excluded.bytes, last_seen = CURRENT_TIMESTAMP
+'''
+RESOURCE_SIZES_PER_STATEMENT = 400
+
+
 class DatabaseManager:
     """Manejador mejorado de base de datos SQLite"""
     
+    # Archivos cuyo esquema ya se verificó en este proceso
+    _verified_paths = set()
+    
     def __init__(self, db_path="data/test_results.db"):
         self.db_path = db_path
-        self._create_database()
+        if db_path not in DatabaseManager._verified_paths:
+            self._create_database()
+            DatabaseManager._verified_paths.add(db_path)
+        self._reader = None
+    
+    def _read_connection(self):
+        """Conexión de lectura reutilizable; antes se vacían las escrituras pendientes"""
+        ResultSink.flush(self.db_path)
+        if self._reader is None:
+            self._reader = connect(self.db_path)
+        return self._reader
+    
+    def flush(self):
+        """Esperar a que las escrituras encoladas estén en disco"""
+        return ResultSink.flush(self.db_path)
     
     def _create_database(self):
         """Crear la base de datos con estructura mejorada"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         cursor = conn.cursor()
         
         # Tabla principal de resultados
@@ -66,87 +158,306 @@ class DatabaseManager:
             )
         ''')
         
+        # Tiempos de los page objects contra el sitio sintético (benchmark)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS benchmark_timings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                method TEXT NOT NULL,
+                browser TEXT NOT NULL,
+                round INTEGER NOT NULL,
+                duration_seconds REAL NOT NULL,
+                success BOOLEAN NOT NULL,
+                profile TEXT,
+                execution_time DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_benchmark_method_time ON benchmark_timings (method, execution_time)
+        ''')
+        
+        # Peticiones bloqueadas por test (perfil de bloqueo del fixture browser)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS request_blocking_stats (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                test_name TEXT NOT NULL,
+                browser TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                total_requests INTEGER NOT NULL,
+                blocked_requests INTEGER NOT NULL,
+                bytes_saved INTEGER NOT NULL,
+                unknown_sizes INTEGER DEFAULT 0,
+                execution_time DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Tamaño transferido de cada recurso (para estimar los bytes ahorrados al bloquearlo)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS resource_sizes (
+                url TEXT PRIMARY KEY,
+                bytes INTEGER NOT NULL,
+                last_seen DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Métricas del navegador por navegación (navigate_to y flujos de header/footer)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS navigation_metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                test_name TEXT,
+                browser TEXT NOT NULL,
+                environment TEXT NOT NULL,
+                language TEXT NOT NULL,
+                pos TEXT,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                navigation_type TEXT,
+                ttfb_ms REAL,
+                dom_content_loaded_ms REAL,
+                load_event_ms REAL,
+                lcp_ms REAL,
+                cls REAL,
+                transfer_bytes INTEGER,
+                resource_count INTEGER,
+                js_heap_bytes INTEGER,
+                dom_nodes INTEGER,
+                execution_time DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_navigation_metrics_context 
+            ON navigation_metrics (environment, language, pos, url, execution_time)
+        ''')
+        
+        # Desglose del tiempo por test, paso de Allure y método de page object (StepTimer)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS step_timings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                test_name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                calls INTEGER NOT NULL,
+                total_seconds REAL NOT NULL,
+                self_seconds REAL NOT NULL,
+                command_seconds REAL DEFAULT 0,
+                screenshot_seconds REAL DEFAULT 0,
+                wait_seconds REAL DEFAULT 0,
+                sleep_seconds REAL DEFAULT 0,
+                execution_time DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_step_timings_run ON step_timings (run_id, kind, name)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_step_timings_name_time ON step_timings (kind, name, execution_time)
+        ''')
+        
+        # Viajes al WebDriver por test y por método de page object (RoundTripCounter)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS roundtrip_counts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                test_name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                roundtrips INTEGER NOT NULL,
+                bytes_sent INTEGER DEFAULT 0,
+                bytes_received INTEGER DEFAULT 0,
+                budget INTEGER,
+                execution_time DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_roundtrip_counts_run ON roundtrip_counts (run_id, kind, name)
+        ''')
+        
+        # Duración histórica de cada test para repartirlos entre workers de xdist (LPTScheduling)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS test_durations (
+                nodeid TEXT NOT NULL,
+                browser TEXT NOT NULL,
+                seconds REAL NOT NULL,
+                runs INTEGER NOT NULL DEFAULT 1,
+                last_execution DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (nodeid, browser)
+            )
+        ''')
+        
         conn.commit()
         conn.close()
         logger.info(f"✅ Base de datos verificada en: {self.db_path}")
     
     def save_test_result(self, test_case_number, test_case_name, browser, language, status, 
                         url="", screenshot_path="", additional_info=""):
-        """Guardar resultado de test con estructura mejorada"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        """Guardar resultado de test con estructura mejorada (escritura en lote)"""
         # Insertar resultado
-        cursor.execute('''
-            INSERT INTO test_results 
-            (test_case_number, test_case_name, browser, language, status, url, screenshot_path, additional_info)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (test_case_number, test_case_name, browser, language, status, url, screenshot_path, additional_info))
+        ResultSink.write(self.db_path, INSERT_TEST_RESULT, (
+            test_case_number, test_case_name, browser, language, status, url, screenshot_path, additional_info
+        ))
         
-        # Actualizar estadísticas
-        self._update_stats(cursor, test_case_number, browser, status)
+        # Actualizar estadísticas (UPSERT: sin lectura previa)
+        ResultSink.write(self.db_path, UPSERT_TEST_STATS, (
+            test_case_number, browser, 1 if status == "PASS" else 0, 1 if status == "FAIL" else 0
+        ))
         
-        conn.commit()
-        conn.close()
-        logger.info(f"✅ Resultado guardado: Caso {test_case_number} - {browser} - {language} - {status}")
-    
-    def _update_stats(self, cursor, test_case_number, browser, status):
-        """Actualizar estadísticas del test case"""
-        # Verificar si ya existe estadística para este caso y navegador
-        cursor.execute('''
-            SELECT total_tests, passed_tests, failed_tests 
-            FROM test_stats 
-            WHERE test_case_number = ? AND browser = ?
-        ''', (test_case_number, browser))
-        
-        result = cursor.fetchone()
-        
-        if result:
-            # Actualizar estadística existente
-            total, passed, failed = result
-            total += 1
-            passed += 1 if status == "PASS" else 0
-            failed += 1 if status == "FAIL" else 0
-            
-            cursor.execute('''
-                UPDATE test_stats 
-                SET total_tests = ?, passed_tests = ?, failed_tests = ?, last_execution = CURRENT_TIMESTAMP
-                WHERE test_case_number = ? AND browser = ?
-            ''', (total, passed, failed, test_case_number, browser))
-        else:
-            # Crear nueva estadística
-            passed = 1 if status == "PASS" else 0
-            failed = 1 if status == "FAIL" else 0
-            
-            cursor.execute('''
-                INSERT INTO test_stats 
-                (test_case_number, browser, total_tests, passed_tests, failed_tests)
-                VALUES (?, ?, 1, ?, ?)
-            ''', (test_case_number, browser, passed, failed))
+        logger.info(f"✅ Resultado registrado: Caso {test_case_number} - {browser} - {language} - {status}")
     
     # NUEVO MÉTODO: Guardar datos específicos del Caso 6
     def save_case6_redirect(self, test_name, browser, language, from_url, to_url, 
                            redirect_success, load_time_seconds=None, page_title=None, additional_notes=""):
         """Guardar datos específicos de redirecciones del Caso 6"""
-        conn = sqlite3.connect(self.db_path)
+        ResultSink.write(self.db_path, INSERT_CASE6_REDIRECT, (
+            test_name, browser, language, from_url, to_url, redirect_success, 
+            load_time_seconds, page_title, additional_notes
+        ))
+        
+        logger.info(f"✅ Redirección Caso 6 registrada: {test_name} - {browser} - {language}")
+    
+    def save_benchmark_timing(self, run_id, method, browser, round_number, duration_seconds, success, profile=""):
+        """Guardar el tiempo de una ejecución de un método de page object en el benchmark"""
+        ResultSink.write(self.db_path, INSERT_BENCHMARK_TIMING, (
+            run_id, method, browser, round_number, duration_seconds, success, profile
+        ))
+    
+    def save_blocking_stats(self, test_name, browser, stats, resource_sizes=None):
+        """Guardar las peticiones bloqueadas de un test y los tamaños de recursos nuevos o cambiados"""
+        ResultSink.write(self.db_path, INSERT_BLOCKING_STATS, (
+            test_name, browser, stats["profile"], stats["total_requests"], stats["blocked_requests"],
+            stats["bytes_saved"], stats["unknown_sizes"]
+        ))
+        sizes = list((resource_sizes or {}).items())
+        for start in range(0, len(sizes), RESOURCE_SIZES_PER_STATEMENT):
+            chunk = sizes[start:start + RESOURCE_SIZES_PER_STATEMENT]
+            sql = UPSERT_RESOURCE_SIZES.format(rows=", ".join(["(?, ?)"] * len(chunk)))
+            ResultSink.write(self.db_path, sql, [value for row in chunk for value in row])
+    
+    def save_navigation_metrics(self, metrics):
+        """Guardar las métricas de rendimiento de una navegación (WebMetrics.collect)"""
+        ResultSink.write(self.db_path, INSERT_NAVIGATION_METRICS, (
+            metrics["test_name"], metrics["browser"], metrics["environment"], metrics["language"], metrics["pos"],
+            metrics["url"], metrics["source"], metrics["navigation_type"], metrics["ttfb_ms"],
+            metrics["dom_content_loaded_ms"], metrics["load_event_ms"], metrics["lcp_ms"], metrics["cls"],
+            metrics["transfer_bytes"], metrics["resource_count"], metrics.get("js_heap_bytes"), metrics.get("dom_nodes")
+        ))
+    
+    def get_navigation_summary(self, environment=None, days=7):
+        """Medias por entorno/idioma/URL de los últimos días: navegaciones, TTFB, LCP, CLS, KB transferidos"""
+        conn = self._read_connection()
         cursor = conn.cursor()
         
+        query = '''
+            SELECT environment, language, url, COUNT(*), AVG(ttfb_ms), AVG(lcp_ms), AVG(cls), AVG(transfer_bytes) / 1024
+            FROM navigation_metrics
+            WHERE execution_time >= datetime('now', ?)
+        '''
+        params = [f"-{days} days"]
+        if environment:
+            query += " AND environment = ?"
+            params.append(environment)
+        query += " GROUP BY environment, language, url ORDER BY AVG(lcp_ms) DESC"
+        
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    
+    def save_step_timings(self, run_id, rows):
+        """Guardar el desglose de tiempo de un test (StepTimer.finish_test)"""
+        for row in rows:
+            ResultSink.write(self.db_path, INSERT_STEP_TIMING, (
+                run_id, row["test_name"], row["kind"], row["name"], row["calls"], row["total"], row["self"],
+                row["command"], row["screenshot"], row["wait"], row["sleep"]
+            ))
+    
+    def get_step_timing_report(self, run_id, kind="method", limit=15):
+        """Los más costosos de una ejecución: nombre, llamadas, total, comandos, screenshots, esperas, sleeps"""
+        conn = self._read_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT name, SUM(calls), SUM(total_seconds), SUM(command_seconds), SUM(screenshot_seconds),
+                   SUM(wait_seconds), SUM(sleep_seconds), SUM(self_seconds)
+            FROM step_timings
+            WHERE run_id = ? AND kind = ?
+            GROUP BY name
+            ORDER BY SUM(total_seconds) DESC
+            LIMIT ?
+        ''', (run_id, kind, limit))
+        return cursor.fetchall()
+    
+    def save_roundtrip_counts(self, run_id, rows):
+        """Guardar los viajes al WebDriver de un test (RoundTripCounter.finish_test)"""
+        for row in rows:
+            ResultSink.write(self.db_path, INSERT_ROUNDTRIP_COUNT, (
+                run_id, row["test_name"], row["kind"], row["name"], row["roundtrips"], row["sent"], row["received"],
+                row["budget"]
+            ))
+    
+    def get_roundtrip_report(self, run_id, kind="method", limit=15):
+        """Los más conversadores de una ejecución: nombre, tests, viajes, bytes enviados, bytes recibidos"""
+        conn = self._read_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT name, COUNT(DISTINCT test_name), SUM(roundtrips), SUM(bytes_sent), SUM(bytes_received)
+            FROM roundtrip_counts
+            WHERE run_id = ? AND kind = ?
+            GROUP BY name
+            ORDER BY SUM(roundtrips) DESC
+            LIMIT ?
+        ''', (run_id, kind, limit))
+        return cursor.fetchall()
+    
+    def save_test_duration(self, nodeid, browser, seconds):
+        """Actualizar la duración histórica de un test que pasó"""
+        ResultSink.write(self.db_path, UPSERT_TEST_DURATION, (nodeid, browser, seconds))
+    
+    def get_test_durations(self, browser):
+        """Duración esperada {nodeid: segundos} de los tests ya ejecutados en un navegador"""
+        conn = self._read_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT nodeid, seconds FROM test_durations WHERE browser = ?", (browser,))
+        return dict(cursor.fetchall())
+    
+    def get_resource_sizes(self):
+        """Tamaños conocidos de recursos {url: bytes}"""
+        conn = self._read_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT url, bytes FROM resource_sizes")
+        return dict(cursor.fetchall())
+    
+    def get_blocking_summary(self):
+        """Peticiones y bytes ahorrados por perfil de bloqueo"""
+        conn = self._read_connection()
+        cursor = conn.cursor()
         cursor.execute('''
-            INSERT INTO case6_redirects 
-            (test_name, browser, language, from_url, to_url, redirect_success, 
-             load_time_seconds, page_title, additional_notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (test_name, browser, language, from_url, to_url, redirect_success, 
-              load_time_seconds, page_title, additional_notes))
+            SELECT profile, COUNT(*), SUM(blocked_requests), SUM(total_requests), SUM(bytes_saved)
+            FROM request_blocking_stats
+            GROUP BY profile
+        ''')
+        return cursor.fetchall()
+    
+    def get_benchmark_summary(self, run_id=None):
+        """Tiempos por método (ejecuciones, media, mínimo, máximo, éxitos), de una ejecución o de todas"""
+        conn = self._read_connection()
+        cursor = conn.cursor()
         
-        conn.commit()
-        conn.close()
-        logger.info(f"✅ Redirección Caso 6 guardada: {test_name} - {browser} - {language}")
+        query = '''
+            SELECT method, COUNT(*), AVG(duration_seconds), MIN(duration_seconds), MAX(duration_seconds),
+                   SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END)
+            FROM benchmark_timings
+        '''
+        params = []
+        if run_id:
+            query += " WHERE run_id = ?"
+            params.append(run_id)
+        query += " GROUP BY method ORDER BY AVG(duration_seconds) DESC"
+        
+        cursor.execute(query, params)
+        return cursor.fetchall()
     
     # NUEVO MÉTODO: Obtener redirecciones del Caso 6
     def get_case6_redirects(self, browser=None, language=None):
         """Obtener redirecciones del Caso 6 con filtros opcionales"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._read_connection()
         cursor = conn.cursor()
         
         query = "SELECT * FROM case6_redirects"
@@ -167,12 +478,11 @@ class DatabaseManager:
         
         cursor.execute(query, params)
         results = cursor.fetchall()
-        conn.close()
         return results
     
     def get_test_results(self, test_case_number=None, browser=None):
         """Obtener resultados filtrados"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._read_connection()
         cursor = conn.cursor()
         
         query = "SELECT * FROM test_results"
@@ -192,12 +502,11 @@ class DatabaseManager:
         
         cursor.execute(query, params)
         results = cursor.fetchall()
-        conn.close()
         return results
     
     def get_test_stats(self, test_case_number=None):
         """Obtener estadísticas de tests"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._read_connection()
         cursor = conn.cursor()
         
         if test_case_number:
@@ -208,13 +517,12 @@ class DatabaseManager:
             cursor.execute('SELECT * FROM test_stats ORDER BY last_execution DESC')
         
         stats = cursor.fetchall()
-        conn.close()
         return stats
     
     # NUEVO MÉTODO: Estadísticas específicas del Caso 6
     def get_case6_stats(self):
         """Obtener estadísticas específicas del Caso 6"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._read_connection()
         cursor = conn.cursor()
         
         # Estadísticas por navegador
@@ -248,7 +556,6 @@ class DatabaseManager:
         ''')
         test_stats = cursor.fetchall()
         
-        conn.close()
         
         return {
             'browser_stats': browser_stats,
@@ -302,7 +609,8 @@ class DatabaseManager:
     # NUEVO MÉTODO: Limpiar datos antiguos (opcional)
     def cleanup_old_data(self, days_old=30):
         """Eliminar datos más antiguos que X días"""
-        conn = sqlite3.connect(self.db_path)
+        ResultSink.flush(self.db_path)
+        conn = connect(self.db_path)
         cursor = conn.cursor()
         
         cutoff_date = f"datetime('now', '-{days_old} days')"
@@ -315,6 +623,11 @@ class DatabaseManager:
         cursor.execute(f'DELETE FROM case6_redirects WHERE execution_time < {cutoff_date}')
         deleted_redirects = cursor.rowcount
         
+        # Eliminar métricas de navegación, desgloses de tiempo y conteos de viajes
+        cursor.execute(f'DELETE FROM navigation_metrics WHERE execution_time < {cutoff_date}')
+        cursor.execute(f'DELETE FROM step_timings WHERE execution_time < {cutoff_date}')
+        cursor.execute(f'DELETE FROM roundtrip_counts WHERE execution_time < {cutoff_date}')
+        
         conn.commit()
         conn.close()
         
@@ -0,0 +1,132 @@
+import os
+import logging
+from urllib.parse import urlparse
+from utils.network_capture import NetworkCapture
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPool:
+    """Pool de navegadores reutilizables por worker de xdist (un pool por proceso)"""
+
+    # Tipos de almacenamiento que se limpian por origen vía CDP entre tests
+    STORAGE_TYPES = "local_storage,indexeddb,websql,service_workers,cache_storage,file_systems"
+
+    def __init__(self, factory, max_uses=25, reset_url="about:blank"):
+        self.factory = factory
+        self.max_uses = max_uses
+        self.reset_url = reset_url
+        self.worker_id = os.environ.get("PYTEST_XDIST_WORKER", "master")
+        self._idle = []
+        self._uses = {}
+        self.created = 0
+        self.recycled = 0
+
+    def acquire(self):
+        """Entregar un driver caliente (o crear uno nuevo si no hay ninguno sano)"""
+        while self._idle:
+            driver = self._idle.pop()
+            if self.is_healthy(driver):
+                self._uses[driver] += 1
+                logger.info(f"♻️  [{self.worker_id}] Reutilizando driver (uso {self._uses[driver]}/{self.max_uses})")
+                return driver
+            logger.warning(f"⚠️  [{self.worker_id}] Driver caído detectado, reciclando")
+            self._discard(driver)
+
+        driver = self.factory()
+        self._uses[driver] = 1
+        self.created += 1
+        logger.info(f"🚀 [{self.worker_id}] Nuevo driver creado (total creados: {self.created})")
+        return driver
+
+    def release(self, driver, discard=False):
+        """Devolver un driver al pool, limpio, o reciclarlo si ya no sirve"""
+        if driver is None:
+            return
+
+        if discard or self._uses.get(driver, 0) >= self.max_uses:
+            logger.info(f"🔁 [{self.worker_id}] Reciclando driver tras {self._uses.get(driver, 0)} usos")
+            self._discard(driver)
+            return
+
+        # Un chromedriver caído no lanza WebDriverException sino errores de urllib3 (MaxRetryError, ConnectionError)
+        try:
+            self.reset_state(driver)
+            self._idle.append(driver)
+        except Exception as e:
+            logger.warning(f"⚠️  [{self.worker_id}] No se pudo limpiar el driver, reciclando: {e}")
+            self._discard(driver)
+
+    def reset_state(self, driver):
+        """Dejar el navegador como recién abierto: sin cookies, sin storage, una sola pestaña en blanco"""
+        original_handles = driver.window_handles
+        is_chrome = hasattr(driver, "execute_cdp_cmd")
+
+        # Recolectar los orígenes visitados en cada pestaña para limpiar su storage
+        origins = set()
+        for handle in original_handles:
+            driver.switch_to.window(handle)
+            if is_chrome:
+                history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+                urls = [entry.get("url", "") for entry in history.get("entries", [])]
+            else:
+                urls = [driver.current_url]
+                driver.delete_all_cookies()
+                driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            for url in urls:
+                parsed = urlparse(url)
+                if parsed.scheme in ("http", "https"):
+                    origins.add(f"{parsed.scheme}://{parsed.netloc}")
+
+        if is_chrome:
+            # delete_all_cookies solo borra las del dominio actual; CDP borra todas
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in origins:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": origin,
+                    "storageTypes": self.STORAGE_TYPES
+                })
+
+        # Una pestaña nueva no hereda sessionStorage ni historial
+        driver.switch_to.new_window("tab")
+        fresh_handle = driver.current_window_handle
+        for handle in original_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh_handle)
+
+        if self.reset_url != "about:blank":
+            driver.get(self.reset_url)
+
+        # Los eventos de red del test anterior no deben contaminar el siguiente
+        NetworkCapture.reset_for_driver(driver)
+
+        logger.info(f"🧹 [{self.worker_id}] Driver limpio ({len(origins)} orígenes, {len(original_handles)} pestañas cerradas)")
+
+    def is_healthy(self, driver):
+        """Verificar que la sesión del driver sigue respondiendo"""
+        try:
+            driver.current_window_handle
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        """Cerrar un driver sin propagar errores (puede estar ya caído)"""
+        self._uses.pop(driver, None)
+        self.recycled += 1
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error cerrando driver reciclado: {e}")
+
+    def close_all(self):
+        """Cerrar todos los drivers del pool al final de la sesión"""
+        while self._idle:
+            driver = self._idle.pop()
+            self._uses.pop(driver, None)
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Error cerrando driver del pool: {e}")
+        logger.info(f"🔴 [{self.worker_id}] Pool cerrado - creados: {self.created}, reciclados: {self.recycled}")
@@ -0,0 +1,63 @@
+import re
+import logging
+from statistics import median
+
+logger = logging.getLogger(__name__)
+
+
+class DurationHistory:
+    """Duraciones reales de cada test (tabla test_durations) y estimación para los que nunca se ejecutaron"""
+
+    # Estimación cuando no hay ningún dato del navegador (s)
+    DEFAULT_SECONDS = 60.0
+
+    # Registro del proceso controlador (o del único proceso sin xdist); los workers no registran
+    active = None
+
+    def __init__(self, browser, db=None):
+        from utils.database import DatabaseManager
+
+        self.browser = browser
+        self.db = db or DatabaseManager()
+        self._phases = {}
+
+    @staticmethod
+    def _function_id(nodeid):
+        """Nodeid sin parámetros: tests/test_case_7.py::TestFooter::test_link[es-x] -> ...::test_link"""
+        return re.sub(r"\[.*\]$", "", nodeid)
+
+    # ===== ESTIMACIÓN =====
+
+    def estimates(self, nodeids):
+        """Segundos esperados por nodeid: histórico propio, si no media de sus variantes, de su módulo o de todo"""
+        known = self.db.get_test_durations(self.browser)
+        by_function, by_module = {}, {}
+        for nodeid, seconds in known.items():
+            by_function.setdefault(self._function_id(nodeid), []).append(seconds)
+            by_module.setdefault(nodeid.split("::")[0], []).append(seconds)
+        overall = median(known.values()) if known else self.DEFAULT_SECONDS
+
+        estimates, unseen = {}, 0
+        for nodeid in nodeids:
+            if nodeid in known:
+                estimates[nodeid] = known[nodeid]
+                continue
+            unseen += 1
+            similar = by_function.get(self._function_id(nodeid)) or by_module.get(nodeid.split("::")[0])
+            estimates[nodeid] = median(similar) if similar else overall
+        logger.info(f"⏳ Duraciones históricas: {len(nodeids) - unseen} tests conocidos, {unseen} estimados")
+        return estimates
+
+    # ===== REGISTRO =====
+
+    def record(self, report):
+        """Sumar las fases de un reporte; al llegar el teardown se guarda la duración total del test"""
+        phases = self._phases.setdefault(report.nodeid, [])
+        phases.append(report)
+        if report.when != "teardown":
+            return
+        del self._phases[report.nodeid]
+        # Un test saltado no dice nada de cuánto tarda, y uno fallido suele abortar a mitad del recorrido
+        if any(phase.skipped or phase.failed for phase in phases):
+            return
+        self.db.save_test_duration(report.nodeid, self.browser, sum(phase.duration for phase in phases))
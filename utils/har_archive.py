@@ -0,0 +1,231 @@
+import os
+import json
+import mmap
+import base64
+import hashlib
+import logging
+import threading
+from urllib.parse import urljoin
+from utils.cdp_session import CdpSession
+
+logger = logging.getLogger(__name__)
+
+
+class HarArchive:
+    """Archivo de respuestas grabadas: índice JSON + cuerpos deduplicados por SHA-256 en un blob de solo-anexar"""
+
+    # Cabeceras que dejan de ser ciertas al servir el cuerpo ya decodificado desde el archivo
+    DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+    def __init__(self, archive_dir="data/har", segment=None):
+        self.archive_dir = archive_dir
+        # Cada proceso (worker de xdist) graba su propio segmento; en replay se cargan todos
+        self.segment = segment or os.environ.get("PYTEST_XDIST_WORKER", "master")
+        self.entries = {}
+        self._maps = {}
+        self._lock = threading.Lock()
+        self._writer = None
+        self._offsets = {}
+        self.recorded = 0
+        self.deduplicated = 0
+        os.makedirs(archive_dir, exist_ok=True)
+
+    @staticmethod
+    def request_key(method, url, post_data=None):
+        """Clave estable de una petición: método + URL sin fragmento (+ hash del cuerpo si lo hay)"""
+        key = f"{method.upper()} {url.split('#')[0]}"
+        if post_data:
+            key += " " + hashlib.sha1(post_data.encode("utf-8", "surrogatepass")).hexdigest()
+        return key
+
+    @staticmethod
+    def clear(archive_dir):
+        """Borrar los segmentos de grabaciones anteriores (un run con más workers dejaría segmentos huérfanos)"""
+        if not os.path.isdir(archive_dir):
+            return 0
+        removed = 0
+        for name in os.listdir(archive_dir):
+            if name.startswith("segment-") and name.endswith((".json", ".bin")):
+                os.remove(os.path.join(archive_dir, name))
+                removed += 1
+        return removed
+
+    def _paths(self, segment):
+        return (os.path.join(self.archive_dir, f"segment-{segment}.json"),
+                os.path.join(self.archive_dir, f"segment-{segment}.bin"))
+
+    # ===== GRABACIÓN =====
+
+    def add(self, method, url, post_data, status, headers, body):
+        """Guardar una respuesta; el cuerpo solo se escribe si su contenido no estaba ya en el segmento"""
+        digest = hashlib.sha256(body).hexdigest()
+        headers = [(name, value) for name, value in headers if name.lower() not in self.DROPPED_HEADERS]
+        # Las redirecciones se reproducen con Fetch.fulfillRequest: el destino debe ser absoluto
+        headers = [(name, urljoin(url, value) if name.lower() == "location" else value) for name, value in headers]
+        key = self.request_key(method, url, post_data)
+
+        with self._lock:
+            if self._writer is None:
+                # Cada grabación sustituye al segmento anterior del mismo proceso
+                _, blob_path = self._paths(self.segment)
+                self._writer = open(blob_path, "wb")
+            if digest in self._offsets:
+                self.deduplicated += 1
+            else:
+                self._offsets[digest] = (self._writer.tell(), len(body))
+                self._writer.write(body)
+            offset, length = self._offsets[digest]
+
+            self.entries.setdefault(key, []).append({
+                "status": status,
+                "headers": headers,
+                "sha256": digest,
+                "segment": self.segment,
+                "offset": offset,
+                "length": length
+            })
+            self.recorded += 1
+
+    def save(self):
+        """Volcar el índice del segmento propio (el blob ya está en disco)"""
+        with self._lock:
+            if self._writer is None:
+                return
+            self._writer.flush()
+            index_path, _ = self._paths(self.segment)
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self.entries}, f)
+            logger.info(f"💾 Archivo HAR guardado: {self.recorded} respuestas, {self.deduplicated} cuerpos deduplicados ({index_path})")
+
+    # ===== REPRODUCCIÓN =====
+
+    def open_for_replay(self):
+        """Cargar todos los segmentos y mapear sus blobs en memoria; devuelve el número de claves"""
+        for name in sorted(os.listdir(self.archive_dir)):
+            if not (name.startswith("segment-") and name.endswith(".json")):
+                continue
+            segment = name[len("segment-"):-len(".json")]
+            index_path, blob_path = self._paths(segment)
+            with open(index_path, encoding="utf-8") as f:
+                for key, responses in json.load(f)["entries"].items():
+                    self.entries.setdefault(key, []).extend(responses)
+            if os.path.getsize(blob_path) > 0:
+                with open(blob_path, "rb") as blob:
+                    self._maps[segment] = mmap.mmap(blob.fileno(), 0, access=mmap.ACCESS_READ)
+        logger.info(f"📼 Archivo HAR cargado: {len(self.entries)} peticiones de {len(self._maps)} segmentos")
+        return len(self.entries)
+
+    def body(self, entry):
+        """Vista sin copia del cuerpo dentro del blob mapeado"""
+        if entry["length"] == 0:
+            return memoryview(b"")
+        return memoryview(self._maps[entry["segment"]])[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def body_base64(self, entry):
+        """Cuerpo codificado para Fetch.fulfillRequest"""
+        return base64.b64encode(self.body(entry)).decode("ascii")
+
+    def close(self):
+        """Cerrar el blob de escritura y los mapas de memoria"""
+        self.save()
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+
+class HarSession:
+    """Intercepción CDP Fetch de un driver: grabar respuestas o servirlas desde el archivo"""
+
+    MODES = ("off", "record", "replay")
+
+    def __init__(self, driver, mode, archive):
+        self.driver = driver
+        self.mode = mode
+        self.archive = archive
+        self.cdp = None
+        self.hits = 0
+        self.misses = 0
+        # Respuestas ya servidas por clave: cada test empieza por la primera grabada
+        self._served = {}
+
+    @classmethod
+    def attach(cls, driver, mode, archive):
+        """Empezar a grabar/reproducir en un driver; None si el modo es off o el navegador no tiene CDP"""
+        if mode == "off" or archive is None:
+            return None
+        session = cls(driver, mode, archive)
+        session.cdp = CdpSession(driver, name=f"har-{mode}")
+        task = session._record if mode == "record" else session._replay
+        if not session.cdp.start(task):
+            logger.warning(f"⚠️  HAR {mode} no disponible ({session.cdp.error or 'navegador sin CDP'}), usando red real")
+            return None
+        return session
+
+    def next_response(self, key):
+        """Siguiente respuesta grabada para la clave (la última se repite cuando se agotan)"""
+        responses = self.archive.entries[key]
+        index = self._served.get(key, 0)
+        self._served[key] = index + 1
+        return responses[min(index, len(responses) - 1)]
+
+    async def _record(self, session, devtools):
+        """Pausar cada respuesta, leer su cuerpo y guardarlo antes de dejarla continuar"""
+        fetch = devtools.fetch
+        paused = session.listen(fetch.RequestPaused, buffer_size=1000)
+        await session.execute(fetch.enable(patterns=[fetch.RequestPattern(url_pattern="*", request_stage=fetch.RequestStage.RESPONSE)]))
+        async for event in paused:
+            try:
+                body = b""
+                status = event.response_status_code or 0
+                if not 300 <= status < 400:
+                    data, is_base64 = await session.execute(fetch.get_response_body(event.request_id))
+                    body = base64.b64decode(data) if is_base64 else data.encode("utf-8")
+                headers = [(h.name, h.value) for h in event.response_headers or []]
+                self.archive.add(event.request.method, event.request.url, event.request.post_data, status, headers, body)
+            except Exception as e:
+                logger.debug(f"No se pudo grabar {event.request.url}: {e}")
+            try:
+                await session.execute(fetch.continue_request(event.request_id))
+            except Exception as e:
+                logger.debug(f"No se pudo continuar {event.request.url}: {e}")
+
+    async def _replay(self, session, devtools):
+        """Responder cada petición grabada desde el archivo (Fetch.fulfillRequest); las demás fallan"""
+        fetch = devtools.fetch
+        paused = session.listen(fetch.RequestPaused, buffer_size=1000)
+        await session.execute(fetch.enable(patterns=[fetch.RequestPattern(url_pattern="*")]))
+        async for event in paused:
+            key = HarArchive.request_key(event.request.method, event.request.url, event.request.post_data)
+            try:
+                if key in self.archive.entries:
+                    entry = self.next_response(key)
+                    headers = [fetch.HeaderEntry(name=name, value=value) for name, value in entry["headers"]]
+                    await session.execute(fetch.fulfill_request(event.request_id, response_code=entry["status"],
+                                                                response_headers=headers,
+                                                                body=self.archive.body_base64(entry)))
+                    self.hits += 1
+                else:
+                    # Ejecución determinista sin red: lo no grabado no sale a internet
+                    self.misses += 1
+                    logger.debug(f"Replay sin grabación: {key}")
+                    await session.execute(fetch.fail_request(event.request_id, devtools.network.ErrorReason.INTERNET_DISCONNECTED))
+            except Exception as e:
+                # Un evento fallido (petición cancelada, pestaña cerrada...) no debe detener la intercepción
+                logger.debug(f"No se pudo reproducir {event.request.url}: {e}")
+
+    def detach(self):
+        """Dejar de interceptar (antes de devolver el driver al pool)"""
+        try:
+            self.cdp.execute(self.cdp.devtools.fetch.disable())
+        except Exception as e:
+            logger.debug(f"No se pudo desactivar Fetch: {e}")
+        self.cdp.stop()
+        if self.mode == "record":
+            self.archive.save()
+            print(f"📼 HAR grabado: {self.archive.recorded} respuestas ({self.archive.deduplicated} cuerpos deduplicados)")
+        else:
+            print(f"📼 HAR replay: {self.hits} servidas localmente, {self.misses} sin grabación")
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import logging
+from datetime import datetime
+from urllib.parse import urlparse
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class LocatorCache:
+    """Caché persistente de qué estrategia de localización funcionó, por página, localizador, entorno e idioma"""
+
+    # Fallos consecutivos a partir de los cuales una estrategia se considera muerta
+    DEMOTE_AFTER = 3
+
+    _shared = {}
+
+    def __init__(self, db_path=Config.LOCATOR_CACHE_PATH):
+        self.db_path = db_path
+        self._create_database()
+
+    @classmethod
+    def shared(cls, db_path=Config.LOCATOR_CACHE_PATH):
+        """Obtener la instancia compartida para una ruta (una por proceso)"""
+        if db_path not in cls._shared:
+            cls._shared[db_path] = cls(db_path)
+        return cls._shared[db_path]
+
+    def _connect(self):
+        # Varios workers de xdist escriben a la vez: esperar el lock en lugar de fallar
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _create_database(self):
+        """Crear la tabla de estadísticas por estrategia"""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS locator_strategies (
+                page TEXT NOT NULL,
+                locator_name TEXT NOT NULL,
+                environment TEXT NOT NULL,
+                language TEXT NOT NULL,
+                strategy TEXT NOT NULL,
+                successes INTEGER DEFAULT 0,
+                failures INTEGER DEFAULT 0,
+                consecutive_failures INTEGER DEFAULT 0,
+                last_success DATETIME,
+                last_failure DATETIME,
+                PRIMARY KEY (page, locator_name, environment, language, strategy)
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def context_from_url(url):
+        """Extraer (entorno, idioma) de una URL, p.ej. https://nuxqa4.avtest.ink/es/ -> ('nuxqa4', 'es')"""
+        parsed = urlparse(url or "")
+        environment = parsed.hostname.split(".")[0] if parsed.hostname else "unknown"
+        segments = [s for s in parsed.path.split("/") if s]
+        language = segments[0].lower() if segments and len(segments[0]) == 2 else "default"
+        return environment, language
+
+    @staticmethod
+    def strategy_key(locator):
+        """Clave estable de una estrategia (By, valor)"""
+        by, value = locator
+        return f"{by}={value}"
+
+    def rank(self, page, locator_name, environment, language, locators):
+        """Ordenar las estrategias: último ganador primero, las muertas al final; devuelve (vivas, muertas)"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT strategy, consecutive_failures, last_success
+            FROM locator_strategies
+            WHERE page = ? AND locator_name = ? AND environment = ? AND language = ?
+        ''', (page, locator_name, environment, language))
+        stats = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        conn.close()
+
+        def sort_key(indexed):
+            index, locator = indexed
+            consecutive_failures, last_success = stats.get(self.strategy_key(locator), (0, None))
+            # Más reciente primero; las estrategias sin historial mantienen el orden declarado
+            recency = -datetime.fromisoformat(last_success).timestamp() if last_success else 0
+            return (last_success is None, recency, index)
+
+        ordered = [locator for _, locator in sorted(enumerate(locators), key=sort_key)]
+        alive = [l for l in ordered if stats.get(self.strategy_key(l), (0, None))[0] < self.DEMOTE_AFTER]
+        dead = [l for l in ordered if l not in alive]
+        return alive, dead
+
+    def record(self, page, locator_name, environment, language, winner=None, failed=()):
+        """Registrar el resultado de una búsqueda: la estrategia ganadora y las que no encontraron nada"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        key = (page, locator_name, environment, language)
+
+        for locator in failed:
+            cursor.execute('''
+                INSERT INTO locator_strategies
+                (page, locator_name, environment, language, strategy, failures, consecutive_failures, last_failure)
+                VALUES (?, ?, ?, ?, ?, 1, 1, CURRENT_TIMESTAMP)
+                ON CONFLICT(page, locator_name, environment, language, strategy) DO UPDATE SET
+                    failures = failures + 1,
+                    consecutive_failures = consecutive_failures + 1,
+                    last_failure = CURRENT_TIMESTAMP
+            ''', (*key, self.strategy_key(locator)))
+
+        if winner is not None:
+            cursor.execute('''
+                INSERT INTO locator_strategies
+                (page, locator_name, environment, language, strategy, successes, last_success)
+                VALUES (?, ?, ?, ?, ?, 1, strftime('%Y-%m-%d %H:%M:%f', 'now'))
+                ON CONFLICT(page, locator_name, environment, language, strategy) DO UPDATE SET
+                    successes = successes + 1,
+                    consecutive_failures = 0,
+                    last_success = strftime('%Y-%m-%d %H:%M:%f', 'now')
+            ''', (*key, self.strategy_key(winner)))
+
+        conn.commit()
+        conn.close()
+
+    def forget(self, page=None, locator_name=None):
+        """Borrar el historial (de una página/localizador o completo)"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        query = "DELETE FROM locator_strategies"
+        conditions, params = [], []
+        if page:
+            conditions.append("page = ?")
+            params.append(page)
+        if locator_name:
+            conditions.append("locator_name = ?")
+            params.append(locator_name)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        cursor.execute(query, params)
+        conn.commit()
+        conn.close()
+
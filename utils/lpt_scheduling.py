@@ -0,0 +1,62 @@
+import logging
+from xdist.scheduler import LoadScheduling
+
+logger = logging.getLogger(__name__)
+
+
+class LPTScheduling(LoadScheduling):
+    """Reparto de xdist por duración histórica: primero los tests más largos, al primer worker que quede libre"""
+
+    # Tests encolados por worker: el worker necesita conocer el siguiente para ejecutar el actual (nextitem)
+    QUEUE_DEPTH = 2
+
+    def __init__(self, config, log=None, history=None):
+        super().__init__(config, log)
+        self.history = history
+
+    def schedule(self):
+        """Reparto inicial: colección ordenada de mayor a menor duración esperada"""
+        assert self.collection_is_completed
+
+        # El reparto inicial ya se hizo (p. ej. un worker se cayó): solo completar las colas
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        if not self.collection:
+            return
+
+        estimates = self.history.estimates(self.collection)
+        self.pending[:] = sorted(range(len(self.collection)), key=lambda index: -estimates[self.collection[index]])
+        total = sum(estimates.values())
+        logger.info(f"📊 LPT: {len(self.collection)} tests, {total:.0f}s estimados en {len(self.nodes)} workers "
+                    f"(ideal {total / len(self.nodes):.0f}s, el más largo {estimates[self.collection[self.pending[0]]]:.0f}s)")
+
+        # Uno a uno y por turnos: cada worker arranca con uno de los más largos
+        for _ in range(self.QUEUE_DEPTH):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration=0):
+        """Al terminar un test, el worker recibe el más largo de los que quedan (list scheduling en orden LPT)"""
+        if node.shutting_down:
+            return
+
+        if self.pending:
+            missing = self.QUEUE_DEPTH - len(self.node2pending[node])
+            if missing > 0:
+                self._send_tests(node, missing)
+        else:
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
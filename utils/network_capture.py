@@ -1,13 +1,69 @@
 import json
 import logging
+import weakref
+from collections import deque
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 class NetworkCapture:
-    def __init__(self, driver):
+    # Instancias compartidas por driver: el log de performance se vacía al leerlo,
+    # así que todos los consumidores de un mismo driver deben pasar por la misma instancia
+    _shared = weakref.WeakKeyDictionary()
+
+    def __init__(self, driver, max_buffered_logs=50000):
         self.driver = driver
         self.network_requests = []
+        self.raw_logs = deque(maxlen=max_buffered_logs)
+        self.listeners = []
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Obtener la instancia compartida de NetworkCapture para un driver"""
+        capture = cls._shared.get(driver)
+        if capture is None:
+            capture = cls(driver)
+            cls._shared[driver] = capture
+        return capture
+
+    @classmethod
+    def reset_for_driver(cls, driver):
+        """Descartar eventos y buffers de un driver que se va a reutilizar en otro test"""
+        capture = cls._shared.get(driver)
+        if capture is not None:
+            capture.reset()
+
+    def reset(self):
+        """Vaciar el log pendiente y el buffer sin procesar los eventos viejos"""
+        try:
+            self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"No se pudo vaciar el log de performance: {e}")
+        self.raw_logs.clear()
+        for listener in self.listeners:
+            listener("NetworkCapture.reset", {})
+
+    def add_listener(self, callback):
+        """Registrar un callback(method, params) que recibe cada evento CDP Network.*"""
+        self.listeners.append(callback)
+
+    def poll_events(self):
+        """Leer los eventos CDP pendientes del log de performance y repartirlos a los listeners"""
+        logs = self.driver.get_log('performance')
+        self.raw_logs.extend(logs)
+        
+        events = []
+        for log in logs:
+            try:
+                message = json.loads(log['message']).get('message', {})
+            except (ValueError, KeyError):
+                continue
+            method = message.get('method', '')
+            params = message.get('params', {})
+            events.append((method, params))
+            for listener in self.listeners:
+                listener(method, params)
+        return events
     
     def enable_network_tracking(self):
         """Habilitar tracking de network requests"""
@@ -32,8 +88,9 @@ class NetworkCapture:
         logger.info("🔍 Capturando requests de network como JSON...")
         
         try:
-            # Obtener logs de performance (contienen info de network)
-            logs = self.driver.get_log('performance')
+            # Obtener logs de performance (contienen info de network), incluidos los ya leídos por otros consumidores
+            self.poll_events()
+            logs = list(self.raw_logs)
             
             network_data = {
                 'capture_timestamp': datetime.now().isoformat(),
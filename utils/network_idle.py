@@ -0,0 +1,89 @@
+import time
+import logging
+import weakref
+from selenium.common.exceptions import WebDriverException
+from utils.network_capture import NetworkCapture
+
+logger = logging.getLogger(__name__)
+
+
+class NetworkIdleWaiter:
+    """Detectar red inactiva siguiendo los eventos CDP Network.requestWillBeSent / loadingFinished"""
+
+    # Conexiones de larga duración que nunca "terminan" y bloquearían la espera
+    IGNORED_TYPES = {"WebSocket", "EventSource", "Ping"}
+
+    _shared = weakref.WeakKeyDictionary()
+
+    def __init__(self, driver, idle_ms=500, max_inflight=0, stale_after=10.0, poll_interval=0.05):
+        self.driver = driver
+        self.idle_ms = idle_ms
+        self.max_inflight = max_inflight
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self.inflight = {}
+        self.capture = NetworkCapture.for_driver(driver)
+        self.capture.add_listener(self._on_event)
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Obtener el waiter compartido de un driver, o None si no soporta CDP/log de performance"""
+        if driver in cls._shared:
+            return cls._shared[driver]
+
+        waiter = None
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                waiter = cls(driver)
+                waiter.capture.poll_events()
+            except WebDriverException as e:
+                logger.info(f"ℹ️  NetworkIdleWaiter no disponible (¿falta goog:loggingPrefs performance?): {e}")
+                waiter = None
+        cls._shared[driver] = waiter
+        return waiter
+
+    def _on_event(self, method, params):
+        """Actualizar el conjunto de peticiones en vuelo"""
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            if params.get("type") not in self.IGNORED_TYPES:
+                self.inflight[request_id] = time.time()
+        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+            self.inflight.pop(request_id, None)
+        elif method == "NetworkCapture.reset":
+            self.inflight.clear()
+
+    def _drop_stale(self, now):
+        """Olvidar peticiones que llevan demasiado tiempo abiertas (long-polling, beacons)"""
+        stale = [rid for rid, seen in self.inflight.items() if now - seen > self.stale_after]
+        for rid in stale:
+            self.inflight.pop(rid, None)
+
+    def reset(self):
+        """Descartar el estado acumulado (por ejemplo al reutilizar el driver)"""
+        self.capture.poll_events()
+        self.inflight.clear()
+
+    def wait(self, timeout=15, idle_ms=None):
+        """Esperar hasta que no haya peticiones en vuelo durante idle_ms; devuelve False si se agota el tiempo"""
+        idle_ms = self.idle_ms if idle_ms is None else idle_ms
+        deadline = time.time() + timeout
+        idle_since = None
+
+        while True:
+            self.capture.poll_events()
+            now = time.time()
+            self._drop_stale(now)
+
+            if len(self.inflight) <= self.max_inflight:
+                idle_since = idle_since or now
+                if (now - idle_since) * 1000 >= idle_ms:
+                    return True
+            else:
+                idle_since = None
+
+            if now >= deadline:
+                logger.warning(f"⚠️  Red no quedó inactiva en {timeout}s ({len(self.inflight)} peticiones en vuelo)")
+                return False
+            time.sleep(self.poll_interval)
@@ -0,0 +1,209 @@
+import os
+import json
+import stat
+import time
+import errno
+import shutil
+import logging
+import tempfile
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin reflink, se copia
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+# ioctl de Linux para clonar un archivo compartiendo bloques (btrfs, xfs...)
+FICLONE = 0x40049409
+
+# Aceptar el banner de cookies si aparece (las cookies de consentimiento quedan en el perfil)
+CONSENT_SCRIPT = """
+var selectors = ['#onetrust-accept-btn-handler', 'button[id*="accept"][id*="cookie"]', 'button[class*="cookie"][class*="accept"]',
+                 'button[aria-label*="Aceptar"]', 'button[aria-label*="Accept"]'];
+for (var i = 0; i < selectors.length; i++) {
+    var button = document.querySelector(selectors[i]);
+    if (button && button.offsetParent !== null) { button.click(); return selectors[i]; }
+}
+return null;
+"""
+
+
+class ProfileTemplate:
+    """Perfil de Chrome preparado una vez por sesión (caché HTTP caliente + cookies de consentimiento) y clonado para cada driver"""
+
+    # Bloqueos y estado propio de cada instancia de Chrome: no se clonan
+    SKIP = {"SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile", "DevToolsActivePort",
+            "RunningChromeVersion", "Crashpad", "BrowserMetrics", "ShaderCache", "GrShaderCache", "GraphiteDawnCache"}
+
+    # Carpetas con las entradas de caché (el grueso del perfil): se comparten por reflink o hardlink
+    SHARED_DIRS = {"Cache", "Code Cache"}
+
+    MARKER = "template.json"
+
+    def __init__(self, root=None):
+        # tmpfs si existe: los clones y la plantilla en el mismo sistema de archivos permiten hardlinks
+        if root is None:
+            root = "/dev/shm" if os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()
+        self.root = tempfile.mkdtemp(prefix=f"chrome-template-{os.getpid()}-", dir=root)
+        self.template_dir = os.path.join(self.root, "template")
+        self.cookies = []
+        self.method = None
+        self.clones = 0
+
+    def is_ready(self):
+        return os.path.exists(os.path.join(self.template_dir, self.MARKER))
+
+    # ===== PREPARACIÓN =====
+
+    def prepare(self, factory, warm_urls):
+        """Abrir Chrome con el perfil plantilla, cargar las páginas a calentar y cerrarlo (Chrome vuelca la caché al salir)"""
+        from pages.base_page import BasePage
+
+        started = time.time()
+        driver = factory(self.template_dir)
+        try:
+            page = BasePage(driver)
+            for url in warm_urls:
+                driver.get(url)
+                page.wait_for_page_load()
+                page.wait_for_network_idle(timeout=15)
+                accepted = driver.execute_script(CONSENT_SCRIPT)
+                if accepted:
+                    logger.info(f"🍪 Consentimiento de cookies aceptado ({accepted})")
+                    page.wait_for_network_idle(timeout=5)
+            self.cookies = self._all_cookies(driver)
+        finally:
+            driver.quit()
+
+        # Los archivos compartidos quedan de solo lectura: si Chrome intenta reescribir uno en un clon, lo recrea
+        # en lugar de modificar el inodo común (copy-on-write a nivel de archivo)
+        read_only = self._can_hardlink()
+        size = files = 0
+        for path, shared in self._walk(self.template_dir):
+            files += 1
+            size += os.path.getsize(path)
+            if shared and read_only:
+                os.chmod(path, 0o444)
+
+        with open(os.path.join(self.template_dir, self.MARKER), "w", encoding="utf-8") as f:
+            json.dump({"warm_urls": warm_urls, "created": time.time(), "files": files, "bytes": size}, f)
+        logger.info(f"🧊 Perfil plantilla listo en {time.time() - started:.1f}s: {files} archivos, "
+                    f"{size // (1024 * 1024)} MB, {len(self.cookies)} cookies")
+
+    @staticmethod
+    def _all_cookies(driver):
+        try:
+            return driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        except WebDriverException as e:
+            logger.debug(f"No se pudieron leer las cookies de la plantilla: {e}")
+            return []
+
+    @staticmethod
+    def _can_hardlink():
+        """El modo 0o444 solo protege el inodo compartido si se respeta: no como root (CI) ni en Windows"""
+        if os.name == "nt":
+            return False
+        return os.geteuid() != 0
+
+    def _walk(self, base):
+        """(ruta, compartido) de cada archivo clonable del perfil"""
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = [d for d in dirnames if d not in self.SKIP]
+            relative = os.path.relpath(dirpath, base).split(os.sep)
+            shared = any(part in self.SHARED_DIRS for part in relative)
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if name in self.SKIP or name == self.MARKER or os.path.islink(path):
+                    continue
+                # Los índices de la caché se reescriben en cada arranque: siempre copia propia
+                is_index = name.startswith("index") or "index-dir" in relative
+                yield path, shared and not is_index
+
+    # ===== CLONADO =====
+
+    def clone(self):
+        """Nuevo user-data-dir para un driver: reflink si el FS lo soporta, si no hardlink de la caché (o copia) y copia del resto"""
+        if not self.is_ready():
+            raise RuntimeError("El perfil plantilla no está preparado")
+
+        started = time.time()
+        target = tempfile.mkdtemp(prefix="profile-", dir=self.root)
+        for path, shared in self._walk(self.template_dir):
+            destination = os.path.join(target, os.path.relpath(path, self.template_dir))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            self._clone_file(path, destination, shared)
+
+        self.clones += 1
+        logger.info(f"🧬 Perfil clonado ({self.method}) en {(time.time() - started) * 1000:.0f} ms: {target}")
+        return target
+
+    def _clone_file(self, source, destination, shared):
+        if self.method in (None, "reflink") and fcntl is not None:
+            try:
+                with open(source, "rb") as src, open(destination, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, destination)
+                os.chmod(destination, 0o644)
+                self.method = "reflink"
+                return
+            except OSError as e:
+                if self.method == "reflink" or e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL):
+                    raise
+                os.remove(destination)
+                self.method = "hardlink" if self._can_hardlink() else "copy"
+
+        if self.method is None:
+            self.method = "hardlink" if self._can_hardlink() else "copy"
+
+        if shared and self.method == "hardlink":
+            os.link(source, destination)
+        else:
+            shutil.copy2(source, destination)
+            os.chmod(destination, 0o644)
+
+    def track(self, driver, user_data_dir):
+        """Borrar el clon cuando el driver se cierre (los clones viven en tmpfs, es decir, en RAM)"""
+        original_quit = driver.quit
+
+        def quit():
+            try:
+                original_quit()
+            finally:
+                self._remove_tree(user_data_dir)
+
+        driver.quit = quit
+        return driver
+
+    def apply_cookies(self, driver):
+        """Reponer las cookies de consentimiento (el pool borra las cookies entre tests)"""
+        if not self.cookies:
+            return
+        try:
+            cookies = []
+            for c in self.cookies:
+                cookie = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if k in c}
+                if c.get("expires", -1) > 0:
+                    cookie["expires"] = c["expires"]
+                cookies.append(cookie)
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        except WebDriverException as e:
+            logger.debug(f"No se pudieron reponer las cookies de la plantilla: {e}")
+
+    @staticmethod
+    def _remove_tree(path):
+        """Borrar un perfil aunque tenga archivos de solo lectura (en Windows rmtree no puede con ellos)"""
+        def clear_read_only(function, failed_path, _):
+            try:
+                os.chmod(failed_path, stat.S_IWRITE)
+                function(failed_path)
+            except OSError as e:
+                logger.debug(f"No se pudo borrar {failed_path}: {e}")
+
+        shutil.rmtree(path, onerror=clear_read_only)
+
+    def close(self):
+        self._remove_tree(self.root)
+        logger.info(f"🧊 Perfil plantilla eliminado ({self.clones} clones, método: {self.method})")
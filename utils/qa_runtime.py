@@ -0,0 +1,327 @@
+import logging
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+
+# Biblioteca del navegador (window.__qa): se registra una vez por pestaña y Python la invoca con llamadas cortas.
+# Los métodos asíncronos reciben el callback de Selenium como último argumento.
+QA_RUNTIME_JS = r"""
+(function () {
+if (window.__qa && window.__qa.version === 1) { return; }
+
+function candidates(spec) {
+    try {
+        if (spec.kind === 'xpath') {
+            var snapshot = document.evaluate(spec.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), out = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { out.push(snapshot.snapshotItem(i)); }
+            return out.filter(function (node) { return node.nodeType === 1; });
+        }
+        if (spec.kind === 'css') { return Array.prototype.slice.call(document.querySelectorAll(spec.value)); }
+        if (spec.kind === 'class') { return Array.prototype.slice.call(document.getElementsByClassName(spec.value)); }
+        return Array.prototype.slice.call(document.querySelectorAll('a')).filter(function (a) {
+            var text = (a.innerText || a.textContent || '').trim();
+            return spec.kind === 'link' ? text === spec.value : text.indexOf(spec.value) !== -1;
+        });
+    } catch (e) { return []; }
+}
+
+function displayed(el) {
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity) !== 0;
+}
+
+function enabled(el) { return !(el.matches && el.matches(':disabled')); }
+
+function read(el, prop) {
+    switch (prop) {
+        case 'text': return (el.innerText || '').trim();
+        case 'href': return el.href !== undefined && el.href !== '' ? String(el.href) : el.getAttribute('href');
+        case 'class': return el.getAttribute('class') || '';
+        case 'tag': return el.tagName.toLowerCase();
+        case 'value': return el.value !== undefined ? el.value : el.getAttribute('value');
+        case 'displayed': return displayed(el);
+        case 'enabled': return enabled(el);
+        default: return el.getAttribute(prop);
+    }
+}
+
+// Sondeo con requestAnimationFrame o setTimeout hasta que check() devuelva algo distinto de undefined
+function poll(check, timeoutMs, intervalMs, done, onTimeout) {
+    var start = performance.now();
+    (function tick() {
+        var result = check();
+        if (result !== undefined) { done(result); }
+        else if (performance.now() - start >= timeoutMs) { done(onTimeout()); }
+        else if (intervalMs) { setTimeout(tick, intervalMs); }
+        else { requestAnimationFrame(tick); }
+    })();
+}
+
+window.__qa = {
+    version: 1,
+
+    // ===== BÚSQUEDA =====
+
+    // Primer elemento usable del primer localizador que encuentre alguno: [elemento, índice] o null
+    find: function (specs, mustBeUsable, timeoutMs, done) {
+        poll(function () {
+            for (var i = 0; i < specs.length; i++) {
+                var found = candidates(specs[i]);
+                for (var j = 0; j < found.length; j++) {
+                    if (!mustBeUsable || (enabled(found[j]) && displayed(found[j]))) { return [found[j], i]; }
+                }
+            }
+        }, timeoutMs, 100, done, function () { return null; });
+    },
+
+    findAll: function (spec, countOnly) {
+        var found = candidates(spec);
+        return countOnly ? found.length : found;
+    },
+
+    snapshot: function (spec, props) {
+        return candidates(spec).map(function (el) {
+            var values = {};
+            props.forEach(function (prop) { values[prop] = read(el, prop); });
+            return [el, values];
+        });
+    },
+
+    // Propiedades de un elemento ya encontrado
+    read: function (el, props) {
+        var values = {};
+        props.forEach(function (prop) { values[prop] = read(el, prop); });
+        return values;
+    },
+
+    readyState: function () { return document.readyState; },
+
+    // ===== ESPERAS (resuelven en el navegador en cuanto se cumple la condición) =====
+
+    // Ninguna mutación del DOM durante quietMs
+    waitDomQuiet: function (quietMs, timeoutMs, done) {
+        var last = performance.now();
+        var observer = new MutationObserver(function () { last = performance.now(); });
+        observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+        poll(function () {
+            if (performance.now() - last >= quietMs) { observer.disconnect(); return true; }
+        }, timeoutMs, 50, done, function () { observer.disconnect(); return false; });
+    },
+
+    // Zona de Angular estable (sin tareas ni peticiones HTTP pendientes)
+    waitAngular: function (timeoutMs, done) {
+        var finished = false;
+        function finish(result) { if (!finished) { finished = true; done(result); } }
+        if (!window.getAllAngularTestabilities) { finish(true); return; }
+        var testabilities = window.getAllAngularTestabilities(), pending = testabilities.length;
+        if (!pending) { finish(true); return; }
+        setTimeout(function () { finish(false); }, timeoutMs);
+        testabilities.forEach(function (t) { t.whenStable(function () { if (--pending === 0) { finish(true); } }); });
+    },
+
+    // Red inactiva (aproximación en página): ningún recurso nuevo completado durante quietMs
+    waitNetworkQuiet: function (quietMs, timeoutMs, done) {
+        var last = performance.now(), count = performance.getEntriesByType('resource').length;
+        poll(function () {
+            var now = performance.now(), current = performance.getEntriesByType('resource').length;
+            if (current !== count) { count = current; last = now; }
+            if (document.readyState === 'complete' && now - last >= quietMs) { return true; }
+        }, timeoutMs, 50, done, function () { return false; });
+    },
+
+    // Fin de animaciones/transiciones finitas y del scroll suave
+    waitAnimations: function (root, timeoutMs, done) {
+        var lastScroll = null;
+        function running() {
+            var list = root && root.getAnimations ? root.getAnimations({subtree: true})
+                     : (document.getAnimations ? document.getAnimations() : []);
+            return list.filter(function (a) {
+                var timing = a.effect && a.effect.getTiming ? a.effect.getTiming() : {};
+                return a.playState === 'running' && timing.iterations !== Infinity;
+            }).length;
+        }
+        poll(function () {
+            var scroll = window.scrollX + ',' + window.scrollY, scrolling = scroll !== lastScroll;
+            lastScroll = scroll;
+            if (!scrolling && running() === 0) { return true; }
+        }, timeoutMs, 0, done, function () { return false; });
+    },
+
+    // ===== ACCIONES =====
+
+    // Scroll instantáneo (y = 'bottom' para el final del documento); devuelve la posición final
+    scrollTo: function (x, y) {
+        var top = y === 'bottom' ? document.documentElement.scrollHeight : y;
+        window.scrollTo({left: x, top: top, behavior: 'instant'});
+        return window.scrollY;
+    },
+
+    scrollIntoView: function (el, block) {
+        el.scrollIntoView({block: block || 'center', inline: 'nearest', behavior: 'instant'});
+        return displayed(el);
+    },
+
+    // Click por JavaScript sobre un elemento visible y habilitado: centrado sin animación y click()
+    click: function (el) {
+        if (!el.isConnected) { return 'detached'; }
+        if (!enabled(el)) { return 'disabled'; }
+        el.scrollIntoView({block: 'center', inline: 'nearest', behavior: 'instant'});
+        el.click();
+        return 'clicked';
+    }
+};
+})();
+"""
+
+# Modo sin animaciones (--no-animations): transiciones y animaciones CSS instantáneas, scroll sin suavizado y
+# animaciones de la Web Animations API (las de Angular) con duración 0
+NO_ANIMATIONS_JS = r"""
+(function () {
+if (window.__qaNoAnimations) { return; }
+window.__qaNoAnimations = true;
+var css = '*, *::before, *::after { transition-duration: 0s !important; transition-delay: 0s !important; ' +
+          'animation-duration: 0s !important; animation-delay: 0s !important; animation-iteration-count: 1 !important; ' +
+          'scroll-behavior: auto !important; } html, body { scroll-behavior: auto !important; }';
+function attach() {
+    if (document.getElementById('__qa-no-animations')) { return true; }
+    var parent = document.head || document.documentElement;
+    if (!parent) { return false; }
+    var style = document.createElement('style');
+    style.id = '__qa-no-animations';
+    style.textContent = css;
+    parent.appendChild(style);
+    return true;
+}
+if (!attach()) {
+    var observer = new MutationObserver(function () { if (attach()) { observer.disconnect(); } });
+    observer.observe(document, {childList: true, subtree: true});
+}
+// Las SPA reescriben <head> al arrancar: se vuelve a poner si desaparece
+document.addEventListener('DOMContentLoaded', attach);
+var animate = Element.prototype.animate;
+if (animate) {
+    Element.prototype.animate = function (keyframes, options) {
+        var timing = typeof options === 'number' || options === undefined ? {} : Object.assign({}, options);
+        timing.duration = 0;
+        timing.delay = 0;
+        timing.endDelay = 0;
+        if (timing.iterations === Infinity) { timing.iterations = 1; }
+        return animate.call(this, keyframes, timing);
+    };
+}
+})();
+"""
+
+# Llamadas cortas a la biblioteca; si el documento no la tiene (pestaña nueva, Firefox) se avisa a Python
+CALL_SCRIPT = """
+if (!window.__qa) { return {__qa_missing: true}; }
+return window.__qa[arguments[0]].apply(null, arguments[1]);
+"""
+
+CALL_ASYNC_SCRIPT = """
+var done = arguments[arguments.length - 1];
+if (!window.__qa) { done({__qa_missing: true}); return; }
+window.__qa[arguments[0]].apply(null, arguments[1].concat([done]));
+"""
+
+
+class QaRuntime:
+    """Biblioteca de ayuda del navegador (window.__qa) registrada por CDP en cada documento nuevo"""
+
+    # Veces que un documento no tenía la biblioteca y se inyectó completa junto con la llamada
+    fallbacks = 0
+
+    @staticmethod
+    def _missing(result):
+        return isinstance(result, dict) and result.get("__qa_missing") is True
+
+    @classmethod
+    def install(cls, driver):
+        """Registrar la biblioteca en la pestaña actual (los documentos que cargue la tendrán antes que sus scripts)"""
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return False
+        handles = driver.__dict__.setdefault("_qa_runtime_handles", set())
+        try:
+            handle = driver.current_window_handle
+            if handle in handles:
+                return True
+            # runImmediately: también en el documento ya cargado (Chrome 112+)
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                   {"source": QA_RUNTIME_JS, "runImmediately": True})
+            handles.add(handle)
+            return True
+        except WebDriverException as e:
+            logger.debug(f"No se pudo registrar la biblioteca __qa: {e}")
+            return False
+
+    @classmethod
+    def disable_animations(cls, driver):
+        """Modo sin animaciones en la pestaña actual; marca el driver para que los page objects no esperen animaciones"""
+        if not hasattr(driver, "execute_cdp_cmd"):
+            logger.warning("⚠️  --no-animations necesita CDP (Chrome); las animaciones siguen activas")
+            return False
+        if not cls._register_no_animations(driver):
+            driver.animations_disabled = False
+            return False
+        driver.animations_disabled = True
+        return True
+
+    @classmethod
+    def animations_disabled(cls, driver):
+        """¿La pestaña actual está sin animaciones? Las pestañas que abre el sitio se registran al verlas por primera vez"""
+        if not getattr(driver, "animations_disabled", False):
+            return False
+        try:
+            handle = driver.current_window_handle
+        except WebDriverException:
+            return False
+        if handle in driver.__dict__.get("_qa_no_animation_handles", ()):
+            return True
+        # Pestaña nueva: sus próximos documentos ya no animan, pero el actual pudo empezar a animar antes
+        cls._register_no_animations(driver)
+        return False
+
+    @staticmethod
+    def _register_no_animations(driver):
+        """Registrar el modo sin animaciones en la pestaña actual (una vez por pestaña)"""
+        handles = driver.__dict__.setdefault("_qa_no_animation_handles", set())
+        try:
+            handle = driver.current_window_handle
+            if handle not in handles:
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                       {"source": NO_ANIMATIONS_JS, "runImmediately": True})
+                # Los sitios que respetan prefers-reduced-motion también recortan sus animaciones por JS
+                driver.execute_cdp_cmd("Emulation.setEmulatedMedia",
+                                       {"features": [{"name": "prefers-reduced-motion", "value": "reduce"}]})
+                handles.add(handle)
+            return True
+        except WebDriverException as e:
+            logger.warning(f"⚠️  No se pudo activar el modo sin animaciones: {e}")
+            return False
+
+    @classmethod
+    def call(cls, driver, name, *args):
+        """__qa.name(*args) en el documento actual"""
+        result = driver.execute_script(CALL_SCRIPT, name, list(args))
+        if cls._missing(result):
+            cls._inject(driver)
+            result = driver.execute_script(QA_RUNTIME_JS + CALL_SCRIPT, name, list(args))
+        return result
+
+    @classmethod
+    def call_async(cls, driver, name, *args):
+        """__qa.name(*args, done) en el documento actual (esperas y sondeos)"""
+        result = driver.execute_async_script(CALL_ASYNC_SCRIPT, name, list(args))
+        if cls._missing(result):
+            cls._inject(driver)
+            result = driver.execute_async_script(QA_RUNTIME_JS + CALL_ASYNC_SCRIPT, name, list(args))
+        return result
+
+    @classmethod
+    def _inject(cls, driver):
+        """Documento sin biblioteca: se envía completa en la llamada y se registra la pestaña si hay CDP"""
+        cls.fallbacks += 1
+        cls.install(driver)
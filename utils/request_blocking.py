@@ -0,0 +1,127 @@
+import logging
+from selenium.common.exceptions import WebDriverException
+from utils.network_capture import NetworkCapture
+
+logger = logging.getLogger(__name__)
+
+
+# Patrones de Network.setBlockedURLs ('*' como comodín)
+ANALYTICS_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googleadservices.com*",
+    "*facebook.net*", "*facebook.com/tr*", "*hotjar.com*", "*clarity.ms*", "*newrelic.com*", "*nr-data.net*",
+    "*optimizely.com*", "*cdn.segment.com*", "*adobedtm.com*", "*omtrdc.net*", "*demdex.net*",
+    "*analytics.tiktok.com*", "*criteo.com*", "*bat.bing.com*", "*dynatrace.com*", "*quantummetric.com*"
+]
+FONT_PATTERNS = ["*fonts.googleapis.com*", "*fonts.gstatic.com*", "*.woff", "*.woff2", "*.ttf", "*.otf"]
+IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico"]
+MEDIA_PATTERNS = ["*.mp4", "*.webm", "*.m3u8"]
+
+
+class RequestBlocker:
+    """Bloqueo de peticiones de terceros por perfil (CDP Network.setBlockedURLs) con estadísticas por test"""
+
+    PROFILES = {
+        "off": [],
+        "analytics": ANALYTICS_PATTERNS,
+        "standard": ANALYTICS_PATTERNS + FONT_PATTERNS,
+        "strict": ANALYTICS_PATTERNS + FONT_PATTERNS + IMAGE_PATTERNS + MEDIA_PATTERNS
+    }
+
+    # Perfil por marcador cuando el test no lleva @pytest.mark.block_requests explícito
+    MARKER_PROFILES = {
+        "redirects": "strict",
+        "footer": "strict"
+    }
+
+    # Tamaño conocido (bytes transferidos) de cada URL sin query, aprendido en cargas no bloqueadas (se persiste en la BD)
+    known_sizes = {}
+    sizes_loaded = False
+
+    def __init__(self, driver, profile, patterns):
+        self.driver = driver
+        self.profile = profile
+        self.patterns = patterns
+        self.capture = NetworkCapture.for_driver(driver)
+        self.urls = {}
+        self.total_requests = 0
+        self.blocked = []
+        self.downloaded = {}
+        # Tamaños nuevos o distintos de los conocidos: los únicos que hay que guardar en la BD
+        self.changed_sizes = {}
+        self.capture.add_listener(self._on_event)
+
+    @classmethod
+    def profile_for(cls, item, default="analytics"):
+        """Perfil de un test: marcador block_requests, luego marcadores con perfil propio, luego la opción"""
+        explicit = item.get_closest_marker("block_requests")
+        if explicit is not None and explicit.args:
+            return explicit.args[0]
+        for marker, profile in cls.MARKER_PROFILES.items():
+            if item.get_closest_marker(marker) is not None:
+                return profile
+        return default
+
+    @classmethod
+    def attach(cls, driver, profile, block_images=False):
+        """Activar el bloqueo en un driver; None si no hay nada que bloquear o el navegador no tiene CDP"""
+        if profile not in cls.PROFILES:
+            raise ValueError(f"Perfil de bloqueo no soportado: {profile}. Opciones: {list(cls.PROFILES)}")
+
+        patterns = list(cls.PROFILES[profile])
+        if block_images:
+            patterns += [p for p in IMAGE_PATTERNS if p not in patterns]
+        if not patterns or not hasattr(driver, "execute_cdp_cmd"):
+            return None
+
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except WebDriverException as e:
+            logger.warning(f"⚠️  No se pudo activar el bloqueo de peticiones: {e}")
+            return None
+
+        blocker = cls(driver, profile, patterns)
+        logger.info(f"🚫 Bloqueo de peticiones '{profile}' activo ({len(patterns)} patrones)")
+        return blocker
+
+    def _on_event(self, method, params):
+        """Contar peticiones, las bloqueadas y el tamaño de las que sí se descargaron"""
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            self.urls[request_id] = params.get("request", {}).get("url", "")
+            self.total_requests += 1
+        elif method == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+            self.blocked.append(self.size_key(self.urls.get(request_id, "")))
+        elif method == "Network.loadingFinished" and request_id in self.urls:
+            self.downloaded[self.size_key(self.urls[request_id])] = int(params.get("encodedDataLength") or 0)
+
+    @staticmethod
+    def size_key(url):
+        return url.split("?")[0].split("#")[0]
+
+    def detach(self):
+        """Desactivar el bloqueo y devolver las estadísticas del test"""
+        try:
+            self.capture.poll_events()
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        except Exception as e:
+            # Con el chromedriver caído poll_events lanza errores de urllib3, no WebDriverException
+            logger.debug(f"No se pudo desactivar el bloqueo: {e}")
+        finally:
+            self.capture.listeners.remove(self._on_event)
+
+        self.changed_sizes = {url: size for url, size in self.downloaded.items() if self.known_sizes.get(url) != size}
+        RequestBlocker.known_sizes.update(self.downloaded)
+
+        # Bytes ahorrados: tamaño de cada URL bloqueada cuando se descargó en otra carga (0 si nunca se vio)
+        saved = sum(self.known_sizes.get(url, 0) for url in self.blocked)
+        stats = {
+            "profile": self.profile,
+            "total_requests": self.total_requests,
+            "blocked_requests": len(self.blocked),
+            "bytes_saved": saved,
+            "unknown_sizes": sum(1 for url in self.blocked if url not in self.known_sizes)
+        }
+        print(f"🚫 Peticiones bloqueadas ({self.profile}): {stats['blocked_requests']}/{self.total_requests}, "
+              f"~{saved // 1024} KB ahorrados")
+        return stats
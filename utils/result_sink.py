@@ -0,0 +1,247 @@
+import os
+import glob
+import json
+import time
+import queue
+import atexit
+import shutil
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def connect(db_path):
+    """Conexión SQLite configurada para escritura concurrente (WAL, espera de locks, caché de sentencias)"""
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, cached_statements=256)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class BatchWriter:
+    """Escritor de larga vida (uno por archivo y proceso) que agrupa las escrituras en un hilo de fondo"""
+    
+    _writers = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, db_path, flush_interval=0.5, batch_size=200):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.pending = queue.Queue()
+        self.written = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name=f"db-writer-{os.path.basename(db_path)}", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+    
+    @classmethod
+    def for_path(cls, db_path):
+        """Obtener (o crear) el escritor compartido de un archivo"""
+        with cls._lock:
+            if db_path not in cls._writers:
+                cls._writers[db_path] = cls(db_path)
+            return cls._writers[db_path]
+    
+    @classmethod
+    def close_all(cls):
+        """Vaciar y cerrar todos los escritores del proceso"""
+        with cls._lock:
+            writers = list(cls._writers.values())
+            cls._writers.clear()
+        for writer in writers:
+            writer.close()
+    
+    def execute(self, sql, params=()):
+        """Encolar una escritura (se confirma en el siguiente lote)"""
+        if self.closed:
+            raise RuntimeError(f"BatchWriter cerrado: {self.db_path}")
+        self.pending.put((sql, params))
+    
+    def flush(self, timeout=30):
+        """Bloquear hasta que todo lo encolado antes de esta llamada esté confirmado"""
+        if self.closed:
+            return True
+        done = threading.Event()
+        self.pending.put((None, done))
+        return done.wait(timeout)
+    
+    def close(self):
+        """Vaciar la cola y cerrar la conexión (registrado en atexit)"""
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        self.pending.put((None, None))
+        self.thread.join(10)
+    
+    def _run(self):
+        conn = connect(self.db_path)
+        while True:
+            batch = [self.pending.get()]
+            deadline = time.time() + self.flush_interval
+            
+            # Agrupar lo que llegue durante flush_interval (o hasta batch_size / una marca de flush)
+            while len(batch) < self.batch_size and batch[-1][0] is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            stop = self._write_batch(conn, batch)
+            if stop:
+                conn.close()
+                return
+    
+    def _write_batch(self, conn, batch):
+        """Escribir un lote en una sola transacción; devuelve True si incluía la marca de cierre"""
+        statements = [(sql, params) for sql, params in batch if sql is not None]
+        if statements:
+            try:
+                with conn:
+                    for sql, params in statements:
+                        conn.execute(sql, params)
+                self.written += len(statements)
+            except sqlite3.Error as e:
+                logger.error(f"❌ Error escribiendo lote de {len(statements)} sentencias en {self.db_path}: {e}")
+        
+        stop = False
+        for sql, marker in batch:
+            if sql is None:
+                if marker is None:
+                    stop = True
+                else:
+                    marker.set()
+        return stop
+
+
+# Tabla de cada shard: las escrituras se guardan tal cual para reproducirlas al final
+SHARD_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS pending_writes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        db_path TEXT NOT NULL,
+        sql TEXT NOT NULL,
+        params TEXT NOT NULL
+    )
+'''
+
+INSERT_PENDING_WRITE = "INSERT INTO pending_writes (db_path, sql, params) VALUES (?, ?, ?)"
+
+
+class ResultSink:
+    """Canal único de escritura de resultados: directo, a través del controlador de xdist o por shards de worker"""
+    
+    # direct: cada proceso escribe en la BD | controller: los workers envían sus escrituras en los reportes
+    # y solo el controlador escribe | shard: cada worker escribe su propio archivo y se fusionan al final
+    MODES = ("direct", "controller", "shard")
+    
+    # Clave de report.user_properties / workeroutput con las escrituras de un worker
+    USER_PROPERTY = "result_sink_writes"
+    SHARD_DIR = "data/shards"
+    
+    mode = "direct"
+    worker_id = None
+    run_id = None
+    _pending = []
+    _shard_ready = False
+    
+    @classmethod
+    def configure(cls, mode, worker_id=None):
+        """Fijar el modo del proceso (el controlador y los procesos sin xdist siempre escriben directamente)"""
+        cls.mode = mode if worker_id is not None else "direct"
+        cls.worker_id = worker_id
+        # El controlador fija el run en el entorno antes de lanzar los workers: sus shards van a la misma carpeta
+        cls.run_id = os.environ.setdefault("RESULT_SINK_RUN_ID", f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}")
+        logger.info(f"🗄️  ResultSink en modo '{cls.mode}' ({worker_id or 'controlador'})")
+    
+    @classmethod
+    def write(cls, db_path, sql, params=()):
+        """Registrar una escritura según el modo del proceso"""
+        if cls.mode == "controller":
+            cls._pending.append((db_path, sql, list(params)))
+        elif cls.mode == "shard":
+            BatchWriter.for_path(cls._shard_path()).execute(INSERT_PENDING_WRITE, (db_path, sql, json.dumps(list(params))))
+        else:
+            BatchWriter.for_path(db_path).execute(sql, params)
+    
+    @classmethod
+    def flush(cls, db_path):
+        """Vaciar las escrituras locales de un archivo (en modo controller/shard aún no están en él)"""
+        return BatchWriter.for_path(db_path).flush()
+    
+    @classmethod
+    def _shard_dir(cls):
+        return os.path.join(cls.SHARD_DIR, cls.run_id)
+    
+    @classmethod
+    def _shard_path(cls):
+        path = os.path.join(cls._shard_dir(), f"{cls.worker_id}.db")
+        if not cls._shard_ready:
+            os.makedirs(cls._shard_dir(), exist_ok=True)
+            conn = connect(path)
+            conn.execute(SHARD_SCHEMA)
+            conn.commit()
+            conn.close()
+            cls._shard_ready = True
+        return path
+    
+    # ===== MODO CONTROLLER (mensajería worker -> controlador de xdist) =====
+    
+    @classmethod
+    def drain(cls):
+        """Entregar y olvidar las escrituras pendientes del worker"""
+        writes, cls._pending = cls._pending, []
+        return writes
+    
+    @classmethod
+    def attach_to_report(cls, report):
+        """Worker: adjuntar las escrituras pendientes al reporte (xdist lo serializa al controlador)"""
+        if cls.mode == "controller" and cls._pending:
+            report.user_properties.append((cls.USER_PROPERTY, cls.drain()))
+    
+    @classmethod
+    def collect_from_report(cls, report):
+        """Controlador: persistir las escrituras que llegan adjuntas a un reporte y quitarlas de él"""
+        if cls.worker_id is not None:
+            return
+        for name, writes in report.user_properties:
+            if name == cls.USER_PROPERTY:
+                cls.replay(writes)
+        # Que --junitxml y demás plugins no vean las sentencias como propiedades del test
+        report.user_properties[:] = [prop for prop in report.user_properties if prop[0] != cls.USER_PROPERTY]
+    
+    @classmethod
+    def replay(cls, writes):
+        """Ejecutar en este proceso una lista de escrituras (db_path, sql, params)"""
+        for db_path, sql, params in writes:
+            BatchWriter.for_path(db_path).execute(sql, tuple(params))
+    
+    # ===== MODO SHARD (un archivo por worker, fusionado al final de la sesión) =====
+    
+    @classmethod
+    def merge_shards(cls):
+        """Controlador: reproducir las escrituras de los shards de esta ejecución y eliminarlos"""
+        # Los shards de ejecuciones anteriores que se interrumpieron quedan en sus carpetas, sin fusionar
+        shard_paths = sorted(glob.glob(os.path.join(cls._shard_dir(), "*.db")))
+        merged = 0
+        for shard_path in shard_paths:
+            conn = connect(shard_path)
+            rows = conn.execute("SELECT db_path, sql, params FROM pending_writes ORDER BY id").fetchall()
+            conn.close()
+            
+            cls.replay((db_path, sql, json.loads(params)) for db_path, sql, params in rows)
+            merged += len(rows)
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(shard_path + suffix):
+                    os.remove(shard_path + suffix)
+        
+        if shard_paths:
+            shutil.rmtree(cls._shard_dir(), ignore_errors=True)
+            logger.info(f"🗄️  {len(shard_paths)} shards fusionados ({merged} escrituras)")
+        return merged
@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import inspect
+import logging
+import functools
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class RoundTripCounter:
+    """Viajes de ida y vuelta al WebDriver (y bytes JSON enviados/recibidos) por test y por método de page object"""
+
+    installed = False
+    # Bytes JSON y desglose por método (serializa cada respuesta y recorre la pila en cada comando)
+    detailed = False
+    run_id = None
+    current = None
+
+    # Los métodos se identifican por los frames de pages/ en la pila de Python del comando
+    PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages") + os.sep
+
+    @classmethod
+    def install(cls, detailed=False):
+        """Envolver el ejecutor de comandos (una vez por proceso); detailed añade bytes y desglose por método"""
+        if cls.installed:
+            return
+        cls.installed = True
+        cls.detailed = detailed
+        # Mismo run_id que el desglose de tiempo (StepTimer) para cruzar ambas tablas
+        cls.run_id = os.environ.setdefault("STEP_TIMING_RUN_ID", datetime.now().strftime("%Y%m%d_%H%M%S"))
+
+        from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+        original_execute = RemoteConnection.execute
+
+        @functools.wraps(original_execute)
+        def execute(connection, command, params):
+            response = None
+            try:
+                response = original_execute(connection, command, params)
+                return response
+            finally:
+                # Los comandos fallidos (NoSuchElement...) también son un viaje; el sondeo de video y CDP
+                # corren en otros hilos y no cuentan para el presupuesto del test
+                if cls.current is not None and threading.current_thread() is threading.main_thread():
+                    cls._count(params, response)
+
+        RemoteConnection.execute = execute
+
+    @staticmethod
+    def _size(payload):
+        try:
+            return len(json.dumps(payload, default=str))
+        except (TypeError, ValueError):
+            return 0
+
+    @classmethod
+    def _count(cls, params, response):
+        counters = [cls.current["test"]]
+        sent = received = 0
+        if cls.detailed:
+            sent, received = cls._size(params), cls._size(response)
+            counters.extend(cls.current["methods"].setdefault(name, cls._new_counter()) for name in cls._page_methods())
+        for counter in counters:
+            counter["roundtrips"] += 1
+            counter["sent"] += sent
+            counter["received"] += received
+
+    @classmethod
+    def _page_methods(cls):
+        """Métodos de page objects en la pila del comando (cada uno una vez, aunque haya recursión)"""
+        names = set()
+        frame = sys._getframe()
+        while frame is not None:
+            code = frame.f_code
+            instance = frame.f_locals.get("self")
+            # Las lambdas y funciones internas no cuentan: el método que las llama sigue en la pila
+            if code.co_filename.startswith(cls.PAGES_DIR) and instance is not None and not code.co_name.startswith("<"):
+                names.add(f"{cls._owner(type(instance), code)}.{code.co_name}")
+            frame = frame.f_back
+        return names
+
+    @staticmethod
+    def _owner(klass, code):
+        """Clase que define el método (BasePage.find_first aunque se llame desde un HomePage)"""
+        for base in klass.__mro__:
+            function = base.__dict__.get(code.co_name)
+            if function is not None and getattr(inspect.unwrap(function), "__code__", None) is code:
+                return base.__name__
+        return klass.__name__
+
+    @staticmethod
+    def _new_counter():
+        return {"roundtrips": 0, "sent": 0, "received": 0}
+
+    # ===== POR TEST =====
+
+    @classmethod
+    def start_test(cls, test_name):
+        cls.current = {"test_name": test_name, "test": cls._new_counter(), "methods": {}}
+
+    @classmethod
+    def roundtrips(cls):
+        """Viajes del test en curso hasta ahora"""
+        return cls.current["test"]["roundtrips"] if cls.current is not None else 0
+
+    @classmethod
+    def finish_test(cls, budget=None):
+        """Cerrar el test en curso y devolver sus filas para roundtrip_counts"""
+        if cls.current is None:
+            return []
+        current, cls.current = cls.current, None
+        rows = [dict(current["test"], kind="test", name=current["test_name"], budget=budget)]
+        for name, counter in current["methods"].items():
+            rows.append(dict(counter, kind="method", name=name, budget=None))
+        return [dict(row, test_name=current["test_name"]) for row in rows]
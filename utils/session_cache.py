@@ -0,0 +1,305 @@
+import time
+import json
+import logging
+import threading
+from urllib.parse import urlparse
+from selenium.common.exceptions import WebDriverException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+
+# localStorage y sessionStorage del origen actual
+STORAGE_SCRIPT = """
+function dump(store) {
+    var out = {};
+    for (var i = 0; i < store.length; i++) { var key = store.key(i); out[key] = store.getItem(key); }
+    return out;
+}
+return {local: dump(localStorage), session: dump(sessionStorage)};
+"""
+
+# Restaurar el storage del host una sola vez por pestaña (con CDP el script corre en cada documento nuevo)
+RESTORE_STORAGE_SCRIPT = """
+(function (storage, flag) {
+    var items = storage[location.host];
+    if (!items || sessionStorage.getItem(flag)) { return; }
+    Object.keys(items.local).forEach(function (key) { localStorage.setItem(key, items.local[key]); });
+    Object.keys(items.session).forEach(function (key) { sessionStorage.setItem(key, items.session[key]); });
+    sessionStorage.setItem(flag, '1');
+})(%s, %s);
+"""
+
+# Señales de sesión en el sitio: indicador de perfil y texto del botón de login
+SESSION_STATE_SCRIPT = """
+var auth = document.getElementById('auth-component') || document.querySelector('.auth_trigger_button');
+return {
+    profile: !!document.querySelector("[data-cy='user-profile']"),
+    auth_text: auth ? (auth.innerText || auth.textContent || '').trim() : null
+};
+"""
+
+# El formulario de hydra sigue en pantalla (el login aún no terminó)
+LOGIN_FORM_SCRIPT = "return !!document.getElementById('u-username');"
+
+
+class SessionCache:
+    """Sesión autenticada por worker: login por la UI una vez, snapshot de cookies y storage de los dos orígenes y restauración en drivers nuevos o del pool"""
+
+    LOGIN_HOST = "hydra.uat-lifemiles.net"
+
+    # Textos del botón de login cuando no hay sesión
+    LOGGED_OUT_LABELS = ("iniciar sesión", "log in", "login", "sign in", "se connecter", "entrar")
+
+    # Margen (s) para dar por caducada una cookie de sesión antes de que expire de verdad
+    EXPIRY_MARGIN = 120
+
+    RESTORED_FLAG = "__session_cache_restored"
+
+    # Snapshots por (origen del sitio, usuario): uno por proceso, es decir, por worker de xdist
+    _snapshots = {}
+    _lock = threading.Lock()
+    logins = 0
+    restores = 0
+
+    def __init__(self, driver, username, password, enabled=True, max_age=1800):
+        self.driver = driver
+        self.username = username
+        self.password = password
+        self.enabled = enabled
+        self.max_age = max_age
+        self._script_id = None
+
+    @staticmethod
+    def origin(url):
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    @staticmethod
+    def in_scope(domain, host):
+        """La cookie (dominio '.avtest.ink' o 'nuxqa3.avtest.ink') se envía al host"""
+        domain = domain.lstrip(".")
+        return host == domain or host.endswith("." + domain)
+
+    # ===== PUNTO DE ENTRADA =====
+
+    def ensure(self, site_url):
+        """Dejar el driver autenticado en site_url; devuelve cómo se consiguió: restored o login"""
+        key = (self.origin(site_url), self.username)
+        snapshot = self._snapshots.get(key) if self.enabled else None
+
+        if snapshot is not None:
+            reason = self.expired_reason(snapshot)
+            if reason is None:
+                self.restore(snapshot, site_url)
+                if self.is_logged_in(snapshot):
+                    SessionCache.restores += 1
+                    logger.info(f"🔑 Sesión restaurada desde la caché ({self.username} en {key[0]})")
+                    return "restored"
+                reason = "el sitio no aceptó la sesión restaurada"
+
+            # Caducada o rechazada: se descarta y se hace login de nuevo sin que el test se entere
+            logger.info(f"🔄 Sesión en caché descartada ({reason}): login de nuevo")
+            self.invalidate(site_url)
+            self.release()
+            self._clear_cookies()
+
+        self.login(site_url)
+        return "login"
+
+    def invalidate(self, site_url):
+        with self._lock:
+            self._snapshots.pop((self.origin(site_url), self.username), None)
+
+    def release(self):
+        """Quitar el script de restauración del driver (antes de devolverlo al pool)"""
+        if self._script_id is None:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._script_id})
+        except WebDriverException as e:
+            logger.debug(f"No se pudo quitar el script de restauración: {e}")
+        self._script_id = None
+
+    # ===== LOGIN Y SNAPSHOT =====
+
+    def login(self, site_url):
+        """Login completo por la UI (pestaña de hydra) y snapshot de cookies y storage de ambos orígenes"""
+        from pages.login_page import LoginPage
+
+        started = time.time()
+        site_host = urlparse(site_url).netloc
+        self.driver.get(site_url)
+        main_window = self.driver.current_window_handle
+        before = self._cookies()
+
+        login_page = LoginPage(self.driver)
+        steps = [
+            ("botón 'Iniciar sesión'", login_page.click_login_button),
+            ("usuario", lambda: login_page.enter_username(self.username)),
+            ("contraseña", lambda: login_page.enter_password(self.password)),
+            ("botón de login del modal", login_page.click_modal_login_button)
+        ]
+        for name, step in steps:
+            if not step():
+                raise AssertionError(f"❌ Falló el login por la UI en el paso: {name}")
+
+        try:
+            WebDriverWait(self.driver, 20).until(self._login_finished)
+        except TimeoutException:
+            raise AssertionError("❌ El login en hydra no terminó: el formulario sigue en pantalla")
+
+        # Estado de hydra mientras su pestaña siga abierta
+        cookies, storage = {}, {}
+        try:
+            if urlparse(self.driver.current_url).netloc == self.LOGIN_HOST:
+                cookies.update(self._cookies())
+                storage[self.LOGIN_HOST] = self._storage()
+        except WebDriverException:
+            pass
+
+        # Volver a la pestaña del sitio y cerrar las demás
+        for handle in self.driver.window_handles:
+            if handle != main_window:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        self.driver.switch_to.window(main_window)
+        self.driver.get(site_url)
+        cookies.update(self._cookies())
+        storage[site_host] = self._storage()
+
+        hosts = (site_host, self.LOGIN_HOST)
+        cookies = {k: c for k, c in cookies.items() if any(self.in_scope(c["domain"], h) for h in hosts)}
+        snapshot = {
+            "site_host": site_host,
+            "created": time.time(),
+            "cookies": list(cookies.values()),
+            "storage": storage,
+            # Cookies que puso el login: son las que deciden si la sesión sigue viva
+            "auth_cookies": sorted(k for k, c in cookies.items() if before.get(k, {}).get("value") != c["value"])
+        }
+        if not self.is_logged_in(snapshot):
+            raise AssertionError("❌ Tras el login el sitio sigue mostrando el botón 'Iniciar sesión'")
+
+        if self.enabled:
+            with self._lock:
+                self._snapshots[(self.origin(site_url), self.username)] = snapshot
+        SessionCache.logins += 1
+        logger.info(f"🔐 Login por la UI en {time.time() - started:.1f}s ({len(snapshot['cookies'])} cookies, "
+                    f"{len(snapshot['auth_cookies'])} de sesión)")
+
+    def _login_finished(self, driver):
+        """La pestaña de hydra se cerró, volvió al sitio o ya no muestra el formulario"""
+        try:
+            if self.LOGIN_HOST not in driver.current_url:
+                return True
+            return not driver.execute_script(LOGIN_FORM_SCRIPT)
+        except WebDriverException:
+            return True
+
+    def _cookies(self):
+        """Cookies por (dominio, nombre): todas las del navegador con CDP, las del documento actual si no"""
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            try:
+                raw = self.driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+                cookies = []
+                for c in raw:
+                    cookie = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly") if k in c}
+                    if c.get("sameSite"):
+                        cookie["sameSite"] = c["sameSite"]
+                    if c.get("expires", -1) > 0:
+                        cookie["expiry"] = int(c["expires"])
+                    cookies.append(cookie)
+                return {(c["domain"], c["name"]): c for c in cookies}
+            except WebDriverException as e:
+                logger.debug(f"Network.getAllCookies no disponible: {e}")
+        return {(c["domain"], c["name"]): c for c in self.driver.get_cookies()}
+
+    def _storage(self):
+        storage = self.driver.execute_script(STORAGE_SCRIPT) or {"local": {}, "session": {}}
+        storage["session"].pop(self.RESTORED_FLAG, None)
+        return storage
+
+    def _clear_cookies(self):
+        try:
+            if hasattr(self.driver, "execute_cdp_cmd"):
+                self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            else:
+                self.driver.delete_all_cookies()
+        except WebDriverException as e:
+            logger.debug(f"No se pudieron borrar las cookies: {e}")
+
+    # ===== CADUCIDAD Y VALIDACIÓN =====
+
+    def expired_reason(self, snapshot):
+        """Motivo por el que el snapshot ya no sirve, o None si sigue vigente"""
+        now = time.time()
+        if now - snapshot["created"] > self.max_age:
+            return f"más de {self.max_age}s desde el login"
+        auth = {tuple(k) for k in snapshot["auth_cookies"]}
+        for cookie in snapshot["cookies"]:
+            if (cookie["domain"], cookie["name"]) in auth and cookie.get("expiry") and cookie["expiry"] < now + self.EXPIRY_MARGIN:
+                return f"la cookie {cookie['name']} caduca"
+        return None
+
+    def is_logged_in(self, snapshot, timeout=15):
+        """El widget de sesión del sitio muestra la sesión (o al menos no el botón de login) y siguen las cookies del login"""
+        from pages.base_page import BasePage
+
+        # Justo después de driver.get Angular aún no pintó #auth-component: sin esperar, solo quedaría
+        # comprobar las cookies que se acaban de escribir, que siempre están
+        BasePage(self.driver).wait_for_angular_stable(timeout=timeout)
+        try:
+            state = WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(self._auth_state)
+        except TimeoutException:
+            logger.warning("⚠️  El widget de sesión no apareció: la sesión se da por no válida")
+            return False
+        if state["profile"]:
+            return True
+        if state["auth_text"].lower() in self.LOGGED_OUT_LABELS:
+            return False
+        # El servidor borra las cookies de sesión que no acepta
+        present = set(self._cookies())
+        return all(tuple(k) in present for k in snapshot["auth_cookies"]
+                   if self.in_scope(k[0], snapshot["site_host"]))
+
+    def _auth_state(self, driver):
+        """Estado del widget de sesión en cuanto está renderizado (False mientras no lo esté)"""
+        state = driver.execute_script(SESSION_STATE_SCRIPT)
+        return state if state["profile"] or state["auth_text"] else False
+
+    # ===== RESTAURACIÓN =====
+
+    def restore(self, snapshot, site_url):
+        """Escribir cookies y storage del snapshot y cargar el sitio (una sola carga con CDP)"""
+        storage_script = RESTORE_STORAGE_SCRIPT % (json.dumps(snapshot["storage"]), json.dumps(self.RESTORED_FLAG))
+
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            try:
+                cookies = []
+                for c in snapshot["cookies"]:
+                    cookie = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if k in c}
+                    if c.get("expiry"):
+                        cookie["expires"] = c["expiry"]
+                    cookies.append(cookie)
+                self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+                # El script queda registrado hasta release(): así también llega el storage de hydra si el test abre su pestaña
+                self.release()
+                self._script_id = self.driver.execute_cdp_cmd(
+                    "Page.addScriptToEvaluateOnNewDocument", {"source": storage_script})["identifier"]
+                self.driver.get(site_url)
+                return
+            except WebDriverException as e:
+                logger.debug(f"Restauración por CDP no disponible, visitando cada origen: {e}")
+
+        # Sin CDP: cada origen se visita para poder escribir sus cookies y su storage
+        site_host = urlparse(site_url).netloc
+        for host in (self.LOGIN_HOST, site_host):
+            cookies = [c for c in snapshot["cookies"] if self.in_scope(c["domain"], host)]
+            if not cookies and host not in snapshot["storage"]:
+                continue
+            self.driver.get(site_url if host == site_host else f"https://{host}/")
+            for cookie in cookies:
+                self.driver.add_cookie(cookie)
+            self.driver.execute_script(storage_script)
+        self.driver.get(site_url)
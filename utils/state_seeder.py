@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from selenium.common.exceptions import WebDriverException
+from config.config import Config
+from utils.locator_cache import LocatorCache
+
+logger = logging.getLogger(__name__)
+
+
+# Estado observable en una sola llamada: ruta, idioma del documento y texto del selector de POS
+STATE_SCRIPT = """
+var pos = document.getElementById('pointOfSaleSelectorId');
+return {
+    path: location.pathname,
+    lang: (document.documentElement.lang || '').toLowerCase(),
+    pos: pos ? (pos.innerText || pos.textContent || '').trim() : null
+};
+"""
+
+# Copia del localStorage del origen actual
+STORAGE_SCRIPT = """
+var out = {};
+for (var i = 0; i < localStorage.length; i++) { var key = localStorage.key(i); out[key] = localStorage.getItem(key); }
+return out;
+"""
+
+# Escribir claves en el localStorage (solo en el host indicado: el script corre también en iframes de terceros)
+SEED_STORAGE_SCRIPT = """
+(function (host, items) {
+    if (location.host !== host) { return; }
+    Object.keys(items).forEach(function (key) { localStorage.setItem(key, items[key]); });
+})(%s, %s);
+"""
+
+
+class StateSeeder:
+    """Llevar el navegador a un entorno/idioma/POS directamente (ruta + cookies/localStorage) en lugar de usar los dropdowns"""
+
+    LANGUAGES = {
+        'español': 'es', 'english': 'en', 'français': 'fr', 'francais': 'fr', 'português': 'pt', 'portugues': 'pt'
+    }
+
+    # Segundos tras los que un archivo de bloqueo se considera abandonado (worker caído a mitad de escritura)
+    STALE_LOCK_SECONDS = 30
+
+    def __init__(self, driver, seeds_path=Config.STATE_SEEDS_PATH):
+        self.driver = driver
+        self.seeds_path = seeds_path
+
+    @classmethod
+    def language_code(cls, language):
+        code = cls.LANGUAGES.get(language.lower(), language.lower())
+        if code not in cls.LANGUAGES.values():
+            raise ValueError(f"Idioma no soportado: {language}")
+        return code
+
+    @staticmethod
+    def language_url(base_url, code):
+        """URL de la home en un idioma: https://nuxqa4.avtest.ink/ + es -> https://nuxqa4.avtest.ink/es/"""
+        parsed = urlparse(base_url)
+        return f"{parsed.scheme}://{parsed.netloc}/{code}/"
+
+    def current_state(self):
+        """Estado actual con una sola llamada al navegador"""
+        return self.driver.execute_script(STATE_SCRIPT)
+
+    @staticmethod
+    def matches(state, code, pos=None):
+        """La ruta empieza por el idioma y, si se pidió, el selector de POS muestra el país"""
+        segments = [s for s in state["path"].split("/") if s]
+        if not segments or segments[0].lower() != code:
+            return False
+        return pos is None or (state["pos"] is not None and pos.lower() in state["pos"].lower())
+
+    # ===== SEMILLAS DE POS APRENDIDAS =====
+
+    def _load_seeds(self):
+        if not os.path.exists(self.seeds_path):
+            return {}
+        try:
+            with open(self.seeds_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Semillas de estado ilegibles, se ignoran: {e}")
+            return {}
+
+    @contextmanager
+    def _file_lock(self, timeout=10):
+        """Bloqueo entre procesos (workers de xdist) con un archivo creado en exclusiva"""
+        lock_path = f"{self.seeds_path}.lock"
+        deadline = time.time() + timeout
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > self.STALE_LOCK_SECONDS:
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue  # Otro proceso lo acaba de soltar
+                if time.time() > deadline:
+                    raise TimeoutError(f"No se pudo bloquear {self.seeds_path} en {timeout}s")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+    def _save_seed(self, key, seed):
+        """Guardar la semilla de forma atómica: leer, fusionar y reemplazar con el archivo bloqueado"""
+        os.makedirs(os.path.dirname(self.seeds_path), exist_ok=True)
+        with self._file_lock():
+            seeds = self._load_seeds()
+            seeds[key] = seed
+            tmp_path = f"{self.seeds_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(seeds, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.seeds_path)
+
+    def _snapshot(self):
+        """Cookies y localStorage del origen actual"""
+        return {
+            "cookies": {c["name"]: c for c in self.driver.get_cookies()},
+            "local_storage": self.driver.execute_script(STORAGE_SCRIPT) or {}
+        }
+
+    @staticmethod
+    def _delta(before, after):
+        """Lo que cambió el selector de POS: cookies y claves de localStorage nuevas o modificadas"""
+        cookies = [c for name, c in after["cookies"].items()
+                   if before["cookies"].get(name, {}).get("value") != c.get("value")]
+        storage = {k: v for k, v in after["local_storage"].items() if before["local_storage"].get(k) != v}
+        return {"cookies": cookies, "local_storage": storage}
+
+    # ===== SEMBRADO =====
+
+    def seed(self, base_url, language="español", pos=None):
+        """Dejar el navegador en la home del idioma (y POS) pedido; devuelve cómo se consiguió: route, storage o ui"""
+        from pages.base_page import BasePage
+
+        code = self.language_code(language)
+        url = self.language_url(base_url, code)
+        environment, _ = LocatorCache.context_from_url(url)
+        seed = self._load_seeds().get(f"{environment}|{pos}") if pos else None
+
+        if seed:
+            self._navigate_with_seed(url, seed)
+        else:
+            self.driver.get(url)
+
+        # Angular pinta el selector de POS después de la carga: leer el estado antes daría pos=None
+        page = BasePage(self.driver)
+        page.wait_for_angular_stable()
+        if pos:
+            page.wait_for_condition(lambda driver: self.current_state()["pos"], timeout=5, name="pos_selector")
+
+        state = self.current_state()
+        if self.matches(state, code, pos):
+            method = "storage" if seed else "route"
+            logger.info(f"🌱 Estado sembrado ({method}): {environment} / {code}" + (f" / {pos}" if pos else ""))
+            return method
+
+        if not self.matches(state, code):
+            raise AssertionError(f"La ruta /{code}/ no dejó el sitio en ese idioma: {state}")
+
+        # POS sin semilla (o semilla caducada): cambio por la UI y se aprende lo que guardó el sitio
+        self._seed_pos_via_ui(environment, pos)
+        return "ui"
+
+    def _navigate_with_seed(self, url, seed):
+        """Aplicar cookies y localStorage antes de que cargue la app (una sola carga con CDP; si no, carga + recarga)"""
+        host = urlparse(url).netloc
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            try:
+                for cookie in seed["cookies"]:
+                    self.driver.execute_cdp_cmd("Network.setCookie", {
+                        "name": cookie["name"], "value": cookie["value"], "url": url,
+                        "path": cookie.get("path", "/"), "secure": cookie.get("secure", False)
+                    })
+                script = SEED_STORAGE_SCRIPT % (json.dumps(host), json.dumps(seed["local_storage"]))
+                identifier = self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})["identifier"]
+                try:
+                    self.driver.get(url)
+                finally:
+                    self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+                return
+            except WebDriverException as e:
+                logger.debug(f"Sembrado por CDP no disponible, usando recarga: {e}")
+
+        self.driver.get(url)
+        for cookie in seed["cookies"]:
+            self.driver.add_cookie({k: v for k, v in cookie.items() if k in ("name", "value", "path", "secure", "expiry")})
+        self.driver.execute_script(SEED_STORAGE_SCRIPT % (json.dumps(host), json.dumps(seed["local_storage"])))
+        self.driver.refresh()
+
+    def _seed_pos_via_ui(self, environment, pos):
+        """Cambiar el POS con el dropdown y guardar el cambio de estado para las próximas veces"""
+        from pages.home_page import HomePage
+
+        logger.info(f"🐢 POS '{pos}' sin semilla para {environment}: cambiando por la UI")
+        before = self._snapshot()
+        home_page = HomePage(self.driver)
+        home_page.select_pos(pos)
+        if not home_page.verify_pos_changed(pos):
+            raise AssertionError(f"No se pudo cambiar el POS a {pos}")
+
+        delta = self._delta(before, self._snapshot())
+        if delta["cookies"] or delta["local_storage"]:
+            self._save_seed(f"{environment}|{pos}", delta)
+            logger.info(f"🌱 Semilla aprendida para {environment}|{pos}: "
+                        f"{len(delta['cookies'])} cookies, {len(delta['local_storage'])} claves de localStorage")
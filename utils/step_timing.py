@@ -0,0 +1,218 @@
+import os
+import time
+import inspect
+import logging
+import pkgutil
+import importlib
+import functools
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StepTimer:
+    """Desglose del tiempo de cada test: comandos WebDriver, esperas, sleeps, screenshots, pasos de Allure y métodos de page objects"""
+
+    # Categorías "hoja": su tiempo propio se suma al test y a todos los métodos/pasos que las contienen
+    CATEGORIES = ("command", "screenshot", "wait", "sleep")
+    SCREENSHOT_COMMANDS = {"screenshot", "elementScreenshot", "fullPageScreenshot"}
+    # Los scripts asíncronos del proyecto son esperas que resuelven en el navegador (BasePage.wait_for_*)
+    WAIT_COMMANDS = {"executeAsyncScript", "w3cExecuteScriptAsync"}
+
+    installed = False
+    run_id = None
+    current = None
+    # TraceRecorder activo (--trace-dir): recibe cada intervalo medido, de cualquier hilo
+    tracer = None
+
+    _local = threading.local()
+    _original_sleep = time.sleep
+
+    # ===== INSTALACIÓN =====
+
+    @classmethod
+    def install(cls, pages_dir="pages"):
+        """Instrumentar comandos, esperas, sleeps, pasos de Allure y todos los page objects (una vez por proceso)"""
+        if cls.installed:
+            return
+        cls.installed = True
+        # El controlador fija el run_id en el entorno antes de lanzar los workers de xdist
+        cls.run_id = os.environ.setdefault("STEP_TIMING_RUN_ID", datetime.now().strftime("%Y%m%d_%H%M%S"))
+
+        from selenium.webdriver.remote.remote_connection import RemoteConnection
+        from selenium.webdriver.support.wait import WebDriverWait
+
+        original_execute = RemoteConnection.execute
+
+        @functools.wraps(original_execute)
+        def execute(connection, command, params):
+            kind = ("screenshot" if command in cls.SCREENSHOT_COMMANDS
+                    else "wait" if command in cls.WAIT_COMMANDS else "command")
+            with cls.measure(kind, command):
+                return original_execute(connection, command, params)
+
+        RemoteConnection.execute = execute
+
+        for method in ("until", "until_not"):
+            original = getattr(WebDriverWait, method)
+            setattr(WebDriverWait, method, cls._wrap(original, f"WebDriverWait.{method}", kind="wait"))
+
+        def sleep(seconds):
+            # El sondeo de WebDriverWait ya cuenta como espera
+            stack = cls._stack()
+            if stack and stack[-1][0] == "wait":
+                return cls._original_sleep(seconds)
+            with cls.measure("sleep", "time.sleep"):
+                return cls._original_sleep(seconds)
+
+        time.sleep = sleep
+
+        cls._install_allure_hooks()
+        cls.instrument_page_objects(pages_dir)
+
+    @classmethod
+    def _install_allure_hooks(cls):
+        try:
+            from allure_commons import hookimpl, plugin_manager
+        except ImportError:
+            return
+
+        class AllureStepHooks:
+            frames = {}
+
+            @hookimpl
+            def start_step(self, uuid, title, params):
+                self.frames[uuid] = cls._enter("step", title)
+
+            @hookimpl
+            def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+                frame = self.frames.pop(uuid, None)
+                if frame is not None:
+                    cls._exit(frame)
+
+        plugin_manager.register(AllureStepHooks())
+
+    @classmethod
+    def instrument_page_objects(cls, pages_dir="pages"):
+        """Envolver los métodos de BasePage y de cada página de pages/"""
+        for module_info in pkgutil.iter_modules([pages_dir]):
+            module = importlib.import_module(f"{os.path.basename(pages_dir)}.{module_info.name}")
+            for _, klass in inspect.getmembers(module, inspect.isclass):
+                if klass.__module__ == module.__name__ and klass.__name__.endswith("Page"):
+                    cls.instrument_class(klass)
+
+    @classmethod
+    def instrument_class(cls, klass):
+        for attr, value in list(vars(klass).items()):
+            if attr.startswith("__") or not inspect.isfunction(value) or getattr(value, "_step_timed", False):
+                continue
+            setattr(klass, attr, cls._wrap(value, f"{klass.__name__}.{attr}"))
+
+    @classmethod
+    def _wrap(cls, func, name, kind="method"):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            with cls.measure(kind, name):
+                return func(*args, **kwargs)
+
+        timed._step_timed = True
+        return timed
+
+    # ===== MEDICIÓN =====
+
+    @classmethod
+    def _stack(cls):
+        if not hasattr(cls._local, "stack"):
+            cls._local.stack = []
+        return cls._local.stack
+
+    @classmethod
+    def _enter(cls, kind, name):
+        # Solo el hilo del test suma al desglose: los hilos de video/CDP corren en paralelo (la traza sí los muestra)
+        main = threading.current_thread() is threading.main_thread()
+        if cls.current is None or (not main and cls.tracer is None):
+            return None
+        frame = [kind, name, time.perf_counter(), 0.0, main]
+        cls._stack().append(frame)
+        return frame
+
+    @classmethod
+    def _exit(cls, frame):
+        if frame is None:
+            return
+        stack = cls._stack()
+        if stack and stack[-1] is frame:
+            stack.pop()
+        else:
+            stack[:] = [f for f in stack if f is not frame]
+
+        kind, name = frame[0], frame[1]
+        elapsed = time.perf_counter() - frame[2]
+        if cls.tracer is not None:
+            cls.tracer.span(kind, name, frame[2], elapsed)
+        if cls.current is None or not frame[4]:
+            return
+
+        own = max(elapsed - frame[3], 0.0)
+        if stack:
+            stack[-1][3] += elapsed
+
+        entries = cls.current["entries"]
+        if kind in ("method", "step"):
+            entry = entries.setdefault((kind, name), cls._new_entry())
+            entry["calls"] += 1
+            entry["self"] += own
+            # Recursión: el total inclusivo solo se cuenta en la llamada más externa
+            if not any(f[0] == kind and f[1] == name for f in stack):
+                entry["total"] += elapsed
+        else:
+            cls.current["categories"][kind] += own
+            # El tiempo de la hoja se reparte a cada método/paso distinto que la contiene
+            for key in {(f[0], f[1]) for f in stack if f[0] in ("method", "step")}:
+                entries.setdefault(key, cls._new_entry())[kind] += own
+
+    @classmethod
+    @contextmanager
+    def measure(cls, kind, name):
+        frame = cls._enter(kind, name)
+        try:
+            yield
+        finally:
+            cls._exit(frame)
+
+    @classmethod
+    def _new_entry(cls):
+        entry = {"calls": 0, "total": 0.0, "self": 0.0}
+        entry.update({category: 0.0 for category in cls.CATEGORIES})
+        return entry
+
+    # ===== POR TEST =====
+
+    @classmethod
+    def start_test(cls, test_name):
+        cls._stack().clear()
+        cls.current = {
+            "test": test_name,
+            "started": time.perf_counter(),
+            "categories": {category: 0.0 for category in cls.CATEGORIES},
+            "entries": {}
+        }
+
+    @classmethod
+    def finish_test(cls):
+        """Cerrar el test en curso y devolver sus filas para step_timings"""
+        if cls.current is None:
+            return []
+        current, cls.current = cls.current, None
+        wall = time.perf_counter() - current["started"]
+        categories = current["categories"]
+
+        test_row = {"kind": "test", "name": current["test"], "calls": 1, "total": wall,
+                    "self": max(wall - sum(categories.values()), 0.0)}
+        test_row.update(categories)
+        rows = [test_row]
+        for (kind, name), entry in current["entries"].items():
+            rows.append(dict(entry, kind=kind, name=name))
+        return [dict(row, test_name=current["test"]) for row in rows]
@@ -0,0 +1,217 @@
+import os
+import json
+import time
+import random
+import logging
+import threading
+from string import Template
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+# Textos por idioma (los que los page objects buscan: 'Ofertas' / 'Book' / 'Vols' / 'Voos', 'Confirmer', 'Sélectionnez'...)
+LABELS = {
+    "es": {
+        "lang_label": "ES", "title": "avianca - Vuelos baratos", "login": "Iniciar sesión",
+        "nav_offers": "Ofertas y destinos", "nav_booking": "Tu reserva / Check-in", "nav_info": "Información y ayuda",
+        "link_flight_offers": "Ofertas de vuelos", "link_destinations": "Destinos", "link_customize": "Personaliza tu viaje",
+        "link_fares": "Tipos de tarifa", "offers_title": "Ofertas desde Bogotá", "round_trip": "Ida y vuelta",
+        "one_way": "Solo ida", "origin": "Origen", "destination": "Destino", "departure_date": "Fecha de ida",
+        "return_date": "Fecha de vuelta", "passengers": "Pasajeros", "adult": "Adulto", "adults": "Adultos",
+        "youth": "Jóvenes", "children": "Niños", "infants": "Infantes", "confirm": "Confirmar", "search": "Buscar",
+        "apply": "Aplicar", "select_flight": "Seleccionar vuelo de ida", "return_flight": "Vuelta: selecciona tu regreso",
+        "choose_fare": "Elegir tarifa", "select": "Seleccionar"
+    },
+    "en": {
+        "lang_label": "EN", "title": "avianca - Book cheap flights", "login": "Log in",
+        "nav_offers": "Offers and destinations", "nav_booking": "Your booking / Check-in", "nav_info": "Information and help",
+        "link_flight_offers": "Flight offers", "link_destinations": "Destinations", "link_customize": "Customize your trip",
+        "link_fares": "Fares", "offers_title": "Offers from Bogotá", "round_trip": "Round trip",
+        "one_way": "One way", "origin": "Origin", "destination": "Destination", "departure_date": "Departure date",
+        "return_date": "Return date", "passengers": "Passengers", "adult": "Adult", "adults": "Adults",
+        "youth": "Youth", "children": "Children", "infants": "Infants", "confirm": "Confirm", "search": "Book",
+        "apply": "Apply", "select_flight": "Select your departing flight", "return_flight": "Return: select your flight back",
+        "choose_fare": "Choose fare", "select": "Select"
+    },
+    "fr": {
+        "lang_label": "FR", "title": "avianca - Vols pas chers", "login": "Se connecter",
+        "nav_offers": "Offres et destinations", "nav_booking": "Votre réservation / Check-in", "nav_info": "Informations et aide",
+        "link_flight_offers": "Offres de vols", "link_destinations": "Destinations", "link_customize": "Personnalisez votre voyage",
+        "link_fares": "Tarifs", "offers_title": "Offres de Vols depuis Bogotá", "round_trip": "Aller-retour",
+        "one_way": "Un seul trajet", "origin": "Origine", "destination": "Destination", "departure_date": "Date de départ",
+        "return_date": "Date de retour", "passengers": "Passagers", "adult": "Adulte", "adults": "Adultes",
+        "youth": "Jeunes", "children": "Enfants", "infants": "Bébés", "confirm": "Confirmer", "search": "Rechercher",
+        "apply": "Appliquer", "select_flight": "Sélectionnez votre vol aller", "return_flight": "Retour : sélectionnez votre vol",
+        "choose_fare": "Choisir le tarif", "select": "Sélectionner"
+    },
+    "pt": {
+        "lang_label": "PT", "title": "avianca - Voos baratos", "login": "Entrar",
+        "nav_offers": "Ofertas e destinos", "nav_booking": "Sua reserva / Check-in", "nav_info": "Informação e ajuda",
+        "link_flight_offers": "Ofertas de voos", "link_destinations": "Destinos", "link_customize": "Personalize sua viagem",
+        "link_fares": "Tarifas", "offers_title": "Voos desde Bogotá", "round_trip": "Ida e volta",
+        "one_way": "Só ida", "origin": "Origem", "destination": "Destino", "departure_date": "Data de ida",
+        "return_date": "Data de volta", "passengers": "Passageiros", "adult": "Adulto", "adults": "Adultos",
+        "youth": "Jovens", "children": "Crianças", "infants": "Bebês", "confirm": "Confirmar", "search": "Buscar",
+        "apply": "Aplicar", "select_flight": "Selecione seu voo de ida", "return_flight": "Volta: selecione seu voo",
+        "choose_fare": "Escolher tarifa", "select": "Selecionar"
+    }
+}
+
+# Páginas destino del header y del footer (ruta sin idioma -> título h1)
+PAGES = {
+    "ofertas-destinos/ofertas-de-vuelos": "Ofertas de vuelos - Vuelos baratos",
+    "ofertas-destinos/destinos": "Destinos",
+    "check-in": "Check-in online",
+    "check-in/personaliza-tu-viaje": "Personaliza tu viaje",
+    "tarifas-avianca": "Tarifas avianca: tipos de tarifa",
+    "sobre-nosotros/somos-avianca": "Somos avianca",
+    "portales-aliados/aviancadirect-ndc": "aviancadirect NDC",
+    "informacion-legal/informacion-legal": "Información legal"
+}
+
+STATIONS = [
+    {"code": "BOG", "name": "Bogotá"}, {"code": "MDE", "name": "Medellín"}, {"code": "CLO", "name": "Cali"},
+    {"code": "CTG", "name": "Cartagena"}, {"code": "BAQ", "name": "Barranquilla"}, {"code": "SMR", "name": "Santa Marta"},
+    {"code": "MAD", "name": "Madrid"}, {"code": "SCL", "name": "Santiago de Chile"}, {"code": "LIM", "name": "Lima"}
+]
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """Rutas del sitio sintético: documentos, estáticos y API"""
+
+    def do_GET(self):
+        site = self.server.site
+        parsed = urlparse(self.path)
+        site.delay(parsed.path)
+
+        if parsed.path.startswith("/static/"):
+            self._static(parsed.path[len("/static/"):])
+        elif parsed.path.startswith("/api/"):
+            self._api(parsed.path, {k: v[0] for k, v in parse_qs(parsed.query).items()})
+        else:
+            status, html = site.render(parsed.path)
+            self._send(status, "text/html; charset=utf-8", html.encode("utf-8"))
+
+    def _static(self, name):
+        path = os.path.join(self.server.site.root, "static", os.path.basename(name))
+        if not os.path.isfile(path):
+            self._send(404, "text/plain", b"not found")
+            return
+        content_type = "text/css" if path.endswith(".css") else "application/javascript"
+        with open(path, "rb") as f:
+            self._send(200, content_type, f.read())
+
+    def _api(self, path, params):
+        site = self.server.site
+        if path == "/api/stations":
+            query = params.get("q", "").lower()
+            data = [s for s in STATIONS if query in s["code"].lower() or query in s["name"].lower()]
+        elif path == "/api/flights":
+            data = site.journeys(params.get("leg", "outbound"))
+        elif path == "/api/pos":
+            data = {"country": params.get("country", "Colombia")}
+        else:
+            self._send(404, "application/json", b"{}")
+            return
+        self._send(200, "application/json", json.dumps(data).encode("utf-8"))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"synthetic {self.address_string()} {format % args}")
+
+
+class SyntheticSite:
+    """Sitio local que reproduce los contratos de DOM de HomePage, con latencia, jitter y spinners por endpoint"""
+
+    # Perfil por prefijo de ruta (gana el más largo): latencia del servidor, jitter y duración del spinner en el cliente
+    DEFAULT_PROFILE = {"latency_ms": 0, "jitter_ms": 0, "spinner_ms": 0}
+
+    def __init__(self, root="synthetic_site", host="127.0.0.1", port=0, profiles=None, seed=0):
+        self.root = root
+        self.profiles = {}
+        for prefix, profile in (profiles or {}).items():
+            self.set_profile(prefix, **profile)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests_served = 0
+        self.delay_total = 0.0
+        with open(os.path.join(root, "layout.html"), encoding="utf-8") as f:
+            self._layout = Template(f.read())
+        with open(os.path.join(root, "home.html"), encoding="utf-8") as f:
+            self._home = Template(f.read())
+        self.httpd = ThreadingHTTPServer((host, port), _SiteHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.site = self
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/"
+        self._thread = None
+
+    def set_profile(self, prefix, latency_ms=0, jitter_ms=0, spinner_ms=0):
+        """Configurar un endpoint, p.ej. set_profile('/api/flights', latency_ms=400, jitter_ms=100, spinner_ms=800)"""
+        self.profiles[prefix] = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "spinner_ms": spinner_ms}
+
+    def profile_for(self, path):
+        matches = [prefix for prefix in self.profiles if path.startswith(prefix)]
+        return self.profiles[max(matches, key=len)] if matches else self.DEFAULT_PROFILE
+
+    def delay(self, path):
+        """Aplicar la latencia (con jitter reproducible) del endpoint antes de responder"""
+        profile = self.profile_for(path)
+        with self._lock:
+            jitter = self._random.uniform(-profile["jitter_ms"], profile["jitter_ms"]) if profile["jitter_ms"] else 0
+            self.requests_served += 1
+        seconds = max(profile["latency_ms"] + jitter, 0) / 1000.0
+        if seconds:
+            self.delay_total += seconds
+            time.sleep(seconds)
+
+    def render(self, path):
+        """Documento HTML para una ruta: home por idioma o página destino del header/footer"""
+        segments = [s for s in path.split("/") if s]
+        lang = segments[0] if segments and segments[0] in LABELS else "es"
+        rest = "/".join(segments[1:] if segments and segments[0] in LABELS else segments)
+        labels = LABELS[lang]
+
+        if not rest:
+            status, main = 200, self._home.safe_substitute(labels)
+        elif rest in PAGES:
+            status, main = 200, f"        <h1>{PAGES[rest]}</h1>"
+        else:
+            status, main = 404, "        <h1>404</h1>"
+
+        # Duración de los spinners por endpoint de API (la aplica site.js)
+        config = {
+            "lang": lang,
+            "labels": labels,
+            "spinners": {prefix: p["spinner_ms"] for prefix, p in self.profiles.items() if prefix.startswith("/api/")}
+        }
+        html = self._layout.safe_substitute(labels, lang=lang, main=main, config=json.dumps(config))
+        return status, html
+
+    def journeys(self, leg):
+        """Vuelos deterministas para la ida o la vuelta"""
+        origin, destination = ("BOG", "MDE") if leg == "outbound" else ("MDE", "BOG")
+        date = "2026-03-10" if leg == "outbound" else "2026-03-17"
+        return [
+            {"origin": origin, "destination": destination, "date": date,
+             "departure": f"{6 + 2 * i:02d}:{(i * 15) % 60:02d}", "price": f"COP {189900 + 25000 * i:,}"}
+            for i in range(6)
+        ]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="synthetic-site", daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Sitio sintético escuchando en {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
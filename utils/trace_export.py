@@ -0,0 +1,165 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+from utils.network_capture import NetworkCapture
+
+logger = logging.getLogger(__name__)
+
+
+class TraceRecorder:
+    """Línea de tiempo de cada test en formato Chrome Trace Event (se abre en ui.perfetto.dev o chrome://tracing)"""
+
+    # Pista (tid) y nombre de cada tipo de intervalo del hilo del test
+    TRACKS = {
+        "step": (1, "Pasos de Allure"),
+        "method": (2, "Page objects"),
+        "command": (3, "Comandos WebDriver"),
+        "wait": (4, "Esperas"),
+        "sleep": (5, "time.sleep"),
+        "screenshot": (6, "Screenshots y frames de video"),
+        "network": (7, "Red (CDP)")
+    }
+    # Los hilos de fondo (video, CDP) van cada uno en su propia pista a partir de este tid
+    BACKGROUND_TID = 100
+
+    def __init__(self, trace_dir):
+        self.trace_dir = trace_dir
+        self.test_name = None
+        self.events = []
+        self._lock = threading.Lock()
+        self._threads = {}
+        self._offset = 0.0
+        self._network_offset = None
+        self._requests = {}
+        self._capture = None
+        os.makedirs(trace_dir, exist_ok=True)
+
+    @staticmethod
+    def _us(epoch_seconds):
+        return int(epoch_seconds * 1_000_000)
+
+    # ===== POR TEST =====
+
+    def start(self, test_name):
+        with self._lock:
+            self.test_name = test_name
+            self.events = []
+            self._threads = {}
+            self._requests = {}
+            self._network_offset = None
+            # perf_counter -> epoch (los eventos de red y de video llegan con marca de tiempo epoch)
+            self._offset = time.time() - time.perf_counter()
+
+    def span(self, kind, name, started, elapsed):
+        """Intervalo medido por StepTimer (started en perf_counter)"""
+        if self.test_name is None:
+            return
+        thread = threading.current_thread()
+        with self._lock:
+            if thread is threading.main_thread():
+                tid = self.TRACKS[kind][0]
+            else:
+                tid = self._threads.setdefault(thread.name, self.BACKGROUND_TID + len(self._threads))
+            self.events.append({
+                "name": name, "cat": kind, "ph": "X", "pid": 1, "tid": tid,
+                "ts": self._us(started + self._offset), "dur": max(int(elapsed * 1_000_000), 1)
+            })
+
+    def instant(self, kind, name, epoch_seconds, args=None):
+        if self.test_name is None:
+            return
+        with self._lock:
+            self.events.append({
+                "name": name, "cat": kind, "ph": "i", "s": "t", "pid": 1, "tid": self.TRACKS[kind][0],
+                "ts": self._us(epoch_seconds), "args": args or {}
+            })
+
+    # ===== RED =====
+
+    def attach_network(self, driver):
+        """Recibir los eventos Network.* del driver del test (log de performance de Chrome)"""
+        self._capture = NetworkCapture.for_driver(driver)
+        self._capture.add_listener(self._on_network_event)
+
+    def detach_network(self):
+        if self._capture is None:
+            return
+        try:
+            self._capture.poll_events()
+        except Exception as e:
+            logger.debug(f"No se pudieron leer los eventos de red para la traza: {e}")
+        finally:
+            if self._on_network_event in self._capture.listeners:
+                self._capture.listeners.remove(self._on_network_event)
+            self._capture = None
+
+    def _on_network_event(self, method, params):
+        """Peticiones como eventos asíncronos (b/e): se solapan, así que no caben en una pista de intervalos"""
+        if self.test_name is None:
+            return
+        request_id = params.get("requestId")
+        timestamp = params.get("timestamp")
+        if method == "Network.requestWillBeSent":
+            # timestamp es monotónico del navegador; wallTime permite pasarlo a epoch
+            if self._network_offset is None and params.get("wallTime"):
+                self._network_offset = params["wallTime"] - timestamp
+            url = params.get("request", {}).get("url", "")
+            self._requests[request_id] = url
+            self._network_event("b", request_id, url, timestamp, {"method": params.get("request", {}).get("method"),
+                                                                   "type": params.get("type")})
+        elif method in ("Network.loadingFinished", "Network.loadingFailed") and request_id in self._requests:
+            args = {"bytes": params.get("encodedDataLength")} if method == "Network.loadingFinished" \
+                else {"error": params.get("errorText"), "blocked": params.get("blockedReason")}
+            self._network_event("e", request_id, self._requests.pop(request_id), timestamp, args)
+
+    def _network_event(self, phase, request_id, url, timestamp, args):
+        if self._network_offset is None or timestamp is None:
+            return
+        with self._lock:
+            self.events.append({
+                "name": url.split("?")[0][-80:], "cat": "network", "ph": phase, "id": request_id,
+                "pid": 1, "tid": self.TRACKS["network"][0], "ts": self._us(timestamp + self._network_offset), "args": args
+            })
+
+    # ===== EXPORTACIÓN =====
+
+    def finish(self):
+        """Escribir la traza del test en trace_dir; devuelve la ruta"""
+        if self.test_name is None:
+            return None
+        with self._lock:
+            test_name, events, threads = self.test_name, self.events, dict(self._threads)
+            self.test_name = None
+            self.events = []
+
+        metadata = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": test_name}}]
+        for tid, title in self.TRACKS.values():
+            metadata.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": title}})
+            metadata.append({"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": tid, "args": {"sort_index": tid}})
+        for thread_name, tid in threads.items():
+            metadata.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": f"Hilo {thread_name}"}})
+
+        events.sort(key=lambda e: e["ts"])
+        path = os.path.join(self.trace_dir, re.sub(r"[^\w\-.]+", "_", test_name).strip("_") + ".json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        logger.info(f"🧭 Traza del test ({len(events)} eventos): {path}")
+        return path
+
+    @classmethod
+    def instrument_video(cls, tracer):
+        """Marcar cada frame de video encolado (screencast o sondeo) como evento instantáneo"""
+        try:
+            from utils.video_recorder import VideoRecorder
+        except ImportError:
+            return
+        original_enqueue = VideoRecorder._enqueue
+
+        def _enqueue(recorder, data, frame_time):
+            tracer.instant("screenshot", "video frame", frame_time, {"mode": recorder.active_mode})
+            return original_enqueue(recorder, data, frame_time)
+
+        VideoRecorder._enqueue = _enqueue
@@ -1,13 +1,25 @@
 import cv2
 import os
 import time
+import base64
+import queue
+import threading
+from collections import deque
 from datetime import datetime
 import numpy as np
+from selenium.common.exceptions import WebDriverException
+from config.config import Config
+from utils.cdp_session import CdpSession
 
 class VideoRecorder:
     """Grabador de video REAL usando OpenCV"""
     
-    def __init__(self, test_name, browser_name, output_dir="videos"):
+    # screencast: Chrome empuja frames JPEG por CDP | polling: screenshots en segundo plano | manual: solo capture_frame
+    MODES = ("screencast", "polling", "manual")
+    
+    def __init__(self, test_name, browser_name, output_dir="videos", queue_size=30,
+                 mode=None, fps=None, max_width=None, max_height=None,
+                 retention=None, buffer_seconds=None):
         self.test_name = test_name
         self.browser_name = browser_name
         self.output_dir = output_dir
@@ -15,85 +27,290 @@ class VideoRecorder:
         self.recording = False
         self.frame_size = None
         
+        # Configuración de la grabación continua
+        self.mode = mode or Config.VIDEO_MODE
+        self.fps = fps or Config.VIDEO_FPS
+        self.max_width = max_width or Config.VIDEO_MAX_WIDTH
+        self.max_height = max_height or Config.VIDEO_MAX_HEIGHT
+        self.active_mode = "manual"
+        self.cdp = None
+        self.poll_thread = None
+        self.stop_polling = threading.Event()
+        
+        # Cola acotada entre el hilo del test (captura) y el hilo codificador (decodifica y escribe)
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.encoder_thread = None
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_duplicated = 0
+        
+        # Estado del remuestreo por timestamp (solo modos continuos)
+        self.last_data = None
+        self.last_frame = None
+        self.clock = None
+        self.stopped_at = None
+        
+        # Retención: always (se escribe todo) | on_failure (buffer circular en memoria, se escribe solo si falla)
+        self.retention = retention or Config.VIDEO_RETENTION
+        self.buffer_seconds = buffer_seconds or Config.VIDEO_BUFFER_SECONDS
+        self.buffer_max_bytes = Config.VIDEO_BUFFER_MAX_MB * 1024 * 1024
+        self.ring = deque()
+        self.ring_bytes = 0
+        
         # Crear directorio si no existe
         os.makedirs(output_dir, exist_ok=True)
     
-    def start_recording(self):
-        """Iniciar grabación de video REAL"""
+    def start_recording(self, driver=None):
+        """Iniciar grabación de video REAL (continua si se pasa el driver y el modo no es manual)"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             self.filename = f"{self.output_dir}/{self.test_name}_{self.browser_name}_{timestamp}.mp4"
             
             # Inicializar variables
             self.recording = True
-            self.frames = []
+            self.encoder_thread = threading.Thread(target=self._encode_frames, name=f"video-{self.test_name}", daemon=True)
+            self.encoder_thread.start()
             
-            print(f"🎥 Iniciando grabación de video REAL: {self.filename}")
+            if driver is not None and self.mode != "manual":
+                self._start_continuous(driver)
             
+            print(f"🎥 Iniciando grabación de video REAL ({self.active_mode}): {self.filename}")
+        
         except Exception as e:
             print(f"❌ Error iniciando grabación: {e}")
     
+    def _start_continuous(self, driver):
+        """Arrancar screencast CDP; si el navegador no lo soporta, sondear screenshots en segundo plano"""
+        # El modo se fija antes de arrancar el productor: el codificador lo consulta con el primer frame
+        if self.mode == "screencast":
+            self.active_mode = "screencast"
+            self.cdp = CdpSession(driver, name=f"screencast-{self.test_name}")
+            if self.cdp.start(self._screencast):
+                return
+            print(f"⚠️  Screencast CDP no disponible ({self.cdp.error or 'navegador sin CDP'}), usando sondeo de screenshots")
+            self.cdp = None
+        
+        self.active_mode = "polling"
+        self.poll_thread = threading.Thread(target=self._poll_screenshots, args=(driver,), name=f"video-poll-{self.test_name}", daemon=True)
+        self.poll_thread.start()
+    
+    async def _screencast(self, session, devtools):
+        """Recibir los frames que empuja Chrome (solo cuando cambia la pantalla) y confirmarlos"""
+        frames = session.listen(devtools.page.ScreencastFrame, buffer_size=self.frames.maxsize)
+        await session.execute(devtools.page.start_screencast(
+            format_="jpeg",
+            quality=Config.VIDEO_JPEG_QUALITY,
+            max_width=self.max_width,
+            max_height=self.max_height
+        ))
+        async for event in frames:
+            # Chrome no envía el siguiente frame hasta recibir el ack
+            await session.execute(devtools.page.screencast_frame_ack(session_id=event.session_id))
+            frame_time = event.metadata.timestamp
+            self._enqueue(event.data, float(frame_time) if frame_time else time.time())
+    
+    def _poll_screenshots(self, driver):
+        """Alternativa sin CDP: screenshot a la tasa configurada desde un hilo de fondo"""
+        interval = 1.0 / self.fps
+        while not self.stop_polling.is_set():
+            started = time.time()
+            try:
+                self._enqueue(driver.get_screenshot_as_png(), started)
+            except WebDriverException:
+                pass  # Navegación en curso o ventana cerrándose; se reintenta en el siguiente tick
+            self.stop_polling.wait(max(interval - (time.time() - started), 0))
+    
+    def _enqueue(self, data, frame_time):
+        """Encolar un frame sin bloquear al productor (se descarta si la cola está llena)"""
+        try:
+            self.frames.put_nowait((data, frame_time))
+        except queue.Full:
+            self.frames_dropped += 1
+    
     def capture_frame(self, driver):
-        """Capturar un frame REAL del navegador"""
-        if not self.recording:
+        """Capturar un frame REAL del navegador (solo el screenshot; se codifica en segundo plano)"""
+        if not self.recording or self.active_mode != "manual":
             return
-            
+        
         try:
-            # Tomar screenshot y guardar temporalmente
-            temp_filename = f"temp_frame_{int(time.time()*1000)}.png"
-            driver.save_screenshot(temp_filename)
+            # Screenshot en memoria: sin archivo temporal ni codificación en el hilo del test
+            png = driver.get_screenshot_as_png()
+            self.frames.put_nowait((png, time.time()))
+        except queue.Full:
+            self.frames_dropped += 1
+            print(f"⚠️  Cola de video llena, frame descartado ({self.frames_dropped} descartados)")
+        except Exception as e:
+            print(f"❌ Error capturando frame: {e}")
+    
+    def _encode_frames(self):
+        """Hilo codificador: decodificar los frames de la cola y escribirlos en el VideoWriter (o en el buffer circular)"""
+        while True:
+            data, frame_time = self.frames.get()
+            if data is None:
+                self.stopped_at = frame_time
+                break
             
-            # Leer la imagen con OpenCV
-            frame = cv2.imread(temp_filename)
+            # Deduplicación: un frame idéntico al anterior no se decodifica
+            if data == self.last_data:
+                self.frames_duplicated += 1
+                continue
+            self.last_data = data
             
-            if frame is not None:
-                # Si es el primer frame, configurar el tamaño del video
-                if self.frame_size is None:
-                    height, width = frame.shape[:2]
-                    self.frame_size = (width, height)
-                    
-                    # Configurar el video writer
-                    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-                    self.video_writer = cv2.VideoWriter(
-                        self.filename, 
-                        fourcc, 
-                        1.0,  # 1 frame por segundo
-                        self.frame_size
-                    )
-                    print(f"📏 Tamaño de video configurado: {self.frame_size}")
-                
-                # Escribir frame al video
-                self.video_writer.write(frame)
-                print(f"📹 Frame escrito al video")
+            if self.retention == "on_failure":
+                # Solo se guarda el frame comprimido; se codifica únicamente si el test falla
+                self._buffer_frame(data, frame_time)
+            else:
+                self._encode_frame(data, frame_time)
+        
+        if self.retention != "on_failure":
+            self._flush(self.stopped_at)
+    
+    def _buffer_frame(self, data, frame_time):
+        """Añadir un frame comprimido al buffer circular (últimos buffer_seconds, como máximo buffer_max_bytes)"""
+        self.ring.append((data, frame_time))
+        self.ring_bytes += len(data)
+        
+        # Se conserva un frame anterior a la ventana para que el video empiece con imagen
+        while len(self.ring) > 1 and (self.ring[1][1] <= frame_time - self.buffer_seconds or self.ring_bytes > self.buffer_max_bytes):
+            old_data, _ = self.ring.popleft()
+            self.ring_bytes -= len(old_data)
+    
+    def _encode_frame(self, data, frame_time):
+        """Decodificar un frame (PNG o JPEG en base64) y escribirlo respetando su timestamp"""
+        try:
+            raw = base64.b64decode(data) if isinstance(data, str) else data
+            frame = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                return
             
-            # Eliminar archivo temporal
-            if os.path.exists(temp_filename):
-                os.remove(temp_filename)
+            # Si es el primer frame, configurar el tamaño del video
+            if self.frame_size is None:
+                height, width = frame.shape[:2]
+                self.frame_size = (width, height)
                 
+                # Configurar el video writer
+                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                self.video_writer = cv2.VideoWriter(
+                    self.filename,
+                    fourcc,
+                    1.0 if self.active_mode == "manual" else float(self.fps),
+                    self.frame_size
+                )
+                print(f"📏 Tamaño de video configurado: {self.frame_size}")
+            elif (frame.shape[1], frame.shape[0]) != self.frame_size:
+                # La ventana cambió de tamaño (p.ej. screenshot de página completa)
+                frame = cv2.resize(frame, self.frame_size)
+            
+            if self.active_mode == "manual":
+                # 1 frame por captura explícita
+                self._write(frame)
+                return
+            
+            # Modos continuos: el frame anterior se repite hasta el timestamp del nuevo
+            if self.last_frame is None:
+                self.clock = frame_time
+            else:
+                self._write_until(frame_time)
+            self.last_frame = frame
         except Exception as e:
-            print(f"❌ Error capturando frame: {e}")
+            print(f"❌ Error codificando frame: {e}")
+    
+    def _flush(self, stopped_at):
+        """Mantener el último frame en pantalla hasta el instante de parada"""
+        if self.last_frame is not None and self.active_mode != "manual":
+            self._write_until(stopped_at)
+            self._write(self.last_frame)
+    
+    def _write_until(self, frame_time):
+        """Rellenar con el último frame los huecos de salida hasta frame_time (tasa fija self.fps)"""
+        step = 1.0 / self.fps
+        while self.clock + step <= frame_time:
+            self._write(self.last_frame)
+            self.clock += step
+    
+    def _write(self, frame):
+        self.video_writer.write(frame)
+        self.frames_written += 1
+    
+    def _stop_capture(self):
+        """Detener los productores y esperar a que el hilo codificador vacíe la cola"""
+        self.recording = False
+        stopped_at = time.time()
+        
+        if self.cdp is not None:
+            try:
+                self.cdp.execute(self.cdp.devtools.page.stop_screencast())
+            except Exception as e:
+                print(f"⚠️  No se pudo detener el screencast: {e}")
+            self.cdp.stop()
+        if self.poll_thread is not None:
+            self.stop_polling.set()
+            self.poll_thread.join()
+        
+        self.frames.put((None, stopped_at))
+        self.encoder_thread.join()
+    
+    def _finalize(self):
+        """Liberar el VideoWriter y comprobar que el archivo existe"""
+        if self.video_writer is None:
+            print("⚠️  No se capturó ningún frame, no se genera video")
+            return None
+        
+        # Liberar el video writer
+        self.video_writer.release()
+        
+        # Verificar que el archivo se creó
+        if os.path.exists(self.filename):
+            file_size = os.path.getsize(self.filename)
+            print(f"🎥 Video REAL guardado: {self.filename} ({self.frames_written} frames, "
+                  f"{self.frames_duplicated} duplicados, {self.frames_dropped} descartados, {file_size} bytes)")
+            return self.filename
+        else:
+            print("❌ El archivo de video no se creó")
+            return None
     
     def stop_recording(self):
-        """Detener grabación y guardar video REAL"""
-        if not self.recording or self.video_writer is None:
+        """Detener grabación y guardar video REAL (con retención on_failure solo se conserva el buffer)"""
+        if not self.recording:
             print("⚠️  No hay grabación activa para detener")
             return None
-            
+        
         try:
-            self.recording = False
+            self._stop_capture()
             
-            # Liberar el video writer
-            self.video_writer.release()
-            
-            # Verificar que el archivo se creó
-            if os.path.exists(self.filename):
-                file_size = os.path.getsize(self.filename)
-                print(f"🎥 Video REAL guardado: {self.filename} ({file_size} bytes)")
-                return self.filename
-            else:
-                print("❌ El archivo de video no se creó")
+            if self.retention == "on_failure":
+                print(f"🎞️  Grabación detenida: {len(self.ring)} frames en buffer ({self.ring_bytes // 1024} KB), sin escribir a disco")
                 return None
             
+            return self._finalize()
+        
         except Exception as e:
             print(f"❌ Error guardando video: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def save_buffer(self):
+        """Codificar y guardar los últimos segundos del buffer circular (se llama cuando el test falla)"""
+        try:
+            if self.recording:
+                self._stop_capture()
+            
+            if not self.ring:
+                print("⚠️  Buffer de video vacío, no se genera video")
+                return None
+            
+            print(f"🎞️  Codificando buffer de video: {len(self.ring)} frames")
+            for data, frame_time in self.ring:
+                self._encode_frame(data, frame_time)
+            self._flush(self.stopped_at)
+            self.discard_buffer()
+            
+            return self._finalize()
+        
+        except Exception as e:
+            print(f"❌ Error guardando buffer de video: {e}")
+            return None
+    
+    def discard_buffer(self):
+        """Liberar la memoria del buffer circular"""
+        self.ring.clear()
+        self.ring_bytes = 0
@@ -0,0 +1,119 @@
+import os
+import logging
+from selenium.common.exceptions import WebDriverException
+from utils.locator_cache import LocatorCache
+
+logger = logging.getLogger(__name__)
+
+
+# Métricas del documento actual en una sola llamada: Navigation Timing, recursos, LCP y CLS (entradas con buffer)
+METRICS_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var nav = performance.getEntriesByType('navigation')[0] || null;
+var resources = performance.getEntriesByType('resource');
+var pos = document.getElementById('pointOfSaleSelectorId');
+var result = {
+    url: location.href,
+    time_origin: performance.timeOrigin,
+    navigation_type: nav ? nav.type : null,
+    ttfb_ms: nav ? nav.responseStart - nav.startTime : null,
+    dom_content_loaded_ms: nav && nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    load_event_ms: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+    transfer_bytes: resources.reduce(function (total, r) { return total + (r.transferSize || 0); }, nav ? nav.transferSize || 0 : 0),
+    resource_count: resources.length,
+    lcp_ms: null,
+    cls: null,
+    language: (document.documentElement.lang || '').toLowerCase(),
+    pos: pos ? (pos.innerText || pos.textContent || '').trim() : null
+};
+var types = (window.PerformanceObserver && PerformanceObserver.supportedEntryTypes) || [];
+var observers = [];
+if (types.indexOf('largest-contentful-paint') >= 0) {
+    var lcp = new PerformanceObserver(function (list) {
+        var entries = list.getEntries();
+        if (entries.length) { result.lcp_ms = entries[entries.length - 1].startTime; }
+    });
+    lcp.observe({type: 'largest-contentful-paint', buffered: true});
+    observers.push(lcp);
+}
+if (types.indexOf('layout-shift') >= 0) {
+    result.cls = 0;
+    var cls = new PerformanceObserver(function (list) {
+        list.getEntries().forEach(function (e) { if (!e.hadRecentInput) { result.cls += e.value; } });
+    });
+    cls.observe({type: 'layout-shift', buffered: true});
+    observers.push(cls);
+}
+// Las entradas con buffer se entregan en la siguiente tarea
+setTimeout(function () { observers.forEach(function (o) { o.disconnect(); }); done(result); }, 0);
+"""
+
+
+class WebMetrics:
+    """Métricas de rendimiento del navegador por navegación (Navigation Timing, LCP, CLS, CDP Performance) hacia la BD"""
+
+    # Se desactiva con --no-web-metrics
+    enabled = True
+
+    # timeOrigin del último documento medido por driver: si no cambia, la navegación fue interna de la SPA
+    _last_origin = {}
+
+    # Métricas de CDP Performance.getMetrics que se guardan (valores puntuales, no acumulados)
+    CDP_METRICS = {"JSHeapUsedSize": "js_heap_bytes", "Nodes": "dom_nodes"}
+
+    @classmethod
+    def collect(cls, driver, source):
+        """Métricas del documento actual; None si están desactivadas o el navegador no las expone"""
+        if not cls.enabled:
+            return None
+        try:
+            metrics = driver.execute_async_script(METRICS_SCRIPT)
+        except WebDriverException as e:
+            logger.debug(f"No se pudieron leer las métricas de la página: {e}")
+            return None
+
+        # Navegación sin documento nuevo (routing de Angular): la Navigation Timing es la de la carga anterior
+        key = id(driver)
+        if cls._last_origin.get(key) == metrics["time_origin"]:
+            metrics["navigation_type"] = "soft"
+            for field in ("ttfb_ms", "dom_content_loaded_ms", "load_event_ms", "lcp_ms"):
+                metrics[field] = None
+        cls._last_origin[key] = metrics["time_origin"]
+
+        metrics.update(cls._cdp_metrics(driver))
+        environment, language = LocatorCache.context_from_url(metrics["url"])
+        metrics["environment"] = environment
+        metrics["language"] = language if language != "default" else (metrics["language"] or "default")
+        metrics["source"] = source
+        metrics["browser"] = driver.name
+        # Nombre del test en curso (pytest lo publica en el entorno)
+        metrics["test_name"] = os.environ.get("PYTEST_CURRENT_TEST", "").split(" ")[0]
+        return metrics
+
+    @classmethod
+    def _cdp_metrics(cls, driver):
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return {}
+        try:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            raw = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except WebDriverException as e:
+            logger.debug(f"Performance.getMetrics no disponible: {e}")
+            return {}
+        return {cls.CDP_METRICS[m["name"]]: int(m["value"]) for m in raw if m["name"] in cls.CDP_METRICS}
+
+    @classmethod
+    def record(cls, driver, source, db=None):
+        """Medir la navegación actual y guardarla en navigation_metrics; devuelve las métricas (o None)"""
+        metrics = cls.collect(driver, source)
+        if metrics is None:
+            return None
+
+        from utils.database import DatabaseManager
+        (db or DatabaseManager()).save_navigation_metrics(metrics)
+
+        lcp = f"{metrics['lcp_ms']:.0f}ms" if metrics["lcp_ms"] is not None else "-"
+        ttfb = f"{metrics['ttfb_ms']:.0f}ms" if metrics["ttfb_ms"] is not None else "-"
+        logger.info(f"📈 {source}: TTFB {ttfb}, LCP {lcp}, CLS {metrics['cls'] or 0:.3f}, "
+                    f"{metrics['resource_count']} recursos, {metrics['transfer_bytes'] // 1024} KB ({metrics['url']})")
+        return metrics